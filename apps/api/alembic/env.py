@@ -0,0 +1,45 @@
+"""Alembic environment
+
+Tables are still created by ``init_db()`` (``create_all``) on first start;
+revisions only bring databases created by an older release up to the
+current models, so each one skips tables that do not exist yet and
+columns or indexes that are already there.
+"""
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from src.core.config import settings
+from src.database import Base
+import src.models  # noqa: F401  (registers every table on Base.metadata)
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_online() -> None:
+    """Run migrations against DATABASE_URL."""
+    connectable = create_engine(settings.DATABASE_URL, poolclass=pool.NullPool)
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            # SQLite cannot ALTER columns; batch mode rebuilds the table instead
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    # Revisions inspect the live schema to decide what to do, so there is no SQL-only mode
+    raise SystemExit("Offline (--sql) migrations are not supported; run against DATABASE_URL")
+
+run_migrations_online()
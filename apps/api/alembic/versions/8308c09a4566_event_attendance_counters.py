@@ -0,0 +1,57 @@
+"""Checked-in and cancelled counters on events
+
+Revision ID: 8308c09a4566
+Revises: 8980f07c8c7b
+Create Date: 2026-10-17 09:20:00.000000
+
+The counters are backfilled from registrations; ``reconcile_counters.py``
+can be run afterwards to confirm they match.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8308c09a4566'
+down_revision: Union[str, None] = '8980f07c8c7b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Counter column -> registration status it counts (enum names, as stored)
+COUNTERS = {
+    "checked_in_count": "CHECKED_IN",
+    "cancelled_count": "CANCELLED",
+}
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # Missing tables are created complete by init_db()
+    if not inspector.has_table("events"):
+        return
+
+    existing = {column["name"] for column in inspector.get_columns("events")}
+    added = [name for name in COUNTERS if name not in existing]
+    if not added:
+        return
+
+    for name in added:
+        op.add_column("events", sa.Column(name, sa.Integer(), server_default="0", nullable=False))
+        op.execute(
+            f"UPDATE events SET {name} = ("
+            f"SELECT COUNT(*) FROM registrations"
+            f" WHERE registrations.event_id = events.id AND registrations.status = '{COUNTERS[name]}')"
+        )
+
+    # The default only existed to fill old rows; the models set it in Python
+    with op.batch_alter_table("events") as batch_op:
+        for name in added:
+            batch_op.alter_column(name, existing_type=sa.Integer(), existing_nullable=False, server_default=None)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("events") as batch_op:
+        for name in COUNTERS:
+            batch_op.drop_column(name)
@@ -0,0 +1,44 @@
+"""Registration updated_at for check-in manifest deltas
+
+Revision ID: 8980f07c8c7b
+Revises: eedca84ae594
+Create Date: 2026-10-17 09:10:00.000000
+
+Existing rows take their creation time, so the first delta after the
+upgrade does not resend every ticket.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8980f07c8c7b'
+down_revision: Union[str, None] = 'eedca84ae594'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # Missing tables are created complete by init_db()
+    if not inspector.has_table("registrations"):
+        return
+
+    if "updated_at" not in {column["name"] for column in inspector.get_columns("registrations")}:
+        # Added nullable, backfilled, then tightened (SQLite cannot add a
+        # NOT NULL column without a constant default)
+        op.add_column("registrations", sa.Column("updated_at", sa.DateTime(), nullable=True))
+        op.execute("UPDATE registrations SET updated_at = created_at")
+        with op.batch_alter_table("registrations") as batch_op:
+            batch_op.alter_column("updated_at", existing_type=sa.DateTime(), nullable=False)
+
+    if "idx_registrations_event_updated" not in {index["name"] for index in inspector.get_indexes("registrations")}:
+        op.create_index("idx_registrations_event_updated", "registrations", ["event_id", "updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_registrations_event_updated", table_name="registrations")
+    with op.batch_alter_table("registrations") as batch_op:
+        batch_op.drop_column("updated_at")
@@ -0,0 +1,59 @@
+"""List counters for paginated totals
+
+Revision ID: c41d7e2a9b63
+Revises: ed5b11186dfa
+Create Date: 2026-10-17 09:40:00.000000
+
+The counters are filled from the rows they count (including when
+init_db() already created the table empty); ``reconcile_counters.py``
+can be run afterwards to confirm they match.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d7e2a9b63'
+down_revision: Union[str, None] = 'ed5b11186dfa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same names as src/domain/list_totals.py; '' scopes the global counters
+BACKFILL = [
+    "INSERT INTO list_counters (name, scope_id, count)"
+    " SELECT 'events:' || status, '', COUNT(*) FROM events GROUP BY status",
+    "INSERT INTO list_counters (name, scope_id, count)"
+    " SELECT 'events:' || status, organizer_id, COUNT(*) FROM events GROUP BY status, organizer_id",
+    "INSERT INTO list_counters (name, scope_id, count)"
+    " SELECT 'users', '', COUNT(*) FROM users",
+    "INSERT INTO list_counters (name, scope_id, count)"
+    " SELECT 'user_registrations', registrations.user_id, COUNT(*) FROM registrations"
+    " JOIN events ON events.id = registrations.event_id"
+    " WHERE events.status = 'PUBLISHED' GROUP BY registrations.user_id",
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("list_counters"):
+        op.create_table(
+            "list_counters",
+            sa.Column("name", sa.String(length=40), nullable=False),
+            sa.Column("scope_id", sa.String(), nullable=False),
+            sa.Column("count", sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint("name", "scope_id"),
+        )
+
+    # Nothing to count on a fresh database; its tables are created by init_db()
+    if not inspector.has_table("events") or not inspector.has_table("users"):
+        return
+
+    op.execute("DELETE FROM list_counters")
+    for statement in BACKFILL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.drop_table("list_counters")
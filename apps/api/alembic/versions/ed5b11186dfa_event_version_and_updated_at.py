@@ -0,0 +1,59 @@
+"""Event version and updated_at for ETags
+
+Revision ID: ed5b11186dfa
+Revises: 8308c09a4566
+Create Date: 2026-10-17 09:30:00.000000
+
+Existing events start at version 1 and are stamped with the upgrade
+time, so the first ETag after the upgrade is simply a cache miss.
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ed5b11186dfa'
+down_revision: Union[str, None] = '8308c09a4566'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # Missing tables are created complete by init_db()
+    if not inspector.has_table("events"):
+        return
+
+    existing = {column["name"] for column in inspector.get_columns("events")}
+    add_version = "version" not in existing
+    add_updated_at = "updated_at" not in existing
+
+    if add_version:
+        op.add_column("events", sa.Column("version", sa.Integer(), server_default="1", nullable=False))
+    if add_updated_at:
+        # Added nullable and filled in, since SQLite only accepts constant defaults here
+        op.add_column("events", sa.Column("updated_at", sa.DateTime(), nullable=True))
+        events = sa.table("events", sa.column("updated_at", sa.DateTime()))
+        op.execute(events.update().values(updated_at=datetime.now(timezone.utc)))
+
+    if add_version or add_updated_at:
+        with op.batch_alter_table("events") as batch_op:
+            if add_version:
+                # The default only existed to fill old rows; the model sets it in Python
+                batch_op.alter_column("version", existing_type=sa.Integer(), existing_nullable=False,
+                                      server_default=None)
+            if add_updated_at:
+                batch_op.alter_column("updated_at", existing_type=sa.DateTime(), nullable=False)
+
+    if "idx_events_updated_at" not in {index["name"] for index in inspector.get_indexes("events")}:
+        op.create_index("idx_events_updated_at", "events", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_events_updated_at", table_name="events")
+    with op.batch_alter_table("events") as batch_op:
+        batch_op.drop_column("updated_at")
+        batch_op.drop_column("version")
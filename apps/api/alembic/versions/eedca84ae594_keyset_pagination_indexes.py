@@ -0,0 +1,47 @@
+"""Keyset pagination indexes
+
+Revision ID: eedca84ae594
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+Composite indexes behind the ``ORDER BY ..., id`` cursors of the list
+endpoints. ``create_all`` only creates indexes together with their table,
+so databases that predate them need this revision.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'eedca84ae594'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ("events", "idx_events_start_at_id", ["start_at", "id"]),
+    ("events", "idx_events_status_start_at_id", ["status", "start_at", "id"]),
+    ("events", "idx_events_organizer_start_at_id", ["organizer_id", "start_at", "id"]),
+    ("registrations", "idx_registrations_event_created_id", ["event_id", "created_at", "id"]),
+    ("registrations", "idx_registrations_user_created_id", ["user_id", "created_at", "id"]),
+    ("users", "idx_users_email_id", ["email", "id"]),
+)
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table, name, columns in INDEXES:
+        # Missing tables are created complete, indexes included, by init_db()
+        if not inspector.has_table(table):
+            continue
+        if name not in {index["name"] for index in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table, name, _ in INDEXES:
+        if inspector.has_table(table) and name in {index["name"] for index in inspector.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
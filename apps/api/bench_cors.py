@@ -0,0 +1,140 @@
+"""Microbenchmark: Cloudflare CORS middleware vs the previous BaseHTTPMiddleware version
+
+Drives each middleware stack directly through ASGI (no server, no HTTP
+client) around a one-route Starlette app, so the numbers are the
+middleware's own per-request cost.
+
+    python bench_cors.py [--requests 20000]
+"""
+import argparse
+import asyncio
+import re
+import time
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+from src.core.cors import CloudflareCORSMiddleware, OriginMatcher
+
+PROJECT = "eventmaster-web"
+ALLOWED = ["http://localhost:3000", "http://localhost:5173", "https://events.example.com"]
+
+
+def legacy_is_allowed_origin(origin: str) -> bool:
+    """The origin check as it was: list scan plus a regex compiled per call."""
+    if not origin:
+        return False
+    if origin in ALLOWED:
+        return True
+    pattern = rf"^https://[a-z0-9-]+\.{re.escape(PROJECT)}\.pages\.dev$"
+    if re.match(pattern, origin):
+        return True
+    return origin == f"https://{PROJECT}.pages.dev"
+
+
+class LegacyCORSMiddleware(BaseHTTPMiddleware):
+    """The previous ``DynamicCORSMiddleware`` from main.py."""
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        origin = request.headers.get("origin", "")
+        if request.method == "OPTIONS":
+            if legacy_is_allowed_origin(origin):
+                response = Response(status_code=200)
+                response.headers["Access-Control-Allow-Origin"] = origin
+                response.headers["Access-Control-Allow-Credentials"] = "true"
+                response.headers["Access-Control-Allow-Methods"] = "*"
+                response.headers["Access-Control-Allow-Headers"] = "*"
+                return response
+        response = await call_next(request)
+        if legacy_is_allowed_origin(origin):
+            response.headers["Access-Control-Allow-Origin"] = origin
+            response.headers["Access-Control-Allow-Credentials"] = "true"
+        return response
+
+
+def build_app() -> Starlette:
+    async def events(request):
+        return JSONResponse({"events": [], "total": 0})
+
+    return Starlette(routes=[Route("/events", events)])
+
+
+def scope_for(method: str, origin: str) -> dict:
+    headers = [(b"host", b"api"), (b"origin", origin.encode())]
+    if method == "OPTIONS":
+        headers += [
+            (b"access-control-request-method", b"POST"),
+            (b"access-control-request-headers", b"authorization,content-type"),
+        ]
+    return {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": method, "scheme": "https", "path": "/events", "raw_path": b"/events",
+        "root_path": "", "query_string": b"", "headers": headers,
+        "client": ("127.0.0.1", 1234), "server": ("api", 443),
+    }
+
+
+async def run(app, scope: dict, requests: int) -> float:
+    never = asyncio.Event()
+
+    def make_receive():
+        # One request body, then wait for a disconnect that never comes
+        messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            await never.wait()
+
+        return receive
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(scope, make_receive(), send)
+    return time.perf_counter() - start
+
+
+async def main(requests: int) -> None:
+    stacks = {
+        "legacy": LegacyCORSMiddleware(build_app()),
+        "asgi": CloudflareCORSMiddleware(build_app(), OriginMatcher(ALLOWED, PROJECT)),
+    }
+    cases = [
+        ("preflight, preview origin", "OPTIONS", f"https://a1b2c3.{PROJECT}.pages.dev"),
+        ("GET, listed origin", "GET", "https://events.example.com"),
+        ("GET, preview origin", "GET", f"https://a1b2c3.{PROJECT}.pages.dev"),
+        ("GET, disallowed origin", "GET", "https://evil.example.net"),
+    ]
+
+    print(f"{'case':<28} {'legacy µs/req':>14} {'asgi µs/req':>12} {'speedup':>8}")
+    print("-" * 66)
+    for label, method, origin in cases:
+        scope = scope_for(method, origin)
+        timings = {}
+        for name, app in stacks.items():
+            await run(app, scope, requests // 10)  # warm up
+            timings[name] = await run(app, scope, requests) / requests * 1e6
+        print(f"{label:<28} {timings['legacy']:>14.1f} {timings['asgi']:>12.1f} "
+              f"{timings['legacy'] / timings['asgi']:>7.1f}x")
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        legacy_is_allowed_origin(f"https://a1b2c3.{PROJECT}.pages.dev")
+    legacy = (time.perf_counter() - start) / requests * 1e6
+    matcher = OriginMatcher(ALLOWED, PROJECT)
+    start = time.perf_counter()
+    for _ in range(requests):
+        matcher.is_allowed(f"https://a1b2c3.{PROJECT}.pages.dev")
+    current = (time.perf_counter() - start) / requests * 1e6
+    print(f"{'origin check only':<28} {legacy:>14.2f} {current:>12.2f} {legacy / current:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000, help="requests per case and stack")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
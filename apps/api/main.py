@@ -1,74 +1,52 @@
 """FastAPI application entry point"""
-import re
+import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, APIRouter
+from fastapi.routing import APIRoute
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from fastapi.responses import PlainTextResponse
 from src.core.config import settings
-from src.core.logging import setup_logging
-from src.database import init_db
+from src.core.cors import CloudflareCORSMiddleware, OriginMatcher
+from src.core.deps import require_metrics_token
+from src.core.logging import setup_logging, shutdown_logging
+from src.core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, render_metrics
+from src.core.password_hashing import password_hasher
+from src.core.profiler import ProfilerMiddleware
+from src.core.query_stats import QueryStatsMiddleware
+from src.database import init_db, engine, async_engine
+from src.domain.event_counters import reconcile_periodically
 from src.routes import (
     auth_router,
     events_router,
     registrations_router,
     checkin_router,
-    users_router
+    users_router,
+    profiling_router,
+    diagnostics_router,
+    async_router
 )
 
 
-def get_allowed_origins() -> list[str]:
-    """Build list of allowed origins including Cloudflare Pages wildcard support."""
-    origins = list(settings.allowed_origins_list)
-    return origins
+def use_async_routes(app: FastAPI, router: APIRouter) -> None:
+    """Swap registered sync handlers for their async variants in place.
 
+    Replacing routes at their original position keeps matching order
+    (e.g. /events/managed before /events/{event_id}) and the OpenAPI schema
+    unchanged.
+    """
+    replacements = {
+        (route.path, frozenset(route.methods)): route
+        for route in router.routes
+        if isinstance(route, APIRoute)
+    }
+    for index, route in enumerate(app.router.routes):
+        if isinstance(route, APIRoute):
+            key = (route.path, frozenset(route.methods))
+            if key in replacements:
+                app.router.routes[index] = replacements.pop(key)
 
-def is_allowed_origin(origin: str) -> bool:
-    """Check if origin is allowed, including Cloudflare Pages wildcard."""
-    if not origin:
-        return False
-
-    # Check exact match
-    if origin in settings.allowed_origins_list:
-        return True
-
-    # Check Cloudflare Pages wildcard (*.PROJECT.pages.dev)
-    if settings.CLOUDFLARE_PAGES_PROJECT:
-        pattern = rf"^https://[a-z0-9-]+\.{re.escape(settings.CLOUDFLARE_PAGES_PROJECT)}\.pages\.dev$"
-        if re.match(pattern, origin):
-            return True
-        # Also allow main project URL
-        main_url = f"https://{settings.CLOUDFLARE_PAGES_PROJECT}.pages.dev"
-        if origin == main_url:
-            return True
-
-    return False
-
-
-class DynamicCORSMiddleware(BaseHTTPMiddleware):
-    """Custom CORS middleware with Cloudflare Pages wildcard support."""
-
-    async def dispatch(self, request: Request, call_next) -> Response:
-        origin = request.headers.get("origin", "")
-
-        # Handle preflight
-        if request.method == "OPTIONS":
-            if is_allowed_origin(origin):
-                response = Response(status_code=200)
-                response.headers["Access-Control-Allow-Origin"] = origin
-                response.headers["Access-Control-Allow-Credentials"] = "true"
-                response.headers["Access-Control-Allow-Methods"] = "*"
-                response.headers["Access-Control-Allow-Headers"] = "*"
-                return response
-
-        response = await call_next(request)
-
-        # Add CORS headers for allowed origins
-        if is_allowed_origin(origin):
-            response.headers["Access-Control-Allow-Origin"] = origin
-            response.headers["Access-Control-Allow-Credentials"] = "true"
-
-        return response
+    if replacements:
+        raise RuntimeError(f"Async routes without a sync counterpart: {sorted(p for p, _ in replacements)}")
 
 
 @asynccontextmanager
@@ -77,9 +55,19 @@ async def lifespan(app: FastAPI):
     # Startup
     setup_logging()
     init_db()
+    reconciler = None
+    if settings.COUNTER_RECONCILE_INTERVAL_SECONDS > 0:
+        reconciler = asyncio.create_task(
+            reconcile_periodically(settings.COUNTER_RECONCILE_INTERVAL_SECONDS)
+        )
     yield
-    # Shutdown (cleanup if needed)
-    pass
+    # Shutdown
+    if reconciler is not None:
+        reconciler.cancel()
+    password_hasher.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
+    shutdown_logging()
 
 
 # Create FastAPI application
@@ -96,7 +84,10 @@ app = FastAPI(
 # Configure CORS with Cloudflare Pages wildcard support
 if settings.CLOUDFLARE_PAGES_PROJECT:
     # Use dynamic CORS for Cloudflare Pages wildcard support
-    app.add_middleware(DynamicCORSMiddleware)
+    app.add_middleware(
+        CloudflareCORSMiddleware,
+        matcher=OriginMatcher(settings.allowed_origins_list, settings.CLOUDFLARE_PAGES_PROJECT),
+    )
 else:
     # Use standard CORS middleware for static origins
     app.add_middleware(
@@ -107,6 +98,14 @@ else:
         allow_headers=["*"],
     )
 
+# Per-request SQL counts (Server-Timing header and request log line)
+app.add_middleware(QueryStatsMiddleware)
+
+# Request timings include the CORS layer
+app.add_middleware(MetricsMiddleware)
+
+# Admin-requested profiles (X-Profile header) cover every layer below
+app.add_middleware(ProfilerMiddleware)
 
 # Register routers
 app.include_router(auth_router)
@@ -114,6 +113,12 @@ app.include_router(events_router)
 app.include_router(registrations_router)
 app.include_router(checkin_router)
 app.include_router(users_router)
+app.include_router(profiling_router)
+app.include_router(diagnostics_router)
+
+# Serve hot endpoints with async handlers on the async engine
+if settings.DATABASE_ASYNC:
+    use_async_routes(app, async_router)
 
 
 @app.get("/", tags=["Health"])
@@ -136,6 +141,19 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", tags=["Health"], include_in_schema=False, dependencies=[Depends(require_metrics_token)])
+async def metrics():
+    """Prometheus metrics: per-route latency, threadpool and connection pool usage.
+
+    Requires ``Authorization: Bearer <METRICS_TOKEN>``.
+    """
+    pools = {"sync": engine.pool, "async": async_engine.pool if async_engine is not None else None}
+    return PlainTextResponse(
+        render_metrics(pools, password_hasher.stats()),
+        media_type=METRICS_CONTENT_TYPE,
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
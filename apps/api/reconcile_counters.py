@@ -0,0 +1,54 @@
+"""Recompute denormalized event counters and list totals from the rows they count"""
+import argparse
+from src.domain.event_counters import run_reconciliation, run_total_reconciliation
+
+
+def reconcile_counters(dry_run: bool = False, chunk_size: int = 500):
+    """Report (and unless dry-running, fix) event counters that drifted from registrations"""
+    drift = run_reconciliation(dry_run=dry_run, chunk_size=chunk_size)
+
+    if not drift:
+        print("✓ Event counters match registrations")
+        return
+
+    print(f"{'event_id':<40} {'stored (reg/in/cxl)':<22} actual (reg/in/cxl)")
+    print("-" * 85)
+    for d in drift:
+        stored = "/".join(str(v) for v in d.stored)
+        actual = "/".join(str(v) for v in d.actual)
+        print(f"{d.event_id:<40} {stored:<22} {actual}")
+    print("-" * 85)
+
+    if dry_run:
+        print(f"Dry run: {len(drift)} event(s) would be corrected")
+    else:
+        print(f"✓ Corrected {len(drift)} event(s)")
+
+
+def reconcile_list_totals(dry_run: bool = False):
+    """Report (and unless dry-running, fix) list totals that drifted from their tables"""
+    drift = run_total_reconciliation(dry_run=dry_run)
+
+    if not drift:
+        print("✓ List totals match their tables")
+        return
+
+    print(f"{'counter':<22} {'scope':<40} {'stored':>8} {'actual':>8}")
+    print("-" * 81)
+    for d in drift:
+        print(f"{d.name:<22} {d.scope_id or '(all)':<40} {d.stored:>8} {d.actual:>8}")
+    print("-" * 81)
+
+    if dry_run:
+        print(f"Dry run: {len(drift)} total(s) would be corrected")
+    else:
+        print(f"✓ Corrected {len(drift)} total(s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dry-run", action="store_true", help="only report drift")
+    parser.add_argument("--chunk-size", type=int, default=500, help="events updated per commit")
+    args = parser.parse_args()
+    reconcile_counters(dry_run=args.dry_run, chunk_size=args.chunk_size)
+    reconcile_list_totals(dry_run=args.dry_run)
@@ -6,6 +6,7 @@ from src.models.user import User, UserRole
 from src.models.event import Event, EventStatus
 from src.models.registration import Registration, RegistrationStatus
 from src.core.security import get_password_hash
+from src.domain.list_totals import ListTotals
 
 
 def seed_database():
@@ -67,6 +68,7 @@ def seed_database():
                 location="Main Auditorium",
                 capacity=200,
                 registered_count=2,
+                checked_in_count=1,
                 status=EventStatus.PUBLISHED
             ),
             Event(
@@ -151,6 +153,9 @@ def seed_database():
 
         db.commit()
 
+        # Rows above bypass the write paths that maintain list totals
+        ListTotals.reconcile(db)
+
         print("\n" + "=" * 50)
         print("✓ Database seeded successfully!")
         print("=" * 50)
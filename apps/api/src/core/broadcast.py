@@ -0,0 +1,122 @@
+"""In-process fan-out of live updates to connected clients
+
+Long-lived connections (scanner WebSockets, dashboard streams) subscribe
+to a topic such as an event id and receive every message published to it.
+Publishing is thread-safe, so sync handlers running in the threadpool can
+notify subscribers living on the event loop.
+
+Each subscriber has a bounded queue. A slow consumer loses its oldest
+pending messages rather than growing memory or blocking publishers; the
+messages are snapshots (e.g. current counts), so only the latest matters.
+
+State is per process: with several API workers, each one only reaches the
+clients connected to it.
+"""
+import asyncio
+import threading
+from typing import Any, Dict, Hashable, List, Set
+
+
+class Subscription:
+    """A subscriber's queue, bound to the event loop it was created on."""
+
+    def __init__(self, topic: Hashable, max_queue: int):
+        self.topic = topic
+        self.queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=max_queue)
+        self.loop = asyncio.get_running_loop()
+        self.dropped = 0
+
+    def _deliver(self, message: Any) -> None:
+        # Runs on the subscriber's loop
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+    async def get(self) -> Any:
+        """Wait for the next message."""
+        return await self.queue.get()
+
+
+def _deliver_all(subscriptions: List[Subscription], message: Any) -> None:
+    # Runs on the subscribers' loop
+    for subscription in subscriptions:
+        subscription._deliver(message)
+
+
+class Broadcaster:
+    """Topic-based publish/subscribe for the current process."""
+
+    def __init__(self, max_queue: int = 100):
+        """
+        Initialize broadcaster.
+
+        Args:
+            max_queue: Pending messages kept per subscriber before the oldest is dropped
+        """
+        self._subscribers: Dict[Hashable, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._max_queue = max_queue
+        self.published = 0
+
+    def subscribe(self, topic: Hashable) -> Subscription:
+        """Register a subscriber; must be called from a running event loop."""
+        subscription = Subscription(topic, self._max_queue)
+        with self._lock:
+            self._subscribers.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscriber (idempotent)."""
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.topic)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.topic]
+
+    def has_subscribers(self, topic: Hashable) -> bool:
+        """Whether anyone is listening, so publishers can skip building messages."""
+        with self._lock:
+            return topic in self._subscribers
+
+    def publish(self, topic: Hashable, message: Any) -> int:
+        """
+        Send a message to every subscriber of a topic, from any thread.
+
+        Returns:
+            Number of subscribers the message was queued for
+        """
+        with self._lock:
+            subscribers = list(self._subscribers.get(topic, ()))
+            self.published += 1
+
+        # One wake-up per event loop, however many subscribers it serves
+        by_loop: Dict[asyncio.AbstractEventLoop, List[Subscription]] = {}
+        for subscription in subscribers:
+            by_loop.setdefault(subscription.loop, []).append(subscription)
+
+        for loop, batch in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(_deliver_all, batch, message)
+            except RuntimeError:
+                # Loop already closed; its subscribers are going away
+                for subscription in batch:
+                    self.unsubscribe(subscription)
+        return len(subscribers)
+
+    def stats(self) -> Dict[str, int]:
+        """Return topic/subscriber counts."""
+        with self._lock:
+            return {
+                "topics": len(self._subscribers),
+                "subscribers": sum(len(s) for s in self._subscribers.values()),
+                "published": self.published,
+            }
+
+
+# Global broadcasters keyed by event id: scanner stations (dict messages)
+# and occupancy dashboards (pre-encoded SSE frames)
+checkin_broadcaster = Broadcaster(max_queue=100)
+occupancy_broadcaster = Broadcaster(max_queue=16)
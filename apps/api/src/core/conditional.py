@@ -0,0 +1,36 @@
+"""Conditional GET helpers (ETag / If-None-Match)"""
+from typing import Optional
+from fastapi import Request, Response, status
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Evaluate an ``If-None-Match`` header against a current ETag.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match, so
+    ``W/`` prefixes added by proxies don't defeat the match.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    current = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == current:
+            return True
+    return False
+
+
+def not_modified(request: Request, etag: str, cache_control: Optional[str] = None) -> Optional[Response]:
+    """Return a bodiless 304 if the client already holds ``etag``, else None."""
+    if not etag_matches(request.headers.get("if-none-match"), etag):
+        return None
+
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
@@ -19,12 +19,43 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "sqlite:///./eventmaster.db"
+    # Serve hot endpoints (event list/detail, registration, /verify, /walk-in)
+    # with async handlers on an asyncpg/aiosqlite engine
+    DATABASE_ASYNC: bool = False
+    # Recompute event counters from registrations every N seconds (0 = off;
+    # `python reconcile_counters.py` runs it on demand)
+    COUNTER_RECONCILE_INTERVAL_SECONDS: int = 0
+    # Log statements slower than this (statement and parameter types, no values)
+    SQL_SLOW_QUERY_MS: int = 200
+    # Per-request summaries are logged at INFO from this many statements (or
+    # SQL_SLOW_QUERY_MS of total DB time), at DEBUG otherwise
+    SQL_REQUEST_LOG_QUERIES: int = 20
+    # Strict mode for tests: fail requests issuing more than N statements, or
+    # the same statement more than N times (0 = off)
+    SQL_STRICT_MAX_QUERIES: int = 0
+    SQL_STRICT_MAX_REPEATS: int = 0
+
+    # Bearer token Prometheus must send to scrape /metrics (empty = endpoint off)
+    METRICS_TOKEN: str = ""
+
+    # Admin profiler (X-Profile header / POST /admin/profiles)
+    PROFILER_ENABLED: bool = True
+    PROFILER_SAMPLE_INTERVAL_MS: int = 5
+    PROFILER_MAX_WINDOW_SECONDS: int = 60
 
     # JWT Authentication (legacy - will be deprecated in favor of Cognito)
     SECRET_KEY: str = "your-secret-key-please-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Signed QR ticket codes (derived from SECRET_KEY when empty)
+    TICKET_SIGNING_KEY: str = ""
+
+    # Password hashing (bcrypt runs on a dedicated executor, off the request threadpool)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
     # AWS Cognito Configuration
     COGNITO_USER_POOL_ID: str = ""
     COGNITO_CLIENT_ID: str = ""
@@ -62,6 +93,8 @@ class Settings(BaseSettings):
 
     # Logging
     LOG_LEVEL: str = "INFO"
+    # Records buffered for the background writer; DEBUG is dropped past 3/4 full
+    LOG_QUEUE_SIZE: int = 10000
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,103 @@
+"""CORS handling with Cloudflare Pages wildcard origins
+
+Preview deployments on Cloudflare Pages get their own subdomain
+(``https://<hash>.<project>.pages.dev``), so allowed origins cannot be a
+static list. ``OriginMatcher`` compiles the wildcard once and remembers
+recent decisions; ``CloudflareCORSMiddleware`` is a plain ASGI middleware,
+so response bodies are passed through untouched and preflight requests are
+answered before routing.
+"""
+import re
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class OriginMatcher:
+    """Decide whether an ``Origin`` header value is allowed."""
+
+    def __init__(self, allowed_origins: Iterable[str], pages_project: str = "", cache_size: int = 256):
+        """
+        Initialize origin matcher.
+
+        Args:
+            allowed_origins: Exact origins to allow
+            pages_project: Cloudflare Pages project name; enables
+                ``https://<project>.pages.dev`` and its subdomains
+            cache_size: Recent origin decisions to remember (bounded, since
+                the header is client-controlled)
+        """
+        self._exact = frozenset(allowed_origins)
+        self._pattern = None
+        if pages_project:
+            self._exact |= {f"https://{pages_project}.pages.dev"}
+            self._pattern = re.compile(rf"https://[a-z0-9-]+\.{re.escape(pages_project)}\.pages\.dev")
+        self.is_allowed = lru_cache(maxsize=cache_size)(self._match)
+
+    def _match(self, origin: str) -> bool:
+        if not origin:
+            return False
+        if origin in self._exact:
+            return True
+        return self._pattern is not None and self._pattern.fullmatch(origin) is not None
+
+
+class CloudflareCORSMiddleware:
+    """Pure ASGI CORS middleware for an ``OriginMatcher``.
+
+    Allowed origins are echoed back with credentials allowed. A preflight
+    (``OPTIONS`` from an allowed origin) is answered directly; everything
+    else reaches the app and gets the CORS headers added to its response
+    start message.
+    """
+
+    def __init__(self, app: ASGIApp, matcher: OriginMatcher):
+        self.app = app
+        self.matcher = matcher
+
+    @staticmethod
+    def _header(scope: Scope, name: bytes) -> Optional[str]:
+        for key, value in scope["headers"]:
+            if key == name:
+                return value.decode("latin-1")
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = self._header(scope, b"origin")
+        if origin is None or not self.matcher.is_allowed(origin):
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS":
+            await self._preflight(scope, origin, send)
+            return
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["Access-Control-Allow-Origin"] = origin
+                headers["Access-Control-Allow-Credentials"] = "true"
+                headers.add_vary_header("Origin")
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def _preflight(self, scope: Scope, origin: str, send: Send) -> None:
+        # Echo what was asked for: with credentials, browsers take "*" literally
+        methods = self._header(scope, b"access-control-request-method") or "*"
+        request_headers = self._header(scope, b"access-control-request-headers") or "*"
+        headers: List[Tuple[bytes, bytes]] = [
+            (b"access-control-allow-origin", origin.encode("latin-1")),
+            (b"access-control-allow-credentials", b"true"),
+            (b"access-control-allow-methods", methods.encode("latin-1")),
+            (b"access-control-allow-headers", request_headers.encode("latin-1")),
+            (b"vary", b"Origin"),
+            (b"content-length", b"0"),
+        ]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
@@ -1,11 +1,19 @@
 """FastAPI dependencies for authentication and authorization"""
-from typing import Optional
+import hmac
+from typing import Optional, Tuple
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from ..database import get_db
+from ..database import get_async_db, get_db
 from ..models.user import User, UserRole
+from .config import settings
 from .security import decode_access_token
+from .principal import Principal, principal_cache
+from .token_cache import token_cache
+from ..domain.list_totals import ListTotals
 
 # HTTP Bearer token security scheme
 security = HTTPBearer()
@@ -14,7 +22,7 @@ security = HTTPBearer()
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-) -> User:
+) -> Principal:
     """
     Dependency to get the current authenticated user from JWT token.
 
@@ -22,19 +30,103 @@ def get_current_user(
     - Legacy JWT tokens (with user_id in database)
     - Cognito JWT tokens (extracts role from cognito:groups claim)
 
+    Resolved users are cached as lightweight principals, so repeat
+    requests skip the database lookup entirely.
+
     Args:
         credentials: HTTP Bearer token credentials
         db: Database session
 
     Returns:
-        Current authenticated user
+        Current authenticated principal
+
+    Raises:
+        HTTPException: If token is invalid or user not found
+    """
+    return get_principal_for_token(credentials.credentials, db)
+
+
+def get_principal_for_token(token: str, db: Session) -> Principal:
+    """
+    Resolve a raw bearer token to a principal.
+
+    Shared by ``get_current_user`` and connections that authenticate
+    outside the HTTP Authorization header (e.g. WebSockets).
+
+    Args:
+        token: Encoded JWT
+        db: Database session
+
+    Returns:
+        Authenticated principal
 
     Raises:
         HTTPException: If token is invalid or user not found
     """
-    token = credentials.credentials
     payload = decode_access_token(token)
+    user_id, is_cognito, cognito_role = _token_claims(payload)
+
+    # Serve from cache unless the token's groups claim disagrees with it
+    principal = _cached_principal(user_id, cognito_role)
+    if principal is not None:
+        return principal
+
+    # Try to get user from database
+    user = db.query(User).filter(User.id == user_id).first()
+
+    # If user not found and this is a Cognito token, create user on-the-fly
+    if user is None and is_cognito:
+        user = _create_or_update_cognito_user(user_id, payload, db)
+
+    principal, role_changed = _principal_for_user(user, cognito_role)
+    if role_changed:
+        db.commit()
+
+    principal_cache.set(principal)
+    return principal
+
+
+async def get_principal_for_token_async(token: str, db: AsyncSession) -> Principal:
+    """
+    Async variant of ``get_principal_for_token`` on an ``AsyncSession``.
+
+    Tokens and principals already cached are resolved on the event loop;
+    only a first-seen token is verified on the threadpool, since a Cognito
+    key-set refresh may block on the network.
+    """
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = await run_in_threadpool(decode_access_token, token)
+    user_id, is_cognito, cognito_role = _token_claims(payload)
+
+    principal = _cached_principal(user_id, cognito_role)
+    if principal is not None:
+        return principal
+
+    user = (await db.execute(select(User).where(User.id == user_id))).scalars().first()
+
+    if user is None and is_cognito:
+        user = _new_cognito_user(user_id, payload)
+        db.add(user)
+        await ListTotals.apply_async(db, ListTotals.user_added())
+        await db.commit()
+        await db.refresh(user)
+
+    principal, role_changed = _principal_for_user(user, cognito_role)
+    if role_changed:
+        await db.commit()
+
+    principal_cache.set(principal)
+    return principal
+
+
+def _token_claims(payload: Optional[dict]) -> Tuple[str, bool, Optional[UserRole]]:
+    """
+    Extract ``(user_id, is_cognito, cognito_role)`` from a verified payload.
 
+    Raises:
+        HTTPException: If the token was invalid or has no subject
+    """
     if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -50,13 +142,33 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Try to get user from database
-    user = db.query(User).filter(User.id == user_id).first()
+    is_cognito = "cognito:groups" in payload
+    cognito_role = (
+        _extract_role_from_cognito_groups(payload.get("cognito:groups", []))
+        if is_cognito
+        else None
+    )
+    return user_id, is_cognito, cognito_role
 
-    # If user not found and this is a Cognito token, create user on-the-fly
-    if user is None and "cognito:groups" in payload:
-        user = _create_or_update_cognito_user(user_id, payload, db)
 
+def _cached_principal(user_id: str, cognito_role: Optional[UserRole]) -> Optional[Principal]:
+    """Cached principal, unless the token's groups claim disagrees with it."""
+    principal = principal_cache.get(user_id)
+    if principal is not None and (cognito_role is None or principal.role == cognito_role):
+        return principal
+    return None
+
+
+def _principal_for_user(user: Optional[User], cognito_role: Optional[UserRole]) -> Tuple[Principal, bool]:
+    """
+    Build the principal for a loaded user, applying a changed Cognito role.
+
+    Returns:
+        The principal and whether ``user.role`` was changed (needs a commit)
+
+    Raises:
+        HTTPException: If the user does not exist
+    """
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -64,15 +176,12 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # For Cognito tokens, update role from cognito:groups if different
-    if "cognito:groups" in payload:
-        cognito_role = _extract_role_from_cognito_groups(payload.get("cognito:groups", []))
-        if cognito_role and user.role != cognito_role:
-            user.role = cognito_role
-            db.commit()
-            db.refresh(user)
+    # For Cognito tokens, update role from cognito:groups only if it changed
+    role_changed = cognito_role is not None and user.role != cognito_role
+    if role_changed:
+        user.role = cognito_role
 
-    return user
+    return Principal.from_user(user), role_changed
 
 
 def _extract_role_from_cognito_groups(groups: list) -> Optional[UserRole]:
@@ -123,36 +232,42 @@ def _create_or_update_cognito_user(user_id: str, payload: dict, db: Session) ->
     Returns:
         User instance
     """
-    # Extract user information from Cognito token
-    email = payload.get("email", f"{user_id}@cognito.user")
-    role = _extract_role_from_cognito_groups(payload.get("cognito:groups", []))
-
-    if role is None:
-        role = UserRole.MEMBER  # Default role
-
     # Check if user already exists
     user = db.query(User).filter(User.id == user_id).first()
 
     if user is None:
         # Create new user
-        user = User(
-            id=user_id,
-            email=email,
-            hashed_password="",  # Cognito users don't use password hash
-            display_name=payload.get("name", email.split("@")[0]),
-            role=role
-        )
+        user = _new_cognito_user(user_id, payload)
         db.add(user)
+        ListTotals.apply(db, ListTotals.user_added())
         db.commit()
         db.refresh(user)
 
     return user
 
 
+def _new_cognito_user(user_id: str, payload: dict) -> User:
+    """Build (but do not add) a user from a Cognito JWT payload."""
+    # Extract user information from Cognito token
+    email = payload.get("email", f"{user_id}@cognito.user")
+    role = _extract_role_from_cognito_groups(payload.get("cognito:groups", []))
+
+    if role is None:
+        role = UserRole.MEMBER  # Default role
+
+    return User(
+        id=user_id,
+        email=email,
+        hashed_password="",  # Cognito users don't use password hash
+        display_name=payload.get("name", email.split("@")[0]),
+        role=role
+    )
+
+
 def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
     db: Session = Depends(get_db)
-) -> Optional[User]:
+) -> Optional[Principal]:
     """
     Dependency to optionally get the current user (allows unauthenticated access)
 
@@ -172,6 +287,33 @@ def get_current_user_optional(
         return None
 
 
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """
+    Async variant of ``get_current_user`` for the async routes
+
+    Runs on the event loop with an ``AsyncSession``, so authenticating does
+    not take a threadpool worker or a sync pool connection.
+    """
+    return await get_principal_for_token_async(credentials.credentials, db)
+
+
+async def get_current_user_optional_async(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[Principal]:
+    """Async variant of ``get_current_user_optional``."""
+    if credentials is None:
+        return None
+
+    try:
+        return await get_principal_for_token_async(credentials.credentials, db)
+    except HTTPException:
+        return None
+
+
 def require_role(*allowed_roles: UserRole):
     """
     Dependency factory to require specific user roles
@@ -182,17 +324,50 @@ def require_role(*allowed_roles: UserRole):
     Returns:
         Dependency function that checks user role
     """
-    def role_checker(current_user: User = Depends(get_current_user)) -> User:
-        if current_user.role not in allowed_roles:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Insufficient permissions. Required roles: {', '.join(r.value for r in allowed_roles)}"
-            )
-        return current_user
+    def role_checker(current_user: Principal = Depends(get_current_user)) -> Principal:
+        return _check_role(current_user, allowed_roles)
+
+    return role_checker
+
+
+def require_role_async(*allowed_roles: UserRole):
+    """Async variant of ``require_role``, built on ``get_current_user_async``."""
+    async def role_checker(current_user: Principal = Depends(get_current_user_async)) -> Principal:
+        return _check_role(current_user, allowed_roles)
 
     return role_checker
 
 
+def _check_role(current_user: Principal, allowed_roles: Tuple[UserRole, ...]) -> Principal:
+    if current_user.role not in allowed_roles:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Insufficient permissions. Required roles: {', '.join(r.value for r in allowed_roles)}"
+        )
+    return current_user
+
+
 # Convenience dependencies for common role requirements
 require_admin = require_role(UserRole.ADMIN)
 require_organizer_or_admin = require_role(UserRole.ORGANIZER, UserRole.ADMIN)
+require_organizer_or_admin_async = require_role_async(UserRole.ORGANIZER, UserRole.ADMIN)
+
+
+def require_metrics_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
+) -> None:
+    """
+    Dependency guarding ``/metrics`` with the scrape token from settings
+
+    The endpoint does not exist (404) while ``METRICS_TOKEN`` is empty.
+    """
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if credentials is None or not hmac.compare_digest(
+        credentials.credentials.encode("utf-8"), settings.METRICS_TOKEN.encode("utf-8")
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
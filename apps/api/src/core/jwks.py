@@ -1,64 +1,198 @@
 """JWKS (JSON Web Key Set) caching for Cognito JWT verification
 Feature: 002-dev-deployment-arch - Phase 5 (Cognito Integration)
 """
+import logging
+import threading
 import time
 import httpx
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
+from jose import jwk
 from .config import settings
 
+logger = logging.getLogger(__name__)
+
 
 class JWKSCache:
     """
-    Simple in-memory cache for JWKS (JSON Web Key Set) from Cognito.
+    In-memory cache for JWKS (JSON Web Key Set) from Cognito.
 
     Cognito rotates keys periodically, so we cache the JWKS but refresh
-    it after a TTL (Time To Live) expires.
+    it after a TTL (Time To Live) expires. Public keys are constructed once
+    per fetch and indexed by ``kid``. Refreshes run in the background ahead
+    of expiry, only one fetch is in flight at a time, and unknown ``kid``
+    values are negatively cached so bogus tokens cannot force refetches.
     """
 
-    def __init__(self, ttl_seconds: int = 3600):
+    def __init__(
+        self,
+        ttl_seconds: int = 3600,
+        refresh_ahead_seconds: int = 300,
+        negative_ttl_seconds: int = 30,
+        min_refetch_interval_seconds: int = 30,
+    ):
         """
         Initialize JWKS cache.
 
         Args:
             ttl_seconds: Cache time-to-live in seconds (default: 1 hour)
+            refresh_ahead_seconds: Start a background refresh this long before expiry
+            negative_ttl_seconds: How long an unknown kid is remembered as missing
+                (capped at ``min_refetch_interval_seconds``, so a newly rotated kid
+                is retried as soon as a refetch is allowed again)
+            min_refetch_interval_seconds: Minimum gap between unknown-kid refetches
         """
         self._cache: Optional[Dict] = None
+        self._keys: Dict[str, Any] = {}
         self._cache_time: float = 0
         self._ttl_seconds = ttl_seconds
+        self._refresh_ahead_seconds = min(refresh_ahead_seconds, ttl_seconds)
+        self._negative_ttl_seconds = min(negative_ttl_seconds, min_refetch_interval_seconds)
+        self._min_refetch_interval_seconds = min_refetch_interval_seconds
+        self._missing_kids: Dict[str, float] = {}
+        self._fetch_lock = threading.Lock()
+        self._refreshing = False
+        self._last_fetch_attempt: float = 0
 
     def get_jwks(self) -> Optional[Dict]:
         """
-        Get JWKS from cache or fetch from Cognito if cache is stale.
+        Get JWKS from cache or fetch from Cognito if cache is empty.
+
+        Stale caches are served while a background refresh runs.
 
         Returns:
             JWKS dictionary or None if fetch fails
         """
-        current_time = time.time()
+        if self._cache is None:
+            self._refresh_blocking()
+        else:
+            self._maybe_refresh_in_background()
+        return self._cache
+
+    def get_key(self, kid: str) -> Optional[Any]:
+        """
+        Get the constructed public key for a key ID.
+
+        Args:
+            kid: Key ID from the JWT header
+
+        Returns:
+            Public key object usable with ``jwt.decode`` or None if unknown
+        """
+        if self._cache is None:
+            self._refresh_blocking()
+        else:
+            self._maybe_refresh_in_background()
+
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        now = time.time()
+        missing_until = self._missing_kids.get(kid)
+        if missing_until is not None and missing_until > now:
+            return None
+
+        # Unknown kid: possibly a key rotation, so refetch once (single-flight)
+        generation = self._cache_time
+        with self._fetch_lock:
+            if self._cache_time == generation and (
+                now - self._last_fetch_attempt >= self._min_refetch_interval_seconds
+            ):
+                self._fetch()
+
+        key = self._keys.get(kid)
+        if key is None:
+            self._remember_missing(kid, now)
+        return key
 
-        # Return cached JWKS if still valid
-        if self._cache and (current_time - self._cache_time) < self._ttl_seconds:
-            return self._cache
+    def _remember_missing(self, kid: str, now: float) -> None:
+        """Negatively cache an unknown kid, pruning expired entries."""
+        if len(self._missing_kids) >= 1024:
+            self._missing_kids = {
+                k: until for k, until in self._missing_kids.items() if until > now
+            }
+        self._missing_kids[kid] = now + self._negative_ttl_seconds
 
-        # Fetch new JWKS from Cognito
+    def _maybe_refresh_in_background(self) -> None:
+        """Start a background refresh when the cache is close to expiry."""
+        now = time.time()
+        if now - self._cache_time < self._ttl_seconds - self._refresh_ahead_seconds:
+            return
+        if self._refreshing or now - self._last_fetch_attempt < self._min_refetch_interval_seconds:
+            return
+
+        with self._fetch_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        thread = threading.Thread(target=self._background_refresh, name="jwks-refresh", daemon=True)
+        thread.start()
+
+    def _background_refresh(self) -> None:
+        try:
+            with self._fetch_lock:
+                self._fetch()
+        finally:
+            self._refreshing = False
+
+    def _refresh_blocking(self) -> None:
+        """Fetch synchronously when nothing is cached yet (single-flight)."""
+        with self._fetch_lock:
+            recently_failed = (
+                time.time() - self._last_fetch_attempt < self._min_refetch_interval_seconds
+            )
+            if self._cache is None and not recently_failed:
+                self._fetch()
+
+    def _fetch(self) -> None:
+        """
+        Fetch JWKS from Cognito and rebuild the kid index.
+
+        Must be called with ``_fetch_lock`` held. Errors keep the previous
+        (stale) keys in place.
+        """
         jwks_url = settings.cognito_jwks_url
         if not jwks_url:
-            return None
+            return
 
+        self._last_fetch_attempt = time.time()
         try:
             response = httpx.get(jwks_url, timeout=10.0)
             response.raise_for_status()
-            self._cache = response.json()
-            self._cache_time = current_time
-            return self._cache
+            jwks = response.json()
         except Exception as e:
-            # Log error but don't crash - return stale cache if available
-            print(f"Error fetching JWKS from {jwks_url}: {e}")
-            return self._cache
+            # Log error but don't crash - stale cache stays available
+            logger.error(f"Error fetching JWKS from {jwks_url}: {e}")
+            return
+
+        keys: Dict[str, Any] = {}
+        for key_data in jwks.get("keys", []):
+            kid = key_data.get("kid")
+            if not kid:
+                continue
+            try:
+                keys[kid] = jwk.construct(key_data)
+            except Exception as e:
+                logger.warning(f"Skipping unusable JWKS key {kid}: {e}")
+
+        self._cache = jwks
+        self._keys = keys
+        self._cache_time = time.time()
+        self._missing_kids = {k: v for k, v in self._missing_kids.items() if k not in keys}
+
+    def stats(self) -> Dict[str, int]:
+        """Return cached key and negatively cached kid counts."""
+        return {"keys": len(self._keys), "missing_kids": len(self._missing_kids)}
 
     def clear(self):
         """Clear the JWKS cache (useful for testing)."""
-        self._cache = None
-        self._cache_time = 0
+        with self._fetch_lock:
+            self._cache = None
+            self._keys = {}
+            self._cache_time = 0
+            self._missing_kids = {}
+            self._last_fetch_attempt = 0
 
 
 # Global JWKS cache instance
@@ -1,10 +1,104 @@
-"""Logging configuration for the application"""
+"""Logging configuration for the application
+
+Request threads never write log output themselves: the root logger has a
+single ``QueueHandler`` feeding a bounded queue, and a ``QueueListener``
+thread drains it into the console and file handlers. Records are written
+as JSON lines that keep any ``extra=`` fields.
+"""
+import json
 import logging
+import queue
 import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 from .config import settings
 
+# Attributes every LogRecord has; anything else was passed via ``extra=``
+_RECORD_ATTRS = frozenset(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {"message", "asctime"}
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional["DroppingQueueHandler"] = None
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Non-blocking ``QueueHandler`` over a bounded queue.
+
+    Overflow drops the least important records first: DEBUG is refused once
+    the queue is three quarters full, INFO once it is fifteen sixteenths
+    full, and the rest (warnings and errors) only when no room is left.
+    Drops are counted per level and reported when logging shuts down.
+    """
+
+    def __init__(self, log_queue: queue.Queue, max_size: int):
+        """
+        Initialize queue handler.
+
+        Args:
+            log_queue: Bounded queue drained by the listener thread
+            max_size: The queue's capacity
+        """
+        super().__init__(log_queue)
+        self.debug_limit = max_size * 3 // 4
+        self.info_limit = max_size * 15 // 16
+        self.dropped: Dict[str, int] = {}
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback on the calling thread (args may
+        # not be safe to format later) but keep them as separate fields
+        record = logging.makeLogRecord(record.__dict__)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if record.levelno < logging.WARNING:
+            limit = self.debug_limit if record.levelno < logging.INFO else self.info_limit
+            if self.queue.qsize() >= limit:
+                self._drop(record)
+                return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self._drop(record)
+
+    def _drop(self, record: logging.LogRecord) -> None:
+        self.dropped[record.levelname] = self.dropped.get(record.levelname, 0) + 1
+
+
+class _DrainingQueueListener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Wait for room rather than fail when stopping with a full queue
+        self.queue.put(self._sentinel)
+
 
 def setup_logging(log_level: Optional[str] = None) -> None:
     """
@@ -13,24 +107,35 @@ def setup_logging(log_level: Optional[str] = None) -> None:
     Args:
         log_level: Optional log level override. Uses settings.LOG_LEVEL if not provided.
     """
+    global _listener, _queue_handler
+
     level = log_level or getattr(settings, 'LOG_LEVEL', 'INFO')
+    shutdown_logging()
 
     # Create logs directory if it doesn't exist
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
 
-    # Create handlers
+    # Create handlers (run on the listener thread)
+    formatter = JSONFormatter()
     console_handler = logging.StreamHandler(sys.stdout)
     file_handler = logging.FileHandler(log_dir / "app.log")
     error_handler = logging.FileHandler(log_dir / "error.log")
     error_handler.setLevel(logging.ERROR)
+    for handler in (console_handler, file_handler, error_handler):
+        handler.setFormatter(formatter)
 
-    # Configure root logger
-    logging.basicConfig(
-        level=getattr(logging, level.upper()),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[console_handler, file_handler, error_handler]
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    _queue_handler = DroppingQueueHandler(log_queue, max_size=settings.LOG_QUEUE_SIZE)
+    _listener = _DrainingQueueListener(
+        log_queue, console_handler, file_handler, error_handler, respect_handler_level=True
     )
+    _listener.start()
+
+    # Configure root logger
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, level.upper()))
+    root.handlers = [_queue_handler]
 
     # Set third-party loggers to WARNING to reduce noise
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
@@ -40,6 +145,32 @@ def setup_logging(log_level: Optional[str] = None) -> None:
     logger.info(f"Logging configured with level: {level}")
 
 
+def shutdown_logging() -> None:
+    """Drain queued records, report drops, and stop the listener thread."""
+    global _listener, _queue_handler
+
+    if _listener is None:
+        return
+
+    logging.getLogger().removeHandler(_queue_handler)
+    _listener.stop()  # processes everything still queued before returning
+
+    if _queue_handler.dropped:
+        # Written directly: the queue may be what overflowed
+        report = logging.getLogger(__name__).makeRecord(
+            __name__, logging.WARNING, __file__, 0, "Log records dropped on queue overflow", None, None,
+            extra={"dropped": dict(_queue_handler.dropped)},
+        )
+        for handler in _listener.handlers:
+            if report.levelno >= handler.level:
+                handler.handle(report)
+
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+    _queue_handler = None
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance for the given module name
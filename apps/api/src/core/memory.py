@@ -0,0 +1,156 @@
+"""tracemalloc-based memory diagnostics
+
+Tracing is off by default (it slows allocation and costs memory itself).
+An admin turns it on, takes a snapshot, lets traffic run, takes another
+and diffs the two by ``file:line`` to see which allocation sites grew.
+Only a few snapshots are kept, since each one holds a copy of every
+traced allocation site.
+"""
+import itertools
+import os
+import resource
+import threading
+import tracemalloc
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+# Allocations made by the diagnostics themselves
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+@dataclass
+class StoredSnapshot:
+    """A filtered tracemalloc snapshot and when it was taken."""
+    id: int
+    taken_at: datetime
+    traced_bytes: int
+    snapshot: tracemalloc.Snapshot
+
+
+def _location(stat) -> str:
+    frame = stat.traceback[0]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+def process_memory() -> Dict[str, Optional[int]]:
+    """Current and peak resident set size of this process, in bytes."""
+    rss = None
+    try:
+        with open("/proc/self/statm") as statm:
+            rss = int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        pass
+    # ru_maxrss is in kilobytes on Linux
+    return {"rss_bytes": rss, "max_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024}
+
+
+class MemoryDiagnostics:
+    """Start/stop tracemalloc and keep a few snapshots for comparison."""
+
+    def __init__(self, max_snapshots: int = 5):
+        """
+        Initialize memory diagnostics.
+
+        Args:
+            max_snapshots: Snapshots kept (oldest dropped beyond this)
+        """
+        self._snapshots: "OrderedDict[int, StoredSnapshot]" = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._max_snapshots = max_snapshots
+
+    def start(self, frames: int = 1) -> None:
+        """
+        Start tracing with ``frames`` as the stored traceback depth.
+
+        Already tracing at another depth restarts tracing (dropping the
+        snapshots, as ``stop`` does); at the same depth this is a no-op.
+        """
+        if tracemalloc.is_tracing():
+            if tracemalloc.get_traceback_limit() == frames:
+                return
+            self.stop()
+        tracemalloc.start(frames)
+
+    def stop(self) -> None:
+        """Stop tracing and drop every snapshot (they refer to traces that are now gone)."""
+        tracemalloc.stop()
+        with self._lock:
+            self._snapshots.clear()
+
+    def status(self) -> Dict[str, object]:
+        """Tracing state, traced totals and stored snapshots."""
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        with self._lock:
+            snapshots = list(self._snapshots.values())
+        return {
+            "tracing": tracing,
+            "traceback_frames": tracemalloc.get_traceback_limit() if tracing else 0,
+            "traced_current_bytes": current,
+            "traced_peak_bytes": peak,
+            "tracemalloc_overhead_bytes": tracemalloc.get_tracemalloc_memory(),
+            "snapshots": [
+                {"id": s.id, "taken_at": s.taken_at, "traced_bytes": s.traced_bytes} for s in snapshots
+            ],
+        }
+
+    def take_snapshot(self) -> StoredSnapshot:
+        """
+        Take and keep a snapshot of traced allocations.
+
+        Raises:
+            RuntimeError: If tracing is not started
+        """
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not tracing; start it first")
+
+        snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+        stored = StoredSnapshot(
+            id=next(self._ids),
+            taken_at=datetime.now(timezone.utc),
+            traced_bytes=sum(stat.size for stat in snapshot.statistics("filename")),
+            snapshot=snapshot,
+        )
+        with self._lock:
+            self._snapshots[stored.id] = stored
+            while len(self._snapshots) > self._max_snapshots:
+                self._snapshots.popitem(last=False)
+        return stored
+
+    def get(self, snapshot_id: int) -> Optional[StoredSnapshot]:
+        with self._lock:
+            return self._snapshots.get(snapshot_id)
+
+    @staticmethod
+    def top(stored: StoredSnapshot, limit: int = 25) -> List[Dict[str, object]]:
+        """Largest allocation sites in a snapshot, grouped by ``file:line``."""
+        return [
+            {"location": _location(stat), "size_bytes": stat.size, "count": stat.count}
+            for stat in stored.snapshot.statistics("lineno")[:limit]
+        ]
+
+    @staticmethod
+    def diff(base: StoredSnapshot, current: StoredSnapshot, limit: int = 25) -> List[Dict[str, object]]:
+        """Allocation sites that changed most between two snapshots, grouped by ``file:line``."""
+        return [
+            {
+                "location": _location(stat),
+                "size_bytes": stat.size,
+                "count": stat.count,
+                "size_diff_bytes": stat.size_diff,
+                "count_diff": stat.count_diff,
+            }
+            for stat in current.snapshot.compare_to(base.snapshot, "lineno")[:limit]
+        ]
+
+
+# Global diagnostics instance
+memory_diagnostics = MemoryDiagnostics(max_snapshots=5)
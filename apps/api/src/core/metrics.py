@@ -0,0 +1,229 @@
+"""Prometheus-style metrics in the text exposition format
+
+Request metrics are recorded by ``MetricsMiddleware``, which runs on the
+event loop thread, so counters and histograms are plain dicts and lists
+with no locking. The one metric written from worker threads, connection
+checkout time, is recorded under its own lock by ``InstrumentedQueuePool``.
+Point-in-time values (threadpool and pool occupancy, password hashing
+queue) are read when ``/metrics`` is scraped, so they cost nothing
+between scrapes.
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+import anyio.to_thread
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Starlette appends "; charset=utf-8" to text/* media types
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# Seconds; covers cached reads (sub-ms) through slow writes and streams
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)) + "}"
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """Monotonic counter keyed by label values."""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self, lines: List[str]) -> None:
+        lines.append(f"# HELP {self.name} {self.help_text}")
+        lines.append(f"# TYPE {self.name} counter")
+        for labels, value in list(self._values.items()):
+            lines.append(f"{self.name}{_label_str(self.label_names, labels)} {_format(value)}")
+
+
+class Histogram:
+    """Fixed-bucket histogram keyed by label values.
+
+    Each observation increments a single (non-cumulative) bucket; the
+    cumulative ``le`` series are built at render time.
+    """
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # labels -> [bucket counts..., +Inf count, sum]
+        self._series: Dict[Labels, List[float]] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self, lines: List[str]) -> None:
+        lines.append(f"# HELP {self.name} {self.help_text}")
+        lines.append(f"# TYPE {self.name} histogram")
+        bucket_names = self.label_names + ("le",)
+        for labels, series in list(self._series.items()):
+            series = list(series)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format(bound)
+                lines.append(f"{self.name}_bucket{_label_str(bucket_names, labels + (le,))} {cumulative}")
+            label_str = _label_str(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format(series[-1])}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+
+
+def _gauge(lines: List[str], name: str, help_text: str, samples: Sequence[Tuple[Dict[str, str], float]]) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} gauge")
+    for labels, value in samples:
+        lines.append(f"{name}{_label_str(tuple(labels), tuple(labels.values()))} {_format(value)}")
+
+
+http_requests_total = Counter(
+    "http_requests_total", "HTTP requests by route template and status", ("method", "route", "status")
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "Time until the response finished, by route template", ("method", "route")
+)
+db_pool_checkout_duration = Histogram(
+    "db_pool_checkout_seconds", "Time spent waiting for a pooled database connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+db_pool_timeouts_total = Counter("db_pool_timeouts_total", "Connection checkouts that hit pool_timeout")
+_pool_lock = threading.Lock()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """``QueuePool`` that records how long each checkout waited."""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            with _pool_lock:
+                db_pool_timeouts_total.inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with _pool_lock:
+                db_pool_checkout_duration.observe((), elapsed)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request counts and latency per route template.
+
+    Paths are labelled with the matched route's template (``/events/{event_id}``)
+    so label cardinality stays bounded; requests that match no route are
+    labelled ``unmatched``.
+    """
+
+    in_flight = 0
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        MetricsMiddleware.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            MetricsMiddleware.in_flight -= 1
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            http_requests_total.inc((method, template, str(status_code)))
+            http_request_duration.observe((method, template), time.perf_counter() - start)
+
+
+def _pool_samples(pools: Dict[str, Optional[object]]):
+    checked_out, overflow, idle, size = [], [], [], []
+    for engine_name, pool in pools.items():
+        if not isinstance(pool, QueuePool):
+            continue
+        labels = {"engine": engine_name}
+        checked_out.append((labels, pool.checkedout()))
+        overflow.append((labels, max(0, pool.overflow())))
+        idle.append((labels, pool.checkedin()))
+        size.append((labels, pool.size()))
+    return checked_out, overflow, idle, size
+
+
+def render_metrics(pools: Dict[str, Optional[object]], password_stats: Dict[str, int]) -> str:
+    """
+    Render every metric in the Prometheus text format.
+
+    Must run on the event loop thread (reads the default anyio thread limiter).
+
+    Args:
+        pools: SQLAlchemy pools by engine name (non-QueuePool entries are skipped)
+        password_stats: ``PasswordHasher.stats()``
+
+    Returns:
+        Exposition text
+    """
+    lines: List[str] = []
+    http_requests_total.render(lines)
+    http_request_duration.render(lines)
+    _gauge(lines, "http_requests_in_flight", "HTTP requests currently being served",
+           [({}, MetricsMiddleware.in_flight)])
+
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter_stats = limiter.statistics()
+    _gauge(lines, "threadpool_in_flight", "Sync handlers and dependencies running on the threadpool",
+           [({}, limiter_stats.borrowed_tokens)])
+    _gauge(lines, "threadpool_waiting", "Tasks waiting for a threadpool slot", [({}, limiter_stats.tasks_waiting)])
+    _gauge(lines, "threadpool_capacity", "Threadpool size", [({}, limiter_stats.total_tokens)])
+    _gauge(lines, "password_hash_in_flight", "Password hashes running", [({}, password_stats["in_flight"])])
+    _gauge(lines, "password_hash_queued", "Password hashes waiting for a worker", [({}, password_stats["queued"])])
+
+    checked_out, overflow, idle, size = _pool_samples(pools)
+    _gauge(lines, "db_pool_checked_out", "Connections currently checked out", checked_out)
+    _gauge(lines, "db_pool_overflow", "Connections open beyond pool_size", overflow)
+    _gauge(lines, "db_pool_idle", "Idle connections in the pool", idle)
+    _gauge(lines, "db_pool_size", "Configured pool_size", size)
+    with _pool_lock:
+        db_pool_checkout_duration.render(lines)
+        db_pool_timeouts_total.render(lines)
+
+    lines.append("")
+    return "\n".join(lines)
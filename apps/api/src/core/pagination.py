@@ -0,0 +1,112 @@
+"""Keyset (cursor) pagination helpers
+
+Offset pagination makes the database walk and discard every skipped row,
+so deep pages get slower as tables grow. Keyset pagination instead
+remembers the sort key of the last row served and asks for rows strictly
+after it, which an index on the sort columns answers in constant time.
+
+Cursors are opaque to clients: a URL-safe base64 JSON list of the last
+row's sort-key values. Every ordering ends with the primary key so ties
+are broken deterministically.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, literal, tuple_
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode sort-key values into an opaque cursor string."""
+    serialized = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(serialized, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _cursor_value(column: Any, value: Any) -> Any:
+    """Convert a decoded cursor value to its column's type; ValueError if it does not fit."""
+    if isinstance(column.type, DateTime):
+        if not isinstance(value, str):
+            raise ValueError(f"cursor value for {column.key} is not a timestamp")
+        return datetime.fromisoformat(value)
+    expected = column.type.python_type
+    if not isinstance(value, expected) or (isinstance(value, bool) and expected is not bool):
+        raise ValueError(f"cursor value for {column.key} is not a {expected.__name__}")
+    return value
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> List[Any]:
+    """
+    Decode a cursor produced by ``encode_cursor`` for the given sort columns.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed, for another ordering,
+            or holds a value that does not fit its sort column's type
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match sort columns")
+        return [_cursor_value(col, v) for col, v in zip(columns, values)]
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def paginate_query(
+    query,
+    columns: Sequence[Any],
+    limit: int,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    descending: bool = True,
+):
+    """
+    Order a query by ``columns`` and select one page plus a look-ahead row
+
+    With a cursor the page starts strictly after it and ``offset`` is
+    ignored; without one, legacy offset paging applies. Works for both ORM
+    ``Query`` objects and 2.0-style ``select()``. Pass the fetched rows to
+    ``split_page``.
+
+    Args:
+        query: Query or select to paginate
+        columns: Sort columns, ending with a unique column (the primary key)
+        limit: Page size
+        offset: Rows to skip when no cursor is given
+        cursor: Cursor from a previous page's ``next_cursor``
+        descending: Sort direction applied to every column
+    """
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        key = tuple_(*columns)
+        bound = tuple_(*[literal(v, col.type) for col, v in zip(columns, values)])
+        query = query.where(key < bound if descending else key > bound)
+
+    query = query.order_by(*[col.desc() if descending else col.asc() for col in columns])
+    if offset and not cursor:
+        query = query.offset(offset)
+    return query.limit(limit + 1)
+
+
+def split_page(rows: Sequence[Any], columns: Sequence[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """
+    Trim a ``paginate_query`` fetch to one page and build the next cursor
+
+    Rows may be ORM objects or result rows; sort-key values are read by
+    each column's attribute name.
+
+    Returns:
+        Tuple of (page rows, next cursor or None on the last page)
+    """
+    page = list(rows[:limit])
+    if len(rows) <= limit or not page:
+        return page, None
+
+    last = page[-1]
+    return page, encode_cursor([getattr(last, col.key) for col in columns])
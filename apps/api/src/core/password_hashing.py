@@ -0,0 +1,106 @@
+"""Dedicated executor for bcrypt password hashing
+
+bcrypt is deliberately slow. Running it on the shared anyio threadpool lets
+a login storm starve every other sync endpoint, so hashing and verification
+run on their own small pool with a bounded backlog instead.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+from fastapi import HTTPException, status
+from .config import settings
+from .profiler import track_request_thread
+from .security import verify_and_update_password
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """Bounded executor for password hashing with queue-depth metrics."""
+
+    def __init__(self, max_workers: int, max_queue: int) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="password-hash",
+                    )
+        return self._executor
+
+    def _run(self, fn: Callable[..., T], *args) -> T:
+        with self._lock:
+            self._in_flight += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._pending -= 1
+                self.completed += 1
+
+    async def submit(self, fn: Callable[..., T], *args) -> T:
+        """
+        Run a hashing function on the dedicated executor
+
+        Raises:
+            HTTPException: 503 if the backlog is already at max_queue
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many concurrent login attempts, please retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+
+        try:
+            future = self._get_executor().submit(self._run, track_request_thread(fn), *args)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        return await asyncio.wrap_future(future)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify a password off the request threadpool (see verify_and_update_password)"""
+        return await self.submit(verify_and_update_password, plain_password, hashed_password)
+
+    def stats(self) -> Dict[str, int]:
+        """Return concurrency and queue-depth counters."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "queued": self._pending - self._in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the executor, waiting for running jobs to finish."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+# Global password hasher instance
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
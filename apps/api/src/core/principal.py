@@ -0,0 +1,106 @@
+"""Authenticated principal and its in-process cache
+
+Most endpoints only need the caller's id and role, so ``get_current_user``
+resolves the token's ``sub`` to a lightweight ``Principal`` and caches it
+instead of loading the ``User`` row on every request.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from ..models.user import User, UserRole
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Lightweight, detached view of an authenticated user."""
+    id: str
+    role: UserRole
+    email: str
+    display_name: str
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        """Build a principal from a ``User`` row."""
+        return cls(
+            id=user.id,
+            role=user.role,
+            email=user.email,
+            display_name=user.display_name,
+        )
+
+
+class PrincipalCache:
+    """
+    Bounded LRU cache from user id (``sub``) to ``Principal``.
+
+    Entries also expire after a TTL so role changes made by other
+    processes are picked up eventually; changes made in this process
+    invalidate the entry immediately.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: int = 300):
+        """
+        Initialize principal cache.
+
+        Args:
+            max_size: Maximum number of cached principals (LRU eviction beyond this)
+            ttl_seconds: How long a principal is trusted before reloading it
+        """
+        self._entries: "OrderedDict[str, Tuple[float, Principal]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: str) -> Optional[Principal]:
+        """Return the cached principal for a user id, or None on miss/expiry."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, principal: Principal) -> None:
+        """Cache a principal."""
+        expires_at = time.monotonic() + self._ttl_seconds
+        with self._lock:
+            self._entries[principal.id] = (expires_at, principal)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop a cached principal (e.g. after a role change)."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_size": self._max_size,
+            }
+
+    def clear(self):
+        """Clear cached principals and reset counters (useful for testing)."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Global principal cache instance
+principal_cache = PrincipalCache(max_size=10000, ttl_seconds=300)
@@ -0,0 +1,343 @@
+"""On-demand sampling profiler for admins
+
+Sync handlers and dependencies run on the threadpool and bcrypt on its own
+executor, so a profiler that only watches the calling thread (cProfile)
+misses most of a request. ``StackSampler`` instead snapshots every
+thread's stack at a fixed interval and aggregates them as collapsed stacks
+(``frame;frame;frame count``), the input format of flamegraph.pl and
+speedscope.
+
+Profiles are taken either for one request, by an admin sending
+``X-Profile: 1`` (``ProfilerMiddleware``), or for a time window across all
+traffic (``POST /admin/profiles``). Recent profiles are kept in memory.
+
+A request profile only keeps stacks of the threads working for that
+request: the event loop while the request's task is running, and worker
+threads while they run a call the request handed to the anyio threadpool
+or the password hasher (``RequestThreads``). Other traffic served
+meanwhile is left out.
+"""
+import asyncio
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Set, TypeVar
+import anyio.to_thread
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from ..database import SessionLocal
+from .config import settings
+from .deps import get_principal_for_token, require_admin
+
+T = TypeVar("T")
+
+# Innermost frames of a thread that is waiting for work rather than doing it
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("runners.py", "run"),  # event loop idle inside uvloop's C run loop
+    ("thread.py", "_worker"),
+}
+_PATH_ROOTS = sorted({os.path.dirname(p) for p in sys.path if p}, key=len, reverse=True)
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    for root in _PATH_ROOTS:
+        if filename.startswith(root + os.sep):
+            filename = filename[len(root) + 1:]
+            break
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+@dataclass
+class Profile:
+    """Aggregated stack samples from one profiling run."""
+    id: int
+    kind: str
+    label: str
+    started_at: datetime
+    duration_ms: float = 0.0
+    samples: int = 0
+    stacks: Counter = field(default_factory=Counter)
+
+    def collapsed(self) -> str:
+        """Stacks in collapsed format, heaviest first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class RequestThreads:
+    """Threads currently running code for one profiled request.
+
+    Created on the event loop by ``ProfilerMiddleware``; worker threads add
+    themselves for the duration of each call wrapped with ``track``.
+    """
+
+    def __init__(self):
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        self._loop_thread = threading.get_ident()
+        self._workers: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def track(self, fn: Callable[..., T]) -> Callable[..., T]:
+        """Wrap ``fn`` so the thread running it is sampled while it runs."""
+        def run(*args, **kwargs) -> T:
+            ident = threading.get_ident()
+            with self._lock:
+                self._workers[ident] += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._workers[ident] -= 1
+                    if not self._workers[ident]:
+                        del self._workers[ident]
+        return run
+
+    def active(self) -> Set[int]:
+        """Idents of the threads working for the request right now."""
+        with self._lock:
+            idents = set(self._workers)
+        if asyncio.current_task(self._loop) is self._task:
+            idents.add(self._loop_thread)
+        return idents
+
+
+current_request_threads: ContextVar[Optional[RequestThreads]] = ContextVar("current_request_threads", default=None)
+
+
+def track_request_thread(fn: Callable[..., T]) -> Callable[..., T]:
+    """Wrap ``fn`` for a worker thread if the calling request is being profiled."""
+    threads = current_request_threads.get()
+    return fn if threads is None else threads.track(fn)
+
+
+@contextmanager
+def threadpool_tracking() -> Iterator[None]:
+    """
+    Route anyio threadpool calls through ``track_request_thread`` meanwhile.
+
+    Sync dependencies, sync handlers and ``run_in_threadpool`` all end up
+    in ``anyio.to_thread.run_sync``; it is only replaced while a request
+    profile runs (one at a time) and restored afterwards.
+    """
+    run_sync = anyio.to_thread.run_sync
+
+    async def run_sync_tracked(func, *args, **kwargs):
+        return await run_sync(track_request_thread(func), *args, **kwargs)
+
+    anyio.to_thread.run_sync = run_sync_tracked
+    try:
+        yield
+    finally:
+        anyio.to_thread.run_sync = run_sync
+
+
+class StackSampler:
+    """Background thread sampling thread stacks into a ``Profile``.
+
+    Samples every thread except ``exclude_thread``, or only the threads in
+    ``threads.active()`` when a ``RequestThreads`` is given.
+    """
+
+    def __init__(
+        self,
+        profile: Profile,
+        interval_seconds: float,
+        exclude_thread: Optional[int] = None,
+        threads: Optional[RequestThreads] = None,
+    ):
+        self.profile = profile
+        self.interval_seconds = interval_seconds
+        self.exclude_thread = exclude_thread
+        self.threads = threads
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._started = 0.0
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> Profile:
+        self._stop.set()
+        self._thread.join()
+        self.profile.duration_ms = round((time.perf_counter() - self._started) * 1000, 1)
+        return self.profile
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval_seconds):
+            frames = sys._current_frames()
+            allowed = self.threads.active() if self.threads is not None else None
+            for ident, frame in frames.items():
+                if ident == own_ident or ident == self.exclude_thread:
+                    continue
+                if allowed is not None and ident not in allowed:
+                    continue
+                leaf = frame.f_code
+                if (os.path.basename(leaf.co_filename), leaf.co_name) in _IDLE_LEAVES:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                if ident not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack.append(names.get(ident, str(ident)))
+                self.profile.stacks[";".join(reversed(stack))] += 1
+            self.profile.samples += 1
+
+
+class ProfileStore:
+    """Bounded in-memory store of recent profiles; one run at a time."""
+
+    def __init__(self, max_profiles: int = 20):
+        self._profiles: Deque[Profile] = deque(maxlen=max_profiles)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._busy = threading.Lock()
+
+    def busy(self) -> bool:
+        """Whether a profile is running right now."""
+        return self._busy.locked()
+
+    def start(
+        self,
+        kind: str,
+        label: str,
+        exclude_current_thread: bool = False,
+        threads: Optional[RequestThreads] = None,
+    ) -> Optional[StackSampler]:
+        """
+        Start sampling, or return None if another profile is running.
+
+        Args:
+            kind: "request" or "window"
+            label: Human-readable description of what was profiled
+            exclude_current_thread: Skip the calling thread (it only waits for the window)
+            threads: Only sample these threads (a request profile)
+        """
+        if not self._busy.acquire(blocking=False):
+            return None
+        profile = Profile(id=next(self._ids), kind=kind, label=label, started_at=datetime.now(timezone.utc))
+        exclude = threading.get_ident() if exclude_current_thread else None
+        sampler = StackSampler(profile, settings.PROFILER_SAMPLE_INTERVAL_MS / 1000, exclude, threads)
+        sampler.start()
+        return sampler
+
+    def finish(self, sampler: StackSampler) -> Profile:
+        """Stop sampling and keep the profile."""
+        try:
+            profile = sampler.stop()
+        finally:
+            self._busy.release()
+        with self._lock:
+            self._profiles.append(profile)
+        return profile
+
+    def list(self) -> List[Profile]:
+        with self._lock:
+            return list(reversed(self._profiles))
+
+    def get(self, profile_id: int) -> Optional[Profile]:
+        with self._lock:
+            return next((p for p in self._profiles if p.id == profile_id), None)
+
+    def stats(self) -> Dict[str, int]:
+        """Return stored profile and distinct stack counts."""
+        with self._lock:
+            return {
+                "profiles": len(self._profiles),
+                "stacks": sum(len(p.stacks) for p in self._profiles),
+            }
+
+
+# Global store for admin-requested profiles
+profile_store = ProfileStore(max_profiles=20)
+
+
+def _bearer_token(authorization: str) -> Optional[str]:
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return token
+
+
+def _is_admin_token(token: str) -> bool:
+    db = SessionLocal()
+    try:
+        require_admin(get_principal_for_token(token, db))
+        return True
+    except HTTPException:
+        return False
+    finally:
+        db.close()
+
+
+class ProfilerMiddleware:
+    """Profile single requests that carry ``X-Profile`` and an admin token.
+
+    The request is served normally; the response gets an ``X-Profile-Id``
+    header naming the stored profile (``GET /admin/profiles/{id}``). The
+    header is ignored when profiling is disabled, for values other than
+    ``1``, for non-admins and while another profile is running. The admin
+    check (a principal lookup) only runs once the cheap checks pass.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    @staticmethod
+    def _header(scope: Scope, name: bytes) -> Optional[str]:
+        for key, value in scope["headers"]:
+            if key == name:
+                return value.decode("latin-1")
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not settings.PROFILER_ENABLED
+            or self._header(scope, b"x-profile") != "1"
+            or profile_store.busy()
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        token = _bearer_token(self._header(scope, b"authorization") or "")
+        sampler = None
+        if token is not None and await run_in_threadpool(_is_admin_token, token):
+            threads = RequestThreads()
+            sampler = profile_store.start("request", f"{scope['method']} {scope['path']}", threads=threads)
+        if sampler is None:
+            await self.app(scope, receive, send)
+            return
+        context_token = current_request_threads.set(threads)
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Profile-Id"] = str(sampler.profile.id)
+            await send(message)
+
+        try:
+            with threadpool_tracking():
+                await self.app(scope, receive, send_with_id)
+        finally:
+            current_request_threads.reset(context_token)
+            route = scope.get("route")
+            if route is not None:
+                sampler.profile.label = f"{scope['method']} {route.path}"
+            profile_store.finish(sampler)
@@ -0,0 +1,178 @@
+"""Per-request SQL statement counting and slow-query logging
+
+``instrument_engine`` hooks an engine's cursor events. While a request is
+being served, ``QueryStatsMiddleware`` keeps a ``QueryStats`` in a context
+variable (copied into threadpool workers and async-engine greenlets), so
+every statement the request issues is counted and timed against it. The
+totals go out as a ``Server-Timing`` header and in a per-request log line,
+logged at INFO only for requests that issue many statements or spend long
+in the database (DEBUG otherwise).
+
+Strict mode (``SQL_STRICT_MAX_QUERIES`` / ``SQL_STRICT_MAX_REPEATS``) turns
+an over-budget request into an error, so tests fail on new N+1 patterns.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """A request issued more statements than strict mode allows."""
+
+
+class QueryStats:
+    """Statements issued while serving one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.duration += elapsed
+        shape = _WHITESPACE.sub(" ", statement).strip()
+        self.shapes[shape] += 1
+        self._enforce(shape)
+
+    def _enforce(self, shape: str) -> None:
+        max_queries = settings.SQL_STRICT_MAX_QUERIES
+        if max_queries and self.count > max_queries:
+            raise QueryBudgetExceeded(f"Request issued more than {max_queries} SQL statements; last: {shape}")
+        max_repeats = settings.SQL_STRICT_MAX_REPEATS
+        if max_repeats and self.shapes[shape] > max_repeats:
+            raise QueryBudgetExceeded(
+                f"Request repeated the same SQL statement more than {max_repeats} times: {shape}"
+            )
+
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def parameter_shape(parameters: Any, executemany: bool) -> Any:
+    """Bound parameters with values replaced by their type names."""
+    if executemany:
+        rows = list(parameters)
+        return {"rows": len(rows), "first": parameter_shape(rows[0], False) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append((context, time.perf_counter()))
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()[1]
+
+    if elapsed * 1000 >= settings.SQL_SLOW_QUERY_MS:
+        logger.warning(
+            "Slow SQL statement",
+            extra={
+                "duration_ms": round(elapsed * 1000, 1),
+                "statement": statement,
+                "parameters": parameter_shape(parameters, executemany),
+            },
+        )
+
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start
+    # so the next statement on this pooled connection is timed correctly.
+    # Errors raised after it ran (e.g. while fetching) find no matching entry.
+    conn = exception_context.connection
+    starts = conn.info.get("query_start") if conn is not None else None
+    if starts and starts[-1][0] is exception_context.execution_context:
+        starts.pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count, time and slow-log every statement executed on ``engine``."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class QueryStatsMiddleware:
+    """Pure ASGI middleware collecting ``QueryStats`` for each HTTP request.
+
+    Adds ``Server-Timing: db;dur=<ms>;desc="<n> queries"`` to the response
+    and logs one line per request with the route template, status, duration
+    and statement count: at INFO when the request issued at least
+    ``SQL_REQUEST_LOG_QUERIES`` statements or spent ``SQL_SLOW_QUERY_MS`` in
+    the database, at DEBUG otherwise.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries", '
+                    f"app;dur={(time.perf_counter() - start) * 1000:.1f}",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            notable = (
+                stats.count >= settings.SQL_REQUEST_LOG_QUERIES
+                or stats.duration * 1000 >= settings.SQL_SLOW_QUERY_MS
+            )
+            level = logging.INFO if notable else logging.DEBUG
+            if logger.isEnabledFor(level):
+                self._log_request(level, scope, status_code, start, stats)
+
+    @staticmethod
+    def _log_request(level: int, scope: Scope, status_code: int, start: float, stats: QueryStats) -> None:
+        route = scope.get("route")
+        repeated = stats.shapes.most_common(1)
+        logger.log(
+            level,
+            "Request served",
+            extra={
+                "method": scope["method"],
+                "route": getattr(route, "path", None) or scope["path"],
+                "status": status_code,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+                "db_queries": stats.count,
+                "db_ms": round(stats.duration * 1000, 1),
+                "db_max_repeats": repeated[0][1] if repeated else 0,
+            },
+        )
@@ -1,28 +1,58 @@
 """Simple in-memory rate limiter for API endpoints."""
 from collections import defaultdict, deque
+import threading
 import time
+from typing import Dict
 from fastapi import HTTPException, status
 
 
 class RateLimiter:
-    """In-memory sliding window rate limiter."""
+    """In-memory sliding window rate limiter.
+
+    Keys whose window has gone quiet are swept out at most once per period,
+    so the table holds only recently active callers.
+    """
 
     def __init__(self, max_calls: int, period_seconds: int) -> None:
         self.max_calls = max_calls
         self.period_seconds = period_seconds
         self.calls = defaultdict(deque)
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + period_seconds
+        self.evicted = 0
 
     def enforce(self, key: str) -> None:
         now = time.monotonic()
-        window = self.calls[key]
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+
+            window = self.calls[key]
+
+            while window and now - window[0] > self.period_seconds:
+                window.popleft()
+
+            if len(window) >= self.max_calls:
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many approval actions, please slow down",
+                )
 
-        while window and now - window[0] > self.period_seconds:
-            window.popleft()
+            window.append(now)
 
-        if len(window) >= self.max_calls:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Too many approval actions, please slow down",
-            )
+    def _sweep(self, now: float) -> None:
+        # Caller holds the lock
+        idle = [key for key, window in self.calls.items() if not window or now - window[-1] > self.period_seconds]
+        for key in idle:
+            del self.calls[key]
+        self.evicted += len(idle)
+        self._next_sweep = now + self.period_seconds
 
-        window.append(now)
+    def stats(self) -> Dict[str, int]:
+        """Return tracked key and timestamp counts."""
+        with self._lock:
+            return {
+                "keys": len(self.calls),
+                "timestamps": sum(len(window) for window in self.calls.values()),
+                "evicted": self.evicted,
+            }
@@ -0,0 +1,178 @@
+"""In-memory cache for rendered responses
+
+The public event listing is the highest-traffic route and nearly every
+request is a repeat read of the same few pages. Rendered bodies are kept
+in a bounded LRU, dropped wholesale by the writes that change them, and
+expire after a short TTL so writes made by other API processes show up
+too.
+
+Concurrent misses for the same key are collapsed: the first caller
+renders the page while the others wait for its result, so an
+invalidation under load costs one query per page rather than one per
+waiting request.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class ResponseCache:
+    """Bounded LRU of rendered responses with single-flight misses."""
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: int = 30):
+        """
+        Initialize response cache.
+
+        Args:
+            max_size: Maximum number of cached responses (LRU eviction beyond this)
+            ttl_seconds: Upper bound on staleness for writes made elsewhere
+        """
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._async_inflight: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _lookup(self, key: Hashable, now: float):
+        # Caller holds the lock
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+        return False, None
+
+    def _store(self, key: Hashable, value: Any, generation: int, now: float) -> None:
+        # Caller holds the lock; skip values rendered before an invalidation
+        if generation != self._generation:
+            return
+        self._entries[key] = (now + self._ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for ``key``, or compute it once for all concurrent callers.
+
+        Args:
+            key: Cache key
+            compute: Callable rendering the value on miss (runs on the calling thread)
+        """
+        now = time.monotonic()
+        with self._lock:
+            found, value = self._lookup(key, now)
+            if found:
+                return value
+            pending = self._inflight.get(key)
+            if pending is None:
+                pending = Future()
+                self._inflight[key] = pending
+                owner = True
+                self.misses += 1
+                generation = self._generation
+            else:
+                owner = False
+                self.coalesced += 1
+
+        if not owner:
+            return pending.result()
+
+        try:
+            value = compute()
+        except BaseException as exc:
+            with self._lock:
+                self._inflight.pop(key, None)
+            pending.set_exception(exc)
+            raise
+
+        with self._lock:
+            self._inflight.pop(key, None)
+            self._store(key, value, generation, now)
+        pending.set_result(value)
+        return value
+
+    async def get_or_compute_async(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async variant of ``get_or_compute``; misses are collapsed per event loop.
+
+        Args:
+            key: Cache key
+            compute: Coroutine function rendering the value on miss
+        """
+        now = time.monotonic()
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        with self._lock:
+            found, value = self._lookup(key, now)
+            if found:
+                return value
+            pending = self._async_inflight.get(flight_key)
+            if pending is None:
+                pending = loop.create_future()
+                self._async_inflight[flight_key] = pending
+                owner = True
+                self.misses += 1
+                generation = self._generation
+            else:
+                owner = False
+                self.coalesced += 1
+
+        if not owner:
+            return await asyncio.shield(pending)
+
+        try:
+            value = await compute()
+        except BaseException as exc:
+            with self._lock:
+                self._async_inflight.pop(flight_key, None)
+            if isinstance(exc, asyncio.CancelledError):
+                pending.cancel()
+            else:
+                pending.set_exception(exc)
+                # Waiters re-raise it; don't warn if there were none
+                pending.exception()
+            raise
+
+        with self._lock:
+            self._async_inflight.pop(flight_key, None)
+            self._store(key, value, generation, now)
+        pending.set_result(value)
+        return value
+
+    def invalidate(self) -> None:
+        """Drop every cached response (renders already in flight are not stored)."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "size": len(self._entries),
+                "max_size": self._max_size,
+            }
+
+    def clear(self):
+        """Clear cached responses and reset counters (useful for testing)."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.coalesced = 0
+
+
+# Global cache for the public (anonymous / member) event listing
+event_list_cache = ResponseCache(max_size=1024, ttl_seconds=30)
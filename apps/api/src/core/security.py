@@ -1,22 +1,51 @@
 """Security utilities for authentication and authorization"""
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict
-from jose import JWTError, jwt, jwk
+from typing import Optional, Dict, Tuple
+from jose import JWTError, jwt
 from jose.utils import base64url_decode
 from passlib.context import CryptContext
 from .config import settings
 from .jwks import jwks_cache
+from .token_cache import token_cache
 import json
 
 # Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+)
+
+# Marker for accounts that cannot log in with a password (walk-in users).
+# It is never a valid bcrypt hash, so no hashing work is needed to create it.
+UNUSABLE_PASSWORD = "!"
+
+
+def is_password_usable(hashed_password: Optional[str]) -> bool:
+    """Check whether a stored hash can ever match a password"""
+    return bool(hashed_password) and not hashed_password.startswith(UNUSABLE_PASSWORD)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password"""
+    if not is_password_usable(hashed_password):
+        return False
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and return a replacement hash if the stored one is outdated
+
+    Returns:
+        Tuple of (is_valid, new_hash). new_hash is None unless the stored hash
+        uses a deprecated scheme or a different bcrypt cost factor.
+    """
+    if not is_password_usable(hashed_password):
+        return False, None
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     """Hash a password for storing"""
     return pwd_context.hash(password)
@@ -54,19 +83,42 @@ def decode_access_token(token: str) -> Optional[dict]:
     - Legacy HS256 tokens (signed with SECRET_KEY)
     - Cognito RS256 tokens (signed with Cognito's private key, verified with JWKS)
 
+    Verified payloads are cached until the token's ``exp`` so repeated
+    requests with the same token skip signature verification.
+
     Args:
         token: JWT token string
 
     Returns:
         Decoded token payload or None if invalid
     """
-    # First, try to decode using Cognito JWKS (RS256)
-    if settings.COGNITO_USER_POOL_ID and settings.COGNITO_REGION:
-        cognito_payload = _decode_cognito_token(token)
-        if cognito_payload:
-            return cognito_payload
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+
+    payload = _verify_token(token)
+    if payload is not None:
+        token_cache.set(token, payload)
 
-    # Fallback to legacy HS256 verification
+    return payload
+
+
+def _verify_token(token: str) -> Optional[dict]:
+    """Verify a token, routing to the Cognito or legacy path by its ``alg`` header."""
+    try:
+        algorithm = jwt.get_unverified_headers(token).get("alg")
+    except JWTError:
+        return None
+
+    # Cognito tokens are RS256; only take the JWKS path for them
+    if (
+        algorithm == "RS256"
+        and settings.COGNITO_USER_POOL_ID
+        and settings.COGNITO_REGION
+    ):
+        return _decode_cognito_token(token)
+
+    # Legacy HS256 verification
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         return payload
@@ -92,24 +144,11 @@ def _decode_cognito_token(token: str) -> Optional[Dict]:
         if not kid:
             return None
 
-        # Get JWKS from cache
-        jwks = jwks_cache.get_jwks()
-        if not jwks:
+        # Look up the pre-constructed public key for this 'kid'
+        public_key = jwks_cache.get_key(kid)
+        if public_key is None:
             return None
 
-        # Find the key matching the 'kid'
-        key = None
-        for jwk_key in jwks.get("keys", []):
-            if jwk_key.get("kid") == kid:
-                key = jwk_key
-                break
-
-        if not key:
-            return None
-
-        # Construct the public key from JWK
-        public_key = jwk.construct(key)
-
         # Decode and verify the token
         payload = jwt.decode(
             token,
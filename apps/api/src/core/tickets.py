@@ -0,0 +1,153 @@
+"""Signed, self-verifying QR ticket codes
+
+Format: ``EM1.<payload>.<signature>``
+
+- ``payload`` is URL-safe base64 of the packed registration id and event id
+  (UUIDs pack into 16 bytes each, other ids are length-prefixed UTF-8)
+- ``signature`` is a truncated HMAC-SHA256 over ``EM1.<payload>``
+
+Scanners can therefore reject garbage, forged or other-event tickets by
+checking the signature alone, before any database lookup. Legacy codes
+(``QR-{event_id}-{user_id}-...``) remain valid and are looked up as before.
+"""
+import base64
+import binascii
+import hashlib
+import hmac
+import uuid
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from .config import settings
+
+TICKET_PREFIX = "EM1."
+LEGACY_PREFIX = "QR-"
+_SIGNATURE_BYTES = 12
+
+
+@dataclass(frozen=True)
+class TicketCode:
+    """Decoded contents of a signed ticket code."""
+    registration_id: str
+    event_id: str
+
+
+def _signing_key() -> bytes:
+    """Dedicated key if configured, otherwise one derived from SECRET_KEY."""
+    if settings.TICKET_SIGNING_KEY:
+        return settings.TICKET_SIGNING_KEY.encode("utf-8")
+    return hmac.new(settings.SECRET_KEY.encode("utf-8"), b"ticket-signing", hashlib.sha256).digest()
+
+
+_KEY = _signing_key()
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _sign(message: str) -> str:
+    digest = hmac.new(_KEY, message.encode("ascii"), hashlib.sha256).digest()
+    return _b64encode(digest[:_SIGNATURE_BYTES])
+
+
+def _pack_id(value: str) -> bytes:
+    try:
+        parsed = uuid.UUID(value)
+        if str(parsed) == value:
+            return b"\x00" + parsed.bytes
+    except ValueError:
+        pass
+    raw = value.encode("utf-8")
+    if len(raw) > 255:
+        raise ValueError("id too long for ticket code")
+    return b"\x01" + bytes([len(raw)]) + raw
+
+
+def _unpack_id(data: bytes, pos: int) -> Tuple[str, int]:
+    tag = data[pos]
+    if tag == 0:
+        return str(uuid.UUID(bytes=data[pos + 1:pos + 17])), pos + 17
+    if tag == 1:
+        length = data[pos + 1]
+        end = pos + 2 + length
+        if end > len(data):
+            raise ValueError("truncated id")
+        return data[pos + 2:end].decode("utf-8"), end
+    raise ValueError("unknown id tag")
+
+
+def issue_ticket_code(registration_id: str, event_id: str) -> str:
+    """Build a signed ticket code for a registration."""
+    payload = _b64encode(_pack_id(registration_id) + _pack_id(event_id))
+    message = TICKET_PREFIX + payload
+    return f"{message}.{_sign(message)}"
+
+
+def is_signed_ticket_code(code: str) -> bool:
+    """Whether a code uses the signed format (valid or not)."""
+    return code.startswith(TICKET_PREFIX)
+
+
+def is_legacy_ticket_code(code: str) -> bool:
+    """Whether a code uses the pre-signature ``QR-...`` format."""
+    return code.startswith(LEGACY_PREFIX)
+
+
+def parse_ticket_code(code: str) -> Optional[TicketCode]:
+    """
+    Verify a signed ticket code without touching the database.
+
+    Returns:
+        Decoded ids, or None if the code is malformed or the signature is wrong
+    """
+    # Valid codes are pure ASCII; anything else would break signing/comparison
+    if not is_signed_ticket_code(code) or not code.isascii():
+        return None
+
+    message, _, signature = code.rpartition(".")
+    if not message.startswith(TICKET_PREFIX):
+        return None
+    if not hmac.compare_digest(signature.encode("ascii"), _sign(message).encode("ascii")):
+        return None
+
+    try:
+        data = _b64decode(message[len(TICKET_PREFIX):])
+        registration_id, pos = _unpack_id(data, 0)
+        event_id, pos = _unpack_id(data, pos)
+    except (ValueError, IndexError, binascii.Error, UnicodeError):
+        return None
+
+    if pos != len(data):
+        return None
+    return TicketCode(registration_id=registration_id, event_id=event_id)
+
+
+def precheck_ticket_code(code: str, expected_event_id: Optional[str] = None) -> Optional[str]:
+    """
+    Reject codes that cannot possibly be valid, without a database lookup.
+
+    Args:
+        code: Scanned QR code
+        expected_event_id: Event the scanner is bound to, if any
+
+    Returns:
+        Rejection message, or None if the code should be looked up
+    """
+    if is_signed_ticket_code(code):
+        ticket = parse_ticket_code(code)
+        if ticket is None:
+            return "Invalid Ticket / QR Code not found"
+        if expected_event_id and ticket.event_id != expected_event_id:
+            return "Ticket is for a different event"
+        return None
+
+    if is_legacy_ticket_code(code):
+        if expected_event_id and not code.startswith(f"{LEGACY_PREFIX}{expected_event_id}-"):
+            return "Ticket is for a different event"
+        return None
+
+    return "Invalid Ticket / QR Code not found"
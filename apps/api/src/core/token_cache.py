@@ -0,0 +1,117 @@
+"""In-memory cache of verified JWT payloads
+
+Signature verification (HS256 or RS256 via JWKS) is the expensive part of
+authenticating a request. Clients such as scanner stations and the SPA send
+the same bearer token many times a minute, so once a token has been verified
+we keep its payload until the token's own ``exp`` claim is reached.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+class TokenCache:
+    """
+    Bounded, TTL-aware LRU cache of verified token payloads.
+
+    Entries are keyed by a SHA-256 digest of the raw token so the cache never
+    holds bearer credentials, and each entry expires at the token's ``exp``.
+    """
+
+    def __init__(self, max_size: int = 10000, max_ttl_seconds: int = 3600):
+        """
+        Initialize token cache.
+
+        Args:
+            max_size: Maximum number of cached payloads (LRU eviction beyond this)
+            max_ttl_seconds: Upper bound for how long a payload is cached,
+                regardless of the token's ``exp`` claim
+        """
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_size = max_size
+        self._max_ttl_seconds = max_ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict]:
+        """
+        Return the cached payload for a token, or None on miss/expiry.
+
+        Args:
+            token: Raw JWT string
+
+        Returns:
+            Previously verified payload or None
+        """
+        key = self._digest(token)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, payload = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def set(self, token: str, payload: Dict) -> None:
+        """
+        Cache a verified payload until the token's ``exp`` claim.
+
+        Payloads without a numeric ``exp`` are not cached.
+
+        Args:
+            token: Raw JWT string
+            payload: Verified token payload
+        """
+        exp = payload.get("exp")
+        if not isinstance(exp, (int, float)):
+            return
+
+        now = time.time()
+        expires_at = min(float(exp), now + self._max_ttl_seconds)
+        if expires_at <= now:
+            return
+
+        key = self._digest(token)
+        with self._lock:
+            self._entries[key] = (expires_at, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_size": self._max_size,
+            }
+
+    def clear(self):
+        """Clear cached payloads and reset counters (useful for testing)."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Global token cache instance
+token_cache = TokenCache(max_size=10000, max_ttl_seconds=3600)
@@ -1,9 +1,14 @@
 """Database connection and session management"""
+import threading
+import weakref
+from typing import AsyncIterator, List, Optional
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import QueuePool
 from .core.config import settings
+from .core.metrics import InstrumentedQueuePool
+from .core.query_stats import instrument_engine
 
 
 def _create_engine():
@@ -21,7 +26,7 @@ def _create_engine():
         # PostgreSQL configuration (production/staging)
         return create_engine(
             settings.DATABASE_URL,
-            poolclass=QueuePool,
+            poolclass=InstrumentedQueuePool,  # QueuePool recording checkout wait
             pool_size=5,
             max_overflow=10,
             pool_timeout=30,
@@ -31,16 +36,82 @@ def _create_engine():
         )
 
 
+def _async_database_url(url: str) -> str:
+    """Map the configured sync URL onto its async driver (asyncpg / aiosqlite)."""
+    if url.startswith("sqlite+aiosqlite") or url.startswith("postgresql+asyncpg"):
+        return url
+    if url.startswith("sqlite"):
+        return "sqlite+aiosqlite" + url[url.index(":"):]
+    if url.startswith("postgres"):
+        return "postgresql+asyncpg" + url[url.index(":"):]
+    return url
+
+
+def _create_async_engine() -> AsyncEngine:
+    """Create async database engine mirroring the sync engine settings."""
+    url = _async_database_url(settings.DATABASE_URL)
+
+    if url.startswith("sqlite"):
+        return create_async_engine(url, echo=settings.DEBUG)
+
+    return create_async_engine(
+        url,
+        pool_size=5,
+        max_overflow=10,
+        pool_timeout=30,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+        echo=settings.DEBUG
+    )
+
+
 # Create database engine
 engine = _create_engine()
+instrument_engine(engine)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine and session factory (only when DATABASE_ASYNC is enabled,
+# so the async drivers are not required otherwise)
+async_engine: Optional[AsyncEngine] = _create_async_engine() if settings.DATABASE_ASYNC else None
+if async_engine is not None:
+    instrument_engine(async_engine.sync_engine)
+AsyncSessionLocal: Optional[async_sessionmaker] = (
+    async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    if async_engine is not None
+    else None
+)
+
 # Base class for ORM models
 Base = declarative_base()
 
 
+class LiveSessions:
+    """Sessions handed out by the dependencies, held weakly for diagnostics."""
+
+    def __init__(self):
+        self._sessions: "weakref.WeakSet[Session]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def add(self, session: Session) -> None:
+        with self._lock:
+            self._sessions.add(session)
+
+    def discard(self, session: Session) -> None:
+        with self._lock:
+            self._sessions.discard(session)
+
+    def snapshot(self) -> List[Session]:
+        """Sessions open right now (async ones as their underlying sync Session)."""
+        with self._lock:
+            return list(self._sessions)
+
+
+# Global registry of open request sessions
+live_sessions = LiveSessions()
+
+
 def get_db() -> Session:
     """
     Dependency that provides a database session
@@ -49,12 +120,32 @@ def get_db() -> Session:
         SQLAlchemy database session
     """
     db = SessionLocal()
+    live_sessions.add(db)
     try:
         yield db
     finally:
+        live_sessions.discard(db)
         db.close()
 
 
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    Dependency that provides an async database session
+
+    Yields:
+        SQLAlchemy async database session
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database is disabled; set DATABASE_ASYNC=True")
+
+    async with AsyncSessionLocal() as db:
+        live_sessions.add(db.sync_session)
+        try:
+            yield db
+        finally:
+            live_sessions.discard(db.sync_session)
+
+
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
@@ -1,10 +1,13 @@
 """Domain service for event approval workflow."""
-from typing import List
+from typing import List, Optional, Tuple
 from datetime import datetime, timezone
 import logging
 from fastapi import HTTPException, status as http_status
 from sqlalchemy.orm import Session
+from ..core.pagination import paginate_query, split_page
+from ..core.response_cache import event_list_cache
 from ..models.event import Event, EventStatus
+from .list_totals import ListTotals
 
 logger = logging.getLogger(__name__)
 
@@ -13,16 +16,14 @@ class EventApprovalService:
     """Business logic for event approval actions."""
 
     @staticmethod
-    def get_pending_events(db: Session, limit: int = 20, offset: int = 0) -> List[Event]:
-        """Return pending events for admin review."""
-        return (
-            db.query(Event)
-            .filter(Event.status == EventStatus.PENDING)
-            .order_by(Event.start_at.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
-        )
+    def get_pending_events(
+        db: Session, limit: int = 20, offset: int = 0, cursor: Optional[str] = None
+    ) -> Tuple[List[Event], Optional[str]]:
+        """Return one page of pending events for admin review and the next cursor."""
+        sort = (Event.start_at, Event.id)
+        query = db.query(Event).filter(Event.status == EventStatus.PENDING)
+        rows = paginate_query(query, sort, limit, offset, cursor).all()
+        return split_page(rows, sort, limit)
 
     @staticmethod
     def approve_event(event_id: str, admin_id: str, db: Session) -> Event:
@@ -37,9 +38,11 @@ class EventApprovalService:
                 detail={"error": "InvalidStatus", "message": "Event is not pending"},
             )
 
+        ListTotals.apply(db, ListTotals.event_status_changed(event.organizer_id, event.status, EventStatus.PUBLISHED))
         event.status = EventStatus.PUBLISHED
         db.commit()
         db.refresh(event)
+        event_list_cache.invalidate()
 
         EventApprovalService._log_action(event.id, admin_id, "APPROVE")
         return event
@@ -57,9 +60,11 @@ class EventApprovalService:
                 detail={"error": "InvalidStatus", "message": "Event is not pending"},
             )
 
+        ListTotals.apply(db, ListTotals.event_status_changed(event.organizer_id, event.status, EventStatus.REJECTED))
         event.status = EventStatus.REJECTED
         db.commit()
         db.refresh(event)
+        event_list_cache.invalidate()
 
         EventApprovalService._log_action(event.id, admin_id, "REJECT")
         return event
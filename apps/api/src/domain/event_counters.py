@@ -0,0 +1,178 @@
+"""Domain service for recomputing denormalized event counters."""
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session
+from ..core.response_cache import event_list_cache
+from ..database import SessionLocal
+from ..models.event import Event
+from ..models.registration import Registration, RegistrationStatus
+from .list_totals import ListTotals, TotalDrift
+from .occupancy import OccupancyService
+
+logger = logging.getLogger(__name__)
+
+# (registered, checked in, cancelled)
+Counts = Tuple[int, int, int]
+
+
+@dataclass
+class CounterDrift:
+    """An event whose stored counters disagree with its registrations."""
+    event_id: str
+    stored: Counts
+    actual: Counts
+
+
+class EventCounters:
+    """Repair drift in ``registered_count``, ``checked_in_count`` and ``cancelled_count``.
+
+    The counters are maintained incrementally by ``SeatReservation``; this
+    recomputes them from ``registrations`` with one ``GROUP BY event_id,
+    status`` aggregate, joined to the stored values in the same statement
+    so both come from one snapshot. Fixes are written in chunks, and each
+    row is only updated if its stored values are still the ones that were
+    read, so a registration committed mid-run is never overwritten; such
+    events are picked up by the next run.
+    """
+
+    @staticmethod
+    def find_drift(db: Session) -> List[CounterDrift]:
+        """Compare every event's counters with its registrations."""
+        per_status = (
+            select(Registration.event_id, Registration.status, func.count().label("n"))
+            .group_by(Registration.event_id, Registration.status)
+            .subquery()
+        )
+        rows = db.execute(
+            select(
+                Event.id,
+                Event.registered_count,
+                Event.checked_in_count,
+                Event.cancelled_count,
+                per_status.c.status,
+                per_status.c.n,
+            ).outerjoin(per_status, per_status.c.event_id == Event.id)
+        ).all()
+
+        stored: Dict[str, Counts] = {}
+        by_status: Dict[str, Dict[RegistrationStatus, int]] = {}
+        for event_id, registered, checked_in, cancelled, reg_status, n in rows:
+            stored[event_id] = (registered, checked_in, cancelled)
+            if reg_status is not None:
+                by_status.setdefault(event_id, {})[RegistrationStatus(reg_status)] = n
+
+        drift = []
+        for event_id, stored_counts in stored.items():
+            counts = by_status.get(event_id, {})
+            checked_in = counts.get(RegistrationStatus.CHECKED_IN, 0)
+            actual = (
+                counts.get(RegistrationStatus.REGISTERED, 0) + checked_in,
+                checked_in,
+                counts.get(RegistrationStatus.CANCELLED, 0),
+            )
+            if actual != stored_counts:
+                drift.append(CounterDrift(event_id=event_id, stored=stored_counts, actual=actual))
+        return drift
+
+    @staticmethod
+    def _repair_stmt():
+        return (
+            update(Event)
+            .where(
+                Event.id == bindparam("b_event_id"),
+                Event.registered_count == bindparam("b_stored_registered"),
+                Event.checked_in_count == bindparam("b_stored_checked_in"),
+                Event.cancelled_count == bindparam("b_stored_cancelled"),
+            )
+            .values(
+                registered_count=bindparam("b_registered"),
+                checked_in_count=bindparam("b_checked_in"),
+                cancelled_count=bindparam("b_cancelled"),
+            )
+        )
+
+    @staticmethod
+    def reconcile(db: Session, dry_run: bool = False, chunk_size: int = 500) -> List[CounterDrift]:
+        """
+        Find drifted counters and (unless ``dry_run``) repair them.
+
+        Args:
+            db: Database session
+            dry_run: Only report drift, change nothing
+            chunk_size: Events updated per statement/commit
+
+        Returns:
+            Drift found, one entry per affected event
+        """
+        drift = EventCounters.find_drift(db)
+        db.rollback()  # end the read snapshot before writing
+        if dry_run or not drift:
+            return drift
+
+        stmt = EventCounters._repair_stmt()
+        for start in range(0, len(drift), chunk_size):
+            chunk = drift[start:start + chunk_size]
+            # Core executemany on the session's connection (not ORM bulk-by-PK)
+            db.connection().execute(stmt, [
+                {
+                    "b_event_id": d.event_id,
+                    "b_stored_registered": d.stored[0],
+                    "b_stored_checked_in": d.stored[1],
+                    "b_stored_cancelled": d.stored[2],
+                    "b_registered": d.actual[0],
+                    "b_checked_in": d.actual[1],
+                    "b_cancelled": d.actual[2],
+                }
+                for d in chunk
+            ])
+            db.commit()
+
+        event_list_cache.invalidate()
+        OccupancyService.publish(db, [d.event_id for d in drift])
+        return drift
+
+
+def run_reconciliation(dry_run: bool = False, chunk_size: int = 500) -> List[CounterDrift]:
+    """Reconcile on a fresh session and log what drifted."""
+    db = SessionLocal()
+    try:
+        drift = EventCounters.reconcile(db, dry_run=dry_run, chunk_size=chunk_size)
+    finally:
+        db.close()
+
+    for d in drift:
+        logger.warning(
+            f"Counter drift on event {d.event_id}: stored (registered, checked_in, cancelled)="
+            f"{d.stored}, actual={d.actual}{' (dry run)' if dry_run else ''}"
+        )
+    return drift
+
+
+def run_total_reconciliation(dry_run: bool = False) -> List[TotalDrift]:
+    """Reconcile list totals on a fresh session and log what drifted."""
+    db = SessionLocal()
+    try:
+        drift = ListTotals.reconcile(db, dry_run=dry_run)
+    finally:
+        db.close()
+
+    for d in drift:
+        logger.warning(
+            f"List total drift on {d.name}[{d.scope_id}]: stored={d.stored}, "
+            f"actual={d.actual}{' (dry run)' if dry_run else ''}"
+        )
+    return drift
+
+
+async def reconcile_periodically(interval_seconds: int) -> None:
+    """Run both reconciliations every ``interval_seconds`` until cancelled."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(run_reconciliation)
+            await asyncio.to_thread(run_total_reconciliation)
+        except Exception:
+            logger.exception("Counter reconciliation failed")
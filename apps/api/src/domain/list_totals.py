@@ -0,0 +1,251 @@
+"""Domain service for list totals backed by maintained counters."""
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..core.principal import Principal
+from ..models.event import Event, EventStatus
+from ..models.list_counter import ListCounter
+from ..models.registration import Registration
+from ..models.user import User, UserRole
+
+# (counter name, scope id) -> count or delta
+CounterKey = Tuple[str, str]
+Deltas = Dict[CounterKey, int]
+
+# Scope id of the global counters
+GLOBAL = ""
+USERS = "users"
+# Registrations on published events, per user (what /me/registrations lists)
+USER_REGISTRATIONS = "user_registrations"
+
+
+def _event_counter(event_status) -> str:
+    return f"events:{event_status.value if hasattr(event_status, 'value') else event_status}"
+
+
+@dataclass
+class TotalDrift:
+    """A list counter that disagrees with the rows it counts."""
+    name: str
+    scope_id: str
+    stored: int
+    actual: int
+
+
+class ListTotals:
+    """Totals for paginated list endpoints, read from ``list_counters``.
+
+    Events are counted per status, globally and per organizer, so every
+    role's visibility rule is answered from one primary-key lookup. Users
+    and each user's published registrations have their own counters;
+    per-event registration totals come from the counters already kept on
+    the event row by ``SeatReservation``.
+
+    Writers build the change with one of the delta helpers and ``apply``
+    it in the same transaction as the write, so a rollback undoes both.
+    The full COUNT queries only run in ``reconcile``.
+    """
+
+    # -- Deltas for the writes that change a total ------------------------
+
+    @staticmethod
+    def event_created(organizer_id: str, event_status) -> Deltas:
+        name = _event_counter(event_status)
+        return {(name, GLOBAL): 1, (name, organizer_id): 1}
+
+    @staticmethod
+    def event_status_changed(organizer_id: str, from_status, to_status) -> Deltas:
+        old, new = _event_counter(from_status), _event_counter(to_status)
+        return {(old, GLOBAL): -1, (old, organizer_id): -1, (new, GLOBAL): 1, (new, organizer_id): 1}
+
+    @staticmethod
+    def registration_added(user_id: str) -> Deltas:
+        return {(USER_REGISTRATIONS, user_id): 1}
+
+    @staticmethod
+    def user_added() -> Deltas:
+        return {(USERS, GLOBAL): 1}
+
+    # -- Applying deltas ---------------------------------------------------
+
+    @staticmethod
+    def apply_stmt(dialect_name: str, deltas: Deltas):
+        """Upsert adding each delta to its counter (missing counters start at 0)."""
+        insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+        stmt = insert(ListCounter).values([
+            {"name": name, "scope_id": scope_id, "count": delta}
+            for (name, scope_id), delta in deltas.items()
+        ])
+        return stmt.on_conflict_do_update(
+            index_elements=[ListCounter.name, ListCounter.scope_id],
+            set_={"count": ListCounter.count + stmt.excluded["count"]},
+        )
+
+    @staticmethod
+    def apply(db: Session, deltas: Deltas) -> None:
+        """Add ``deltas`` to their counters within the caller's transaction."""
+        deltas = {key: delta for key, delta in deltas.items() if delta}
+        if deltas:
+            db.execute(ListTotals.apply_stmt(db.get_bind().dialect.name, deltas))
+
+    @staticmethod
+    async def apply_async(db: AsyncSession, deltas: Deltas) -> None:
+        """Async variant of ``apply``."""
+        deltas = {key: delta for key, delta in deltas.items() if delta}
+        if deltas:
+            await db.execute(ListTotals.apply_stmt(db.get_bind().dialect.name, deltas))
+
+    @staticmethod
+    def event_deleted(db: Session, event: Event) -> None:
+        """Count an event out; call before deleting it (and its registrations)."""
+        ListTotals.apply(db, {
+            key: -1 for key in ListTotals.event_created(event.organizer_id, event.status)
+        })
+        if event.status == EventStatus.PUBLISHED:
+            registrants = select(Registration.user_id).where(Registration.event_id == event.id)
+            db.execute(
+                update(ListCounter)
+                .where(ListCounter.name == USER_REGISTRATIONS, ListCounter.scope_id.in_(registrants))
+                .values(count=ListCounter.count - 1)
+                .execution_options(synchronize_session=False)
+            )
+
+    # -- Reads -------------------------------------------------------------
+
+    @staticmethod
+    def _read(db: Session, names: Iterable[str], scope_ids: Iterable[str]) -> Dict[CounterKey, int]:
+        rows = db.query(ListCounter.name, ListCounter.scope_id, ListCounter.count).filter(
+            ListCounter.name.in_(list(names)),
+            ListCounter.scope_id.in_(list(scope_ids))
+        ).all()
+        return {(name, scope_id): count for name, scope_id, count in rows}
+
+    @staticmethod
+    def _event_counts(db: Session, *scope_ids: str) -> Dict[str, Dict[EventStatus, int]]:
+        counts = ListTotals._read(db, [_event_counter(s) for s in EventStatus], scope_ids)
+        return {
+            scope_id: {s: counts.get((_event_counter(s), scope_id), 0) for s in EventStatus}
+            for scope_id in scope_ids
+        }
+
+    @staticmethod
+    def visible_events(db: Session, current_user: Optional[Principal]) -> int:
+        """Total for ``GET /events`` under the caller's visibility rule."""
+        if not current_user or current_user.role == UserRole.MEMBER:
+            return ListTotals._event_counts(db, GLOBAL)[GLOBAL][EventStatus.PUBLISHED]
+        if current_user.role == UserRole.ORGANIZER:
+            counts = ListTotals._event_counts(db, GLOBAL, current_user.id)
+            own = counts[current_user.id]
+            own_unpublished = sum(own.values()) - own[EventStatus.PUBLISHED]
+            return counts[GLOBAL][EventStatus.PUBLISHED] + own_unpublished
+        return sum(ListTotals._event_counts(db, GLOBAL)[GLOBAL].values())
+
+    @staticmethod
+    def managed_events(db: Session, current_user: Principal) -> int:
+        """Total for ``GET /events/managed``."""
+        scope_id = GLOBAL if current_user.role == UserRole.ADMIN else current_user.id
+        return sum(ListTotals._event_counts(db, scope_id)[scope_id].values())
+
+    @staticmethod
+    def pending_events(db: Session) -> int:
+        """Total for ``GET /events/pending``."""
+        return ListTotals._event_counts(db, GLOBAL)[GLOBAL][EventStatus.PENDING]
+
+    @staticmethod
+    def user_registrations(db: Session, user_id: str) -> int:
+        """Total for ``GET /me/registrations`` (published events only)."""
+        return ListTotals._read(db, [USER_REGISTRATIONS], [user_id]).get((USER_REGISTRATIONS, user_id), 0)
+
+    @staticmethod
+    def event_registrations(event) -> int:
+        """Total for ``GET /events/{event_id}/attendees``, from the event's own counters."""
+        return event.registered_count + event.cancelled_count
+
+    @staticmethod
+    def users(db: Session) -> int:
+        """Total for ``GET /users``."""
+        return ListTotals._read(db, [USERS], [GLOBAL]).get((USERS, GLOBAL), 0)
+
+    # -- Reconciliation ----------------------------------------------------
+
+    @staticmethod
+    def actual_counts(db: Session) -> Dict[CounterKey, int]:
+        """Every counter recomputed with COUNT queries."""
+        actual: Dict[CounterKey, int] = {}
+        rows = db.query(Event.status, Event.organizer_id, func.count(Event.id)).group_by(
+            Event.status, Event.organizer_id
+        ).all()
+        for event_status, organizer_id, n in rows:
+            name = _event_counter(event_status)
+            actual[(name, organizer_id)] = n
+            actual[(name, GLOBAL)] = actual.get((name, GLOBAL), 0) + n
+
+        actual[(USERS, GLOBAL)] = db.query(func.count(User.id)).scalar()
+
+        rows = db.query(Registration.user_id, func.count(Registration.id)).join(
+            Event, Registration.event_id == Event.id
+        ).filter(
+            Event.status == EventStatus.PUBLISHED
+        ).group_by(Registration.user_id).all()
+        for user_id, n in rows:
+            actual[(USER_REGISTRATIONS, user_id)] = n
+        return actual
+
+    @staticmethod
+    def reconcile(db: Session, dry_run: bool = False) -> List[TotalDrift]:
+        """
+        Compare every counter with a COUNT and (unless ``dry_run``) fix it.
+
+        Stored values are read before the counts, and a fix only applies
+        while the stored value is unchanged. A write committed in between
+        moves its counter, so that counter is left for the next run rather
+        than overwritten with a count that may predate the write.
+
+        Returns:
+            Drift found, one entry per affected counter
+        """
+        stored = {
+            (name, scope_id): count
+            for name, scope_id, count in db.query(ListCounter.name, ListCounter.scope_id, ListCounter.count)
+        }
+        actual = ListTotals.actual_counts(db)
+        db.rollback()  # end the read snapshot before writing
+
+        drift = []
+        for name, scope_id in sorted(stored.keys() | actual.keys()):
+            stored_count = stored.get((name, scope_id), 0)
+            actual_count = actual.get((name, scope_id), 0)
+            if stored_count != actual_count:
+                drift.append(TotalDrift(name=name, scope_id=scope_id, stored=stored_count, actual=actual_count))
+        if dry_run or not drift:
+            return drift
+
+        fixes = [
+            {"b_name": d.name, "b_scope_id": d.scope_id, "b_stored": d.stored, "b_actual": d.actual}
+            for d in drift if (d.name, d.scope_id) in stored
+        ]
+        if fixes:
+            db.connection().execute(
+                update(ListCounter)
+                .where(
+                    ListCounter.name == bindparam("b_name"),
+                    ListCounter.scope_id == bindparam("b_scope_id"),
+                    ListCounter.count == bindparam("b_stored"),
+                )
+                .values(count=bindparam("b_actual")),
+                fixes,
+            )
+
+        missing = [
+            {"name": d.name, "scope_id": d.scope_id, "count": d.actual}
+            for d in drift if (d.name, d.scope_id) not in stored
+        ]
+        if missing:
+            insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+            db.connection().execute(insert(ListCounter).on_conflict_do_nothing(), missing)
+
+        db.commit()
+        return drift
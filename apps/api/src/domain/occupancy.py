@@ -0,0 +1,85 @@
+"""Domain service for live event occupancy."""
+import json
+from typing import Iterable, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..core.broadcast import checkin_broadcaster, occupancy_broadcaster
+from ..models.event import Event
+
+
+class OccupancyService:
+    """Registered / checked-in / remaining counts pushed to live clients.
+
+    Writers call ``publish`` after committing a registration, cancellation,
+    check-in or walk-in. The snapshot is read once per update (one primary
+    key lookup) and the same object is fanned out to every scanner station and
+    dashboard stream on the event; nothing is queried when nobody listens.
+    """
+
+    @staticmethod
+    def snapshot_stmt(event_id: str):
+        """Counts for one event, read from its maintained counters."""
+        return select(Event.registered_count, Event.capacity, Event.checked_in_count).where(Event.id == event_id)
+
+    @staticmethod
+    def _to_snapshot(event_id: str, row) -> Optional[dict]:
+        if row is None:
+            return None
+        registered, capacity, checked_in = row
+        return {
+            "event_id": event_id,
+            "registered": registered,
+            "checked_in": checked_in,
+            "capacity": capacity,
+            "remaining": max(0, capacity - registered),
+        }
+
+    @staticmethod
+    def snapshot(db: Session, event_id: str) -> Optional[dict]:
+        """Current counts, or None if the event does not exist."""
+        row = db.execute(OccupancyService.snapshot_stmt(event_id)).first()
+        return OccupancyService._to_snapshot(event_id, row)
+
+    @staticmethod
+    async def snapshot_async(db: AsyncSession, event_id: str) -> Optional[dict]:
+        """Async twin of ``snapshot``."""
+        row = (await db.execute(OccupancyService.snapshot_stmt(event_id))).first()
+        return OccupancyService._to_snapshot(event_id, row)
+
+    @staticmethod
+    def sse_frame(snapshot: dict) -> str:
+        """Encode a snapshot as a server-sent event."""
+        return f"event: occupancy\ndata: {json.dumps(snapshot, separators=(',', ':'))}\n\n"
+
+    @staticmethod
+    def station_message(snapshot: dict) -> dict:
+        """Snapshot as sent to scanner stations."""
+        return {"type": "occupancy", **snapshot}
+
+    @staticmethod
+    def _watched(event_ids: Iterable[str]):
+        return [
+            event_id for event_id in set(event_ids)
+            if checkin_broadcaster.has_subscribers(event_id) or occupancy_broadcaster.has_subscribers(event_id)
+        ]
+
+    @staticmethod
+    def _fan_out(snapshot: Optional[dict]) -> None:
+        if snapshot is None:
+            return
+        event_id = snapshot["event_id"]
+        checkin_broadcaster.publish(event_id, OccupancyService.station_message(snapshot))
+        occupancy_broadcaster.publish(event_id, OccupancyService.sse_frame(snapshot))
+
+    @staticmethod
+    def publish(db: Session, event_ids: Iterable[str]) -> None:
+        """Push fresh counts for these events to everyone watching them."""
+        for event_id in OccupancyService._watched(event_ids):
+            OccupancyService._fan_out(OccupancyService.snapshot(db, event_id))
+
+    @staticmethod
+    async def publish_async(db: AsyncSession, event_ids: Iterable[str]) -> None:
+        """Async twin of ``publish``."""
+        for event_id in OccupancyService._watched(event_ids):
+            OccupancyService._fan_out(await OccupancyService.snapshot_async(db, event_id))
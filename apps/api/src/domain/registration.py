@@ -4,11 +4,16 @@ from datetime import datetime, timezone
 from typing import Optional
 import uuid
 from fastapi import HTTPException, status as http_status
+from sqlalchemy import Update, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from ..core.security import get_password_hash
+from ..core.security import UNUSABLE_PASSWORD
+from ..core.tickets import issue_ticket_code
+from ..core.principal import Principal
 from ..models.event import Event, EventStatus
 from ..models.registration import Registration, RegistrationStatus
 from ..models.user import User, UserRole
+from .list_totals import ListTotals
 
 
 @dataclass
@@ -19,16 +24,167 @@ class WalkInResult:
     registration: Registration
 
 
+class SeatReservation:
+    """Atomic seat accounting on ``Event.registered_count`` and status counters.
+
+    Each helper is a single conditional UPDATE, so concurrent requests can
+    never push the count above capacity or below zero: the database decides
+    the winner and the caller checks the affected row count. Changes are
+    part of the caller's transaction and are undone by a rollback.
+    """
+
+    @staticmethod
+    def reserve_stmt(event_id: str) -> Update:
+        """Take one seat only while the event is below capacity."""
+        return (
+            update(Event)
+            .where(Event.id == event_id, Event.registered_count < Event.capacity)
+            .values(registered_count=Event.registered_count + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def release_stmt(event_id: str) -> Update:
+        """Give back one seat only while the count is above zero."""
+        return (
+            update(Event)
+            .where(Event.id == event_id, Event.registered_count > 0)
+            .values(registered_count=Event.registered_count - 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def transition_stmt(
+        registration_id: str,
+        from_status: RegistrationStatus,
+        to_status: RegistrationStatus,
+    ) -> Update:
+        """Move a registration between statuses only if it is still in ``from_status``."""
+        return (
+            update(Registration)
+            .where(Registration.id == registration_id, Registration.status == from_status)
+            .values(status=to_status)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def adjust_counts_stmt(event_id: str, checked_in: int = 0, cancelled: int = 0) -> Update:
+        """Shift the denormalized per-status counters on an event."""
+        return (
+            update(Event)
+            .where(Event.id == event_id)
+            .values(
+                checked_in_count=Event.checked_in_count + checked_in,
+                cancelled_count=Event.cancelled_count + cancelled,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def count_transition_stmt(
+        event_id: str,
+        from_status: Optional[RegistrationStatus],
+        to_status: RegistrationStatus,
+    ) -> Optional[Update]:
+        """Counter update for one registration moving ``from_status`` -> ``to_status``.
+
+        ``from_status`` is None for a newly created registration. Returns None
+        when neither counter changes.
+        """
+        def delta(counted: RegistrationStatus) -> int:
+            return int(to_status == counted) - int(from_status == counted)
+
+        checked_in = delta(RegistrationStatus.CHECKED_IN)
+        cancelled = delta(RegistrationStatus.CANCELLED)
+        if not checked_in and not cancelled:
+            return None
+        return SeatReservation.adjust_counts_stmt(event_id, checked_in, cancelled)
+
+    @staticmethod
+    def reserve(db: Session, event_id: str) -> bool:
+        """Take one seat if available. Returns False when the event is full."""
+        return db.execute(SeatReservation.reserve_stmt(event_id)).rowcount == 1
+
+    @staticmethod
+    def release(db: Session, event_id: str) -> bool:
+        """Give back one seat. Returns False if the count was already zero."""
+        return db.execute(SeatReservation.release_stmt(event_id)).rowcount == 1
+
+    @staticmethod
+    def transition(
+        db: Session,
+        registration_id: str,
+        from_status: RegistrationStatus,
+        to_status: RegistrationStatus,
+    ) -> bool:
+        """Flip a registration's status. Returns False if it was no longer ``from_status``."""
+        stmt = SeatReservation.transition_stmt(registration_id, from_status, to_status)
+        return db.execute(stmt).rowcount == 1
+
+    @staticmethod
+    def count_transition(
+        db: Session,
+        event_id: str,
+        from_status: Optional[RegistrationStatus],
+        to_status: RegistrationStatus,
+    ) -> None:
+        """Keep the event's counters in step with a status change (same transaction)."""
+        stmt = SeatReservation.count_transition_stmt(event_id, from_status, to_status)
+        if stmt is not None:
+            db.execute(stmt)
+
+    @staticmethod
+    async def reserve_async(db: AsyncSession, event_id: str) -> bool:
+        """Async variant of ``reserve``."""
+        return (await db.execute(SeatReservation.reserve_stmt(event_id))).rowcount == 1
+
+    @staticmethod
+    async def release_async(db: AsyncSession, event_id: str) -> bool:
+        """Async variant of ``release``."""
+        return (await db.execute(SeatReservation.release_stmt(event_id))).rowcount == 1
+
+    @staticmethod
+    async def transition_async(
+        db: AsyncSession,
+        registration_id: str,
+        from_status: RegistrationStatus,
+        to_status: RegistrationStatus,
+    ) -> bool:
+        """Async variant of ``transition``."""
+        stmt = SeatReservation.transition_stmt(registration_id, from_status, to_status)
+        return (await db.execute(stmt)).rowcount == 1
+
+    @staticmethod
+    async def count_transition_async(
+        db: AsyncSession,
+        event_id: str,
+        from_status: Optional[RegistrationStatus],
+        to_status: RegistrationStatus,
+    ) -> None:
+        """Async variant of ``count_transition``."""
+        stmt = SeatReservation.count_transition_stmt(event_id, from_status, to_status)
+        if stmt is not None:
+            await db.execute(stmt)
+
+
 class WalkInService:
     """Business logic for walk-in registrations."""
 
+    @staticmethod
+    def _totals_delta(user_id: str, is_new_user: bool):
+        """List counter changes for a walk-in that created a registration."""
+        deltas = ListTotals.registration_added(user_id)
+        if is_new_user:
+            deltas.update(ListTotals.user_added())
+        return deltas
+
     @staticmethod
     def create_walk_in_registration(
         db: Session,
         event_id: str,
         email: str,
         display_name: Optional[str],
-        current_user: User,
+        current_user: Principal,
     ) -> WalkInResult:
         """Create or re-activate a walk-in registration and check-in the attendee."""
         event = db.query(Event).filter(Event.id == event_id).first()
@@ -42,16 +198,18 @@ class WalkInService:
             raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
         user = db.query(User).filter(User.email == email).first()
+        is_new_user = False
         if not user:
             user = User(
                 id=str(uuid.uuid4()),
                 email=email,
                 display_name=display_name or email.split('@')[0],
-                hashed_password=get_password_hash(f"temp{uuid.uuid4().hex[:16]}"),
+                hashed_password=UNUSABLE_PASSWORD,
                 role=UserRole.MEMBER,
             )
             db.add(user)
             db.flush()
+            is_new_user = True
 
         registration = db.query(Registration).filter(
             Registration.event_id == event_id,
@@ -66,15 +224,28 @@ class WalkInService:
                     registration=registration,
                 )
 
-            if registration.status == RegistrationStatus.CANCELLED:
-                if event.is_full:
+            previous_status = registration.status
+            if not SeatReservation.transition(
+                db, registration.id, previous_status, RegistrationStatus.CHECKED_IN
+            ):
+                # Another request changed this registration first
+                db.rollback()
+                db.refresh(registration)
+                return WalkInResult(
+                    success=False,
+                    message="User already checked in",
+                    registration=registration,
+                )
+
+            SeatReservation.count_transition(db, event_id, previous_status, RegistrationStatus.CHECKED_IN)
+            if previous_status == RegistrationStatus.CANCELLED:
+                if not SeatReservation.reserve(db, event_id):
+                    db.rollback()
                     raise HTTPException(
                         status_code=http_status.HTTP_400_BAD_REQUEST,
                         detail="Event is at full capacity",
                     )
-                event.registered_count += 1
 
-            registration.status = RegistrationStatus.CHECKED_IN
             db.commit()
             db.refresh(registration)
 
@@ -84,23 +255,25 @@ class WalkInService:
                 registration=registration,
             )
 
-        if event.is_full:
+        if not SeatReservation.reserve(db, event_id):
+            db.rollback()
             raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST, detail="Event is at full capacity")
 
+        registration_id = str(uuid.uuid4())
         registration = Registration(
-            id=str(uuid.uuid4()),
+            id=registration_id,
             event_id=event_id,
             user_id=user.id,
             event_title=event.title,
             event_start_at=event.start_at,
             status=RegistrationStatus.CHECKED_IN,
-            qr_code=f"QR-{event_id}-{user.id}-WALKIN",
+            qr_code=issue_ticket_code(registration_id, event_id),
             created_at=datetime.now(timezone.utc),
         )
 
-        event.registered_count += 1
-
         db.add(registration)
+        SeatReservation.count_transition(db, event_id, None, RegistrationStatus.CHECKED_IN)
+        ListTotals.apply(db, WalkInService._totals_delta(user.id, is_new_user))
         db.commit()
         db.refresh(registration)
 
@@ -109,3 +282,110 @@ class WalkInService:
             message="Walk-in Registered & Checked In!",
             registration=registration,
         )
+
+    @staticmethod
+    async def create_walk_in_registration_async(
+        db: AsyncSession,
+        event_id: str,
+        email: str,
+        display_name: Optional[str],
+        current_user: Principal,
+    ) -> WalkInResult:
+        """Async variant of ``create_walk_in_registration``."""
+        event = (await db.execute(select(Event).where(Event.id == event_id))).scalars().first()
+        if not event:
+            raise HTTPException(status_code=http_status.HTTP_404_NOT_FOUND, detail="Event not found")
+
+        if event.status != EventStatus.PUBLISHED:
+            raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST, detail="Event is not published")
+
+        if current_user.role != UserRole.ADMIN and event.organizer_id != current_user.id:
+            raise HTTPException(status_code=http_status.HTTP_403_FORBIDDEN, detail="Forbidden")
+
+        user = (await db.execute(select(User).where(User.email == email))).scalars().first()
+        is_new_user = False
+        if not user:
+            user = User(
+                id=str(uuid.uuid4()),
+                email=email,
+                display_name=display_name or email.split('@')[0],
+                hashed_password=UNUSABLE_PASSWORD,
+                role=UserRole.MEMBER,
+            )
+            db.add(user)
+            await db.flush()
+            is_new_user = True
+
+        registration = (await db.execute(
+            select(Registration).where(
+                Registration.event_id == event_id,
+                Registration.user_id == user.id,
+            )
+        )).scalars().first()
+
+        if registration:
+            if registration.status == RegistrationStatus.CHECKED_IN:
+                return WalkInResult(
+                    success=False,
+                    message="User already checked in",
+                    registration=registration,
+                )
+
+            previous_status = registration.status
+            if not await SeatReservation.transition_async(
+                db, registration.id, previous_status, RegistrationStatus.CHECKED_IN
+            ):
+                # Another request changed this registration first
+                await db.rollback()
+                await db.refresh(registration)
+                return WalkInResult(
+                    success=False,
+                    message="User already checked in",
+                    registration=registration,
+                )
+
+            await SeatReservation.count_transition_async(db, event_id, previous_status, RegistrationStatus.CHECKED_IN)
+            if previous_status == RegistrationStatus.CANCELLED:
+                if not await SeatReservation.reserve_async(db, event_id):
+                    await db.rollback()
+                    raise HTTPException(
+                        status_code=http_status.HTTP_400_BAD_REQUEST,
+                        detail="Event is at full capacity",
+                    )
+
+            await db.commit()
+            await db.refresh(registration)
+
+            return WalkInResult(
+                success=True,
+                message="Existing registration checked in!",
+                registration=registration,
+            )
+
+        if not await SeatReservation.reserve_async(db, event_id):
+            await db.rollback()
+            raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST, detail="Event is at full capacity")
+
+        registration_id = str(uuid.uuid4())
+        registration = Registration(
+            id=registration_id,
+            event_id=event_id,
+            user_id=user.id,
+            event_title=event.title,
+            event_start_at=event.start_at,
+            status=RegistrationStatus.CHECKED_IN,
+            qr_code=issue_ticket_code(registration_id, event_id),
+            created_at=datetime.now(timezone.utc),
+        )
+
+        db.add(registration)
+        await SeatReservation.count_transition_async(db, event_id, None, RegistrationStatus.CHECKED_IN)
+        await ListTotals.apply_async(db, WalkInService._totals_delta(user.id, is_new_user))
+        await db.commit()
+        await db.refresh(registration)
+
+        return WalkInResult(
+            success=True,
+            message="Walk-in Registered & Checked In!",
+            registration=registration,
+        )
@@ -2,5 +2,6 @@
 from .user import User, UserRole
 from .event import Event
 from .registration import Registration, RegistrationStatus
+from .list_counter import ListCounter
 
-__all__ = ["User", "UserRole", "Event", "Registration", "RegistrationStatus"]
+__all__ = ["User", "UserRole", "Event", "Registration", "RegistrationStatus", "ListCounter"]
@@ -1,6 +1,7 @@
 """Event database model"""
 import enum
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, Index
+from datetime import datetime, timezone
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, Index, literal_column
 from sqlalchemy.orm import relationship
 from ..database import Base
 
@@ -26,10 +27,27 @@ class Event(Base):
     location = Column(String(200), nullable=False)
     capacity = Column(Integer, nullable=False)
     registered_count = Column(Integer, default=0, nullable=False)
+    # Maintained alongside status transitions; see SeatReservation.count_transition
+    checked_in_count = Column(Integer, default=0, nullable=False)
+    cancelled_count = Column(Integer, default=0, nullable=False)
     status = Column(String(20), default=EventStatus.PENDING, nullable=False)
+    # Bumped by every UPDATE (ORM or Core, counters included); drives ETags
+    version = Column(Integer, default=1, onupdate=literal_column("version") + 1, nullable=False)
+    updated_at = Column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
 
     __table_args__ = (
         Index("idx_events_status", "status"),
+        # Keyset pagination: ORDER BY start_at DESC, id DESC
+        Index("idx_events_start_at_id", "start_at", "id"),
+        Index("idx_events_status_start_at_id", "status", "start_at", "id"),
+        Index("idx_events_organizer_start_at_id", "organizer_id", "start_at", "id"),
+        # Listing ETags: MAX(updated_at)
+        Index("idx_events_updated_at", "updated_at"),
     )
 
     # Relationships
@@ -0,0 +1,21 @@
+"""List counter database model"""
+from sqlalchemy import Column, Integer, String
+from ..database import Base
+
+
+class ListCounter(Base):
+    """Row count behind a paginated list's ``total``
+
+    Maintained by ``ListTotals`` in the same transaction as the writes that
+    change it. ``scope_id`` is empty for global counters, otherwise the
+    organizer or user the count belongs to.
+    """
+
+    __tablename__ = "list_counters"
+
+    name = Column(String(40), primary_key=True)
+    scope_id = Column(String, primary_key=True, default="")
+    count = Column(Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<ListCounter(name={self.name}, scope_id={self.scope_id}, count={self.count})>"
@@ -24,6 +24,13 @@ class Registration(Base):
     status = Column(Enum(RegistrationStatus), default=RegistrationStatus.REGISTERED, nullable=False)
     qr_code = Column(String, unique=True, nullable=False, index=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    # Bumped on every change; drives check-in manifest delta sync
+    updated_at = Column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
 
     # Denormalized fields for quick access
     event_title = Column(String(200), nullable=False)
@@ -36,6 +43,11 @@ class Registration(Base):
     # Composite index for unique constraint
     __table_args__ = (
         Index('idx_event_user', 'event_id', 'user_id'),
+        # Keyset pagination: ORDER BY created_at DESC, id DESC
+        Index('idx_registrations_event_created_id', 'event_id', 'created_at', 'id'),
+        Index('idx_registrations_user_created_id', 'user_id', 'created_at', 'id'),
+        # Check-in manifest: rows of one event changed since a version
+        Index('idx_registrations_event_updated', 'event_id', 'updated_at'),
     )
 
     def __repr__(self):
@@ -1,6 +1,6 @@
 """User database model"""
 import enum
-from sqlalchemy import Column, String, Enum
+from sqlalchemy import Column, String, Enum, Index
 from sqlalchemy.orm import relationship
 from ..database import Base
 
@@ -23,6 +23,11 @@ class User(Base):
     display_name = Column(String, nullable=False)
     role = Column(Enum(UserRole), default=UserRole.MEMBER, nullable=False)
 
+    __table_args__ = (
+        # Keyset pagination: ORDER BY email, id
+        Index("idx_users_email_id", "email", "id"),
+    )
+
     # Relationships
     organized_events = relationship("Event", back_populates="organizer", foreign_keys="Event.organizer_id")
     registrations = relationship("Registration", back_populates="user", cascade="all, delete-orphan")
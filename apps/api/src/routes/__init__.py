@@ -4,11 +4,17 @@ from .events import router as events_router
 from .registrations import router as registrations_router
 from .checkin import router as checkin_router
 from .users import router as users_router
+from .profiling import router as profiling_router
+from .diagnostics import router as diagnostics_router
+from .async_routes import router as async_router
 
 __all__ = [
     "auth_router",
     "events_router",
     "registrations_router",
     "checkin_router",
-    "users_router"
+    "users_router",
+    "profiling_router",
+    "diagnostics_router",
+    "async_router"
 ]
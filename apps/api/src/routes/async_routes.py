@@ -0,0 +1,348 @@
+"""Async variants of the hot endpoints
+
+Used instead of the sync handlers when ``DATABASE_ASYNC`` is enabled (see
+``main.py``). Paths, response models and behaviour match the sync routes;
+only the database access runs on the async engine, so requests no longer
+hold a threadpool worker for the whole round-trip.
+"""
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from typing import Optional
+from datetime import datetime, timezone
+import uuid
+from ..database import get_async_db
+from ..models.event import Event, EventStatus
+from ..models.registration import Registration, RegistrationStatus
+from ..schemas.event import EventResponse, EventListResponse
+from ..schemas.registration import RegistrationResponse
+from ..schemas.checkin import CheckInRequest, CheckInResult, WalkInRequest
+from ..domain.checkin import CheckInService
+from ..domain.list_totals import ListTotals
+from ..domain.occupancy import OccupancyService
+from ..domain.registration import SeatReservation, WalkInService
+from ..core.principal import Principal
+from ..core.response_cache import event_list_cache
+from ..core.tickets import issue_ticket_code, precheck_ticket_code
+from ..core.deps import (
+    get_current_user_async,
+    get_current_user_optional_async,
+    require_organizer_or_admin_async
+)
+from ..core.pagination import paginate_query, split_page
+from ..core.conditional import not_modified
+from .events import (
+    EVENT_SORT,
+    LISTING_CACHE_CONTROL,
+    apply_event_visibility,
+    cacheable_listing,
+    cached_listing_response,
+    event_etag,
+    is_public_listing,
+    listing_etag,
+    listing_version_stmt,
+)
+
+router = APIRouter()
+
+
+@router.get("/events", response_model=EventListResponse)
+async def get_events_async(
+    request: Request,
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    include_total: bool = Query(True, description="Include the total count (served from a maintained counter)"),
+    current_user: Optional[Principal] = Depends(get_current_user_optional_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get list of all events with pagination
+
+    Public endpoint - authentication optional.
+    Pass ``cursor`` (from ``next_cursor``) for keyset pagination.
+    The public (anonymous / member) listing is served from ``event_list_cache``.
+    Responses carry an ETag; a matching ``If-None-Match`` gets a 304.
+    """
+    if is_public_listing(current_user):
+        async def render():
+            return cacheable_listing(await _event_page_async(db, None, limit, offset, cursor, include_total))
+
+        body, etag = await event_list_cache.get_or_compute_async((limit, offset, cursor, include_total), render)
+        return not_modified(request, etag, LISTING_CACHE_CONTROL) or cached_listing_response(body, etag)
+
+    etag = listing_etag(current_user, *(await db.execute(listing_version_stmt(current_user))).one())
+    unchanged = not_modified(request, etag, LISTING_CACHE_CONTROL)
+    if unchanged:
+        return unchanged
+
+    response.headers["Cache-Control"] = LISTING_CACHE_CONTROL
+    response.headers["ETag"] = etag
+    return await _event_page_async(db, current_user, limit, offset, cursor, include_total)
+
+
+async def _event_page_async(
+    db: AsyncSession,
+    current_user: Optional[Principal],
+    limit: int,
+    offset: int,
+    cursor: Optional[str],
+    include_total: bool
+) -> EventListResponse:
+    query = apply_event_visibility(select(Event), current_user)
+    total = (
+        await db.run_sync(lambda session: ListTotals.visible_events(session, current_user))
+        if include_total
+        else None
+    )
+    rows = (await db.execute(
+        paginate_query(query, EVENT_SORT, limit, offset, cursor)
+    )).scalars().all()
+    events, next_cursor = split_page(rows, EVENT_SORT, limit)
+
+    return EventListResponse(
+        items=[EventResponse.model_validate(e) for e in events],
+        total=total,
+        limit=limit,
+        offset=offset,
+        next_cursor=next_cursor
+    )
+
+
+@router.get("/events/{event_id}", response_model=EventResponse)
+async def get_event_async(
+    event_id: str,
+    request: Request,
+    response: Response,
+    current_user: Optional[Principal] = Depends(get_current_user_optional_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get event details by ID
+
+    Public endpoint - authentication optional.
+    Responses carry an ETag; a matching ``If-None-Match`` gets a 304
+    after reading only the event's version.
+    """
+    if request.headers.get("if-none-match"):
+        version = await db.scalar(select(Event.version).where(Event.id == event_id))
+        unchanged = not_modified(request, event_etag(version)) if version is not None else None
+        if unchanged:
+            return unchanged
+
+    event = await db.get(Event, event_id)
+
+    if not event:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found"
+        )
+
+    response.headers["ETag"] = event_etag(event.version)
+    return EventResponse.model_validate(event)
+
+
+@router.post("/events/{event_id}/registrations", response_model=RegistrationResponse, status_code=status.HTTP_201_CREATED)
+async def register_for_event_async(
+    event_id: str,
+    current_user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Register current user for an event
+    """
+    event = await db.get(Event, event_id)
+    if not event:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found"
+        )
+
+    if event.status != EventStatus.PUBLISHED:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Event is not published"
+        )
+
+    existing_reg = (await db.execute(
+        select(Registration).where(
+            Registration.event_id == event_id,
+            Registration.user_id == current_user.id
+        )
+    )).scalars().first()
+
+    if existing_reg:
+        if existing_reg.status != RegistrationStatus.CANCELLED or not await SeatReservation.transition_async(
+            db, existing_reg.id, RegistrationStatus.CANCELLED, RegistrationStatus.REGISTERED
+        ):
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Already registered for this event"
+            )
+        if not await SeatReservation.reserve_async(db, event_id):
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Event is at full capacity"
+            )
+        await SeatReservation.count_transition_async(
+            db, event_id, RegistrationStatus.CANCELLED, RegistrationStatus.REGISTERED
+        )
+        existing_reg.created_at = datetime.now(timezone.utc)
+        try:
+            await db.commit()
+            await db.refresh(existing_reg)
+        except SQLAlchemyError:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Database error occurred while reactivating registration"
+            )
+        event_list_cache.invalidate()
+        await OccupancyService.publish_async(db, [event_id])
+        return RegistrationResponse.model_validate(existing_reg)
+
+    if not await SeatReservation.reserve_async(db, event_id):
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Event is at full capacity"
+        )
+
+    registration_id = str(uuid.uuid4())
+    registration = Registration(
+        id=registration_id,
+        event_id=event_id,
+        user_id=current_user.id,
+        event_title=event.title,
+        event_start_at=event.start_at,
+        status=RegistrationStatus.REGISTERED,
+        qr_code=issue_ticket_code(registration_id, event_id),
+        created_at=datetime.now(timezone.utc)
+    )
+
+    try:
+        db.add(registration)
+        await ListTotals.apply_async(db, ListTotals.registration_added(current_user.id))
+        await db.commit()
+        await db.refresh(registration)
+        event_list_cache.invalidate()
+        await OccupancyService.publish_async(db, [event_id])
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Registration with this ID already exists"
+        )
+    except SQLAlchemyError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database error occurred while creating registration"
+        )
+
+    return RegistrationResponse.model_validate(registration)
+
+
+@router.post("/verify", response_model=CheckInResult)
+async def verify_ticket_async(
+    request: CheckInRequest,
+    current_user: Principal = Depends(require_organizer_or_admin_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Verify ticket and check-in
+
+    Must be organizer or admin
+    """
+    # Reject forged, garbage or other-event codes without a database lookup
+    precheck_message = precheck_ticket_code(request.qr_code, request.event_id)
+    if precheck_message:
+        return CheckInResult(success=False, message=precheck_message)
+
+    registration = (await db.execute(
+        select(Registration).where(Registration.qr_code == request.qr_code)
+    )).scalars().first()
+
+    event = await db.get(Event, registration.event_id) if registration else None
+
+    rejection = CheckInService.check(registration, event, current_user)
+    if rejection:
+        return CheckInResult(
+            success=False,
+            message=rejection.message,
+            registration=(
+                RegistrationResponse.model_validate(registration)
+                if rejection.include_registration
+                else None
+            )
+        )
+
+    if not await SeatReservation.transition_async(
+        db, registration.id, RegistrationStatus.REGISTERED, RegistrationStatus.CHECKED_IN
+    ):
+        # A concurrent scan won the race
+        await db.rollback()
+        await db.refresh(registration)
+        return CheckInResult(
+            success=False,
+            message="Ticket already used / Checked in",
+            registration=RegistrationResponse.model_validate(registration)
+        )
+    await SeatReservation.count_transition_async(
+        db, registration.event_id, RegistrationStatus.REGISTERED, RegistrationStatus.CHECKED_IN
+    )
+
+    try:
+        await db.commit()
+        await db.refresh(registration)
+    except SQLAlchemyError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database error occurred while checking in"
+        )
+
+    await OccupancyService.publish_async(db, [registration.event_id])
+    return CheckInResult(
+        success=True,
+        message="Check-in Successful!",
+        registration=RegistrationResponse.model_validate(registration)
+    )
+
+
+@router.post("/walk-in", response_model=CheckInResult)
+async def walk_in_register_async(
+    request: WalkInRequest,
+    current_user: Principal = Depends(require_organizer_or_admin_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Walk-in registration with immediate check-in
+
+    Must be organizer or admin
+    """
+    try:
+        result = await WalkInService.create_walk_in_registration_async(
+            db=db,
+            event_id=request.event_id,
+            email=request.email,
+            display_name=request.display_name,
+            current_user=current_user,
+        )
+    except HTTPException as exc:
+        if exc.status_code in {status.HTTP_400_BAD_REQUEST, status.HTTP_403_FORBIDDEN, status.HTTP_404_NOT_FOUND}:
+            return CheckInResult(success=False, message=str(exc.detail))
+        raise
+
+    if result.success:
+        event_list_cache.invalidate()
+        await OccupancyService.publish_async(db, [request.event_id])
+    return CheckInResult(
+        success=result.success,
+        message=result.message,
+        registration=RegistrationResponse.model_validate(result.registration)
+    )
@@ -1,30 +1,38 @@
 """Authentication routes"""
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
 import logging
 from ..database import get_db
 from ..models.user import User
 from ..schemas.auth import LoginRequest, LoginResponse
 from ..schemas.user import UserResponse
-from ..core.security import verify_password, create_access_token
+from ..core.security import create_access_token
+from ..core.password_hashing import password_hasher
 from ..core.deps import get_current_user
+from ..core.principal import Principal
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 logger = logging.getLogger(__name__)
 
 
 @router.post("/login", response_model=LoginResponse)
-def login(
+async def login(
     credentials: LoginRequest,
     db: Session = Depends(get_db)
 ):
     """
     Login with email and password
 
-    Returns JWT access token and user information
+    Returns JWT access token and user information.
+    bcrypt runs on the dedicated password-hashing executor so a burst of
+    logins cannot starve the shared request threadpool.
     """
     # Find user by email
-    user = db.query(User).filter(User.email == credentials.email).first()
+    user = await run_in_threadpool(
+        lambda: db.query(User).filter(User.email == credentials.email).first()
+    )
 
     if not user:
         logger.warning(f"Login attempt with non-existent email: {credentials.email}")
@@ -33,28 +41,42 @@ def login(
             detail="Invalid email or password"
         )
 
-    # Verify password
-    if not verify_password(credentials.password, user.hashed_password):
+    # Verify password (and rehash if the cost factor changed)
+    is_valid, new_hash = await password_hasher.verify_and_update(
+        credentials.password, user.hashed_password
+    )
+    if not is_valid:
         logger.warning(f"Failed login attempt for user: {user.email}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
 
+    user_response = UserResponse.model_validate(user)
+
+    if new_hash:
+        user.hashed_password = new_hash
+        try:
+            await run_in_threadpool(db.commit)
+            logger.info(f"Rehashed password for user: {user.email}")
+        except SQLAlchemyError as e:
+            await run_in_threadpool(db.rollback)
+            logger.error(f"Database error rehashing password for {user.email}: {str(e)}")
+
     # Create access token
-    access_token = create_access_token(data={"sub": user.id})
+    access_token = create_access_token(data={"sub": user_response.id})
 
-    logger.info(f"Successful login: {user.email} (role: {user.role})")
+    logger.info(f"Successful login: {user_response.email} (role: {user_response.role})")
 
     return LoginResponse(
-        user=UserResponse.model_validate(user),
+        user=user_response,
         access_token=access_token
     )
 
 
 @router.get("/me", response_model=UserResponse)
 def get_current_user_info(
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get current authenticated user information
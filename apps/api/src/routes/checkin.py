@@ -1,23 +1,51 @@
 """Check-in and verification routes"""
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import json
+import logging
+import time
+from collections import Counter
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from starlette.websockets import WebSocketState
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from ..database import get_db
-from ..models.user import User, UserRole
-from ..models.event import Event, EventStatus
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+from ..database import SessionLocal, get_db, live_sessions
+from ..models.event import Event
 from ..models.registration import Registration, RegistrationStatus
-from ..schemas.checkin import CheckInRequest, CheckInResult, WalkInRequest
+from ..models.user import UserRole
+from ..schemas.checkin import (
+    CheckInRequest,
+    CheckInResult,
+    WalkInRequest,
+    BatchCheckInRequest,
+    BatchCheckInItem,
+    BatchCheckInResponse,
+    ManifestEntry,
+    CheckInManifestResponse,
+)
 from ..schemas.registration import RegistrationResponse
-from ..domain.registration import WalkInService
-from ..core.deps import require_organizer_or_admin
+from ..domain.checkin import CheckInService, CheckInManifest
+from ..domain.occupancy import OccupancyService
+from ..domain.registration import SeatReservation, WalkInService
+from ..core.broadcast import checkin_broadcaster
+from ..core.conditional import not_modified
+from ..core.deps import get_principal_for_token, require_organizer_or_admin
+from ..core.security import decode_access_token
+from ..core.principal import Principal
+from ..core.response_cache import event_list_cache
+from ..core.tickets import precheck_ticket_code
 
 router = APIRouter(tags=["Check-in"])
+logger = logging.getLogger(__name__)
 
 
 @router.post("/verify", response_model=CheckInResult)
 def verify_ticket(
     request: CheckInRequest,
-    current_user: User = Depends(require_organizer_or_admin),
+    current_user: Principal = Depends(require_organizer_or_admin),
     db: Session = Depends(get_db)
 ):
     """
@@ -25,56 +53,57 @@ def verify_ticket(
 
     Must be organizer or admin
     """
+    return _verify_ticket(db, request.qr_code, request.event_id, current_user)
+
+
+def _verify_ticket(
+    db: Session,
+    qr_code: str,
+    event_id: Optional[str],
+    current_user: Principal
+) -> CheckInResult:
+    """Check in one scanned code (shared by /verify and the scanner socket)"""
+    # Reject forged, garbage or other-event codes without a database lookup
+    precheck_message = precheck_ticket_code(qr_code, event_id)
+    if precheck_message:
+        return CheckInResult(success=False, message=precheck_message)
+
     # Find registration by QR code
     registration = db.query(Registration).filter(
-        Registration.qr_code == request.qr_code
+        Registration.qr_code == qr_code
     ).first()
 
-    if not registration:
-        return CheckInResult(
-            success=False,
-            message="Invalid Ticket / QR Code not found"
-        )
-
-    # Get event
-    event = db.query(Event).filter(Event.id == registration.event_id).first()
-    if not event:
-        return CheckInResult(
-            success=False,
-            message="Event data missing"
-        )
+    event = None
+    if registration:
+        event = db.query(Event).filter(Event.id == registration.event_id).first()
 
-    # Check permissions (organizer can only verify their own events)
-    if current_user.role != UserRole.ADMIN and event.organizer_id != current_user.id:
+    rejection = CheckInService.check(registration, event, current_user)
+    if rejection:
         return CheckInResult(
             success=False,
-            message="權限不足：這張票券屬於其他主辦方的活動，您無法驗票。"
+            message=rejection.message,
+            registration=(
+                RegistrationResponse.model_validate(registration)
+                if rejection.include_registration
+                else None
+            )
         )
 
-    if event.status != EventStatus.PUBLISHED:
-        return CheckInResult(
-            success=False,
-            message="活動尚未發布，無法驗票。"
-        )
-
-    # Check if already checked in
-    if registration.status == RegistrationStatus.CHECKED_IN:
+    # Check in
+    if not SeatReservation.transition(
+        db, registration.id, RegistrationStatus.REGISTERED, RegistrationStatus.CHECKED_IN
+    ):
+        # A concurrent scan won the race
+        db.rollback()
+        db.refresh(registration)
         return CheckInResult(
             success=False,
             message="Ticket already used / Checked in",
             registration=RegistrationResponse.model_validate(registration)
         )
-
-    # Check if cancelled
-    if registration.status == RegistrationStatus.CANCELLED:
-        return CheckInResult(
-            success=False,
-            message="Ticket was cancelled",
-            registration=RegistrationResponse.model_validate(registration)
-        )
-
-    # Check in
-    registration.status = RegistrationStatus.CHECKED_IN
+    SeatReservation.count_transition(
+        db, registration.event_id, RegistrationStatus.REGISTERED, RegistrationStatus.CHECKED_IN
+    )
 
     try:
         db.commit()
@@ -86,6 +115,7 @@ def verify_ticket(
             detail="Database error occurred while checking in"
         )
 
+    OccupancyService.publish(db, [registration.event_id])
     return CheckInResult(
         success=True,
         message="Check-in Successful!",
@@ -93,10 +123,183 @@ def verify_ticket(
     )
 
 
+@router.post("/verify/batch", response_model=BatchCheckInResponse)
+def verify_ticket_batch(
+    request: BatchCheckInRequest,
+    current_user: Principal = Depends(require_organizer_or_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Replay queued scans from an offline scanner in one round-trip
+
+    Scans are resolved with set-based queries and all check-ins are applied
+    in a single transaction. Each scan gets the same result /verify would
+    give; when a code was scanned more than once, the earliest scan (by
+    client timestamp) wins and later ones report it as already used.
+
+    Must be organizer or admin
+    """
+    # Signature/format checks first; only plausible codes reach the database
+    prechecked = {
+        scan.qr_code: precheck_ticket_code(scan.qr_code, request.event_id)
+        for scan in request.scans
+    }
+    codes = {code for code, message in prechecked.items() if message is None}
+    registrations = {
+        r.qr_code: r
+        for r in db.query(Registration).filter(Registration.qr_code.in_(codes)).all()
+    } if codes else {}
+    # Serialised before the commit below expires the rows, so building the
+    # results never reloads them one by one
+    responses = {code: RegistrationResponse.model_validate(r) for code, r in registrations.items()}
+    event_of = {r.id: r.event_id for r in registrations.values()}
+    event_ids = set(event_of.values())
+    events = {
+        e.id: e
+        for e in db.query(Event).filter(Event.id.in_(event_ids)).all()
+    } if event_ids else {}
+
+    # Decide in client-timestamp order; scans without one go last
+    far_future = datetime.max.replace(tzinfo=timezone.utc)
+    order = sorted(
+        range(len(request.scans)),
+        key=lambda i: (_as_utc(request.scans[i].scanned_at) or far_future, i)
+    )
+
+    decisions = {}
+    claimed = set()
+    for i in order:
+        scan = request.scans[i]
+        if prechecked[scan.qr_code]:
+            decisions[i] = (False, prechecked[scan.qr_code], False)
+            continue
+
+        registration = registrations.get(scan.qr_code)
+        event = events.get(registration.event_id) if registration else None
+        rejection = CheckInService.check(registration, event, current_user)
+
+        if rejection is None and registration.id in claimed:
+            decisions[i] = (False, "Ticket already used / Checked in", True)
+        elif rejection is not None:
+            decisions[i] = (False, rejection.message, rejection.include_registration)
+        else:
+            claimed.add(registration.id)
+            decisions[i] = (True, "Check-in Successful!", True)
+
+    # One conditional UPDATE; RETURNING tells us which rows this request won
+    won = set()
+    if claimed:
+        try:
+            won = set(db.execute(
+                update(Registration)
+                .where(
+                    Registration.id.in_(claimed),
+                    Registration.status == RegistrationStatus.REGISTERED
+                )
+                .values(status=RegistrationStatus.CHECKED_IN)
+                .returning(Registration.id)
+                .execution_options(synchronize_session=False)
+            ).scalars().all())
+            for event_id, checked_in in Counter(event_of[r] for r in won).items():
+                db.execute(SeatReservation.adjust_counts_stmt(event_id, checked_in=checked_in))
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Database error occurred while checking in"
+            )
+        OccupancyService.publish(db, [event_of[r] for r in won])
+
+    results = []
+    for i, scan in enumerate(request.scans):
+        success, message, include_registration = decisions[i]
+        registration_response = responses.get(scan.qr_code)
+
+        if registration_response is None or not include_registration:
+            registration_response = None
+        else:
+            registration_id = registration_response.id
+            if registration_id in claimed:
+                if success and registration_id not in won:
+                    # A concurrent scan checked this ticket in first
+                    success, message = False, "Ticket already used / Checked in"
+                # Claimed rows are checked in now, by this request (RETURNING) or a concurrent one
+                registration_response = registration_response.model_copy(
+                    update={"status": RegistrationStatus.CHECKED_IN}
+                )
+
+        results.append(BatchCheckInItem(
+            qr_code=scan.qr_code,
+            scanned_at=scan.scanned_at,
+            success=success,
+            message=message,
+            registration=registration_response,
+        ))
+
+    return BatchCheckInResponse(results=results, checked_in=len(won))
+
+
+@router.get("/events/{event_id}/checkin-manifest", response_model=CheckInManifestResponse)
+def get_checkin_manifest(
+    event_id: str,
+    request: Request,
+    response: Response,
+    since: Optional[int] = Query(None, ge=0, description="Version from a previous manifest; returns only changes after it"),
+    current_user: Principal = Depends(require_organizer_or_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Download an event's check-in manifest for offline validation
+
+    Entries carry the SHA-256 hash of each ticket code (first 16 bytes,
+    URL-safe base64) and its current status. Poll with ``since`` and
+    ``If-None-Match`` to receive only changes, or 304 when nothing changed.
+
+    Must be the event's organizer or an admin
+    """
+    event = db.query(Event.id, Event.organizer_id).filter(Event.id == event_id).first()
+    if not event:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found"
+        )
+
+    if not CheckInService.can_scan(event, current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to download this event's check-in manifest"
+        )
+
+    state = CheckInManifest.state(db, event_id)
+    unchanged = not_modified(request, state.etag, "private, no-cache")
+    if unchanged:
+        return unchanged
+
+    response.headers["ETag"] = state.etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    return CheckInManifestResponse(
+        event_id=event_id,
+        version=state.version,
+        full=not since,
+        entries=[
+            ManifestEntry(ticket_hash=ticket_hash, status=reg_status)
+            for ticket_hash, reg_status in CheckInManifest.entries(db, event_id, since)
+        ]
+    )
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Normalise client timestamps so naive and aware values compare"""
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
 @router.post("/walk-in", response_model=CheckInResult)
 def walk_in_register(
     request: WalkInRequest,
-    current_user: User = Depends(require_organizer_or_admin),
+    current_user: Principal = Depends(require_organizer_or_admin),
     db: Session = Depends(get_db)
 ):
     """
@@ -117,8 +320,145 @@ def walk_in_register(
             return CheckInResult(success=False, message=str(exc.detail))
         raise
 
+    if result.success:
+        event_list_cache.invalidate()
+        OccupancyService.publish(db, [request.event_id])
     return CheckInResult(
         success=result.success,
         message=result.message,
         registration=RegistrationResponse.model_validate(result.registration)
     )
+
+
+def _open_station(db: Session, token: str, event_id: str) -> Tuple[Principal, dict]:
+    """Authenticate a scanner socket and check it may scan this event"""
+    current_user = get_principal_for_token(token, db)
+    if current_user.role not in (UserRole.ORGANIZER, UserRole.ADMIN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
+
+    event = db.query(Event.id, Event.organizer_id).filter(Event.id == event_id).first()
+    if not event:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
+    if not CheckInService.can_scan(event, current_user):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to scan this event")
+
+    snapshot = OccupancyService.snapshot(db, event_id)
+    db.rollback()  # release the connection while the station is idle
+    return current_user, snapshot
+
+
+# How long a new scanner socket may take to send its auth message
+STATION_AUTH_TIMEOUT_SECONDS = 10
+
+
+async def _station_token(websocket: WebSocket) -> Optional[str]:
+    """Access token from the socket's first message, ``{"type": "auth", "token": ...}``."""
+    try:
+        message = json.loads(await asyncio.wait_for(websocket.receive_text(), STATION_AUTH_TIMEOUT_SECONDS))
+    except (asyncio.TimeoutError, ValueError):
+        return None
+    if not isinstance(message, dict) or message.get("type") != "auth":
+        return None
+    token = message.get("token")
+    return token if isinstance(token, str) and token else None
+
+
+@router.websocket("/ws/events/{event_id}/checkin")
+async def checkin_socket(websocket: WebSocket, event_id: str):
+    """
+    Scanner station channel bound to one event
+
+    The first message must be ``{"type": "auth", "token": ...}`` with an
+    access token, sent within STATION_AUTH_TIMEOUT_SECONDS (the token is
+    kept out of the URL so access logs never record it). After that, each
+    ``{"qr_code": ..., "ref": ...}`` message is verified with the same
+    rules as /verify and answered with
+    ``{"type": "result", "ref": ..., ...CheckInResult}``. Every station on
+    the event also receives ``{"type": "occupancy", "checked_in": n, ...}``
+    whenever registrations or check-ins change through any entry point.
+    The socket is closed when the token expires, even while idle, and
+    when occupancy updates can no longer be delivered.
+
+    Must be the event's organizer or an admin
+    """
+    db = SessionLocal()
+    live_sessions.add(db)
+    subscription = None
+    try:
+        await websocket.accept()
+        token = await _station_token(websocket)
+        if token is None:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Authentication required")
+            return
+        try:
+            current_user, snapshot = await run_in_threadpool(_open_station, db, token, event_id)
+        except HTTPException as exc:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(exc.detail))
+            return
+
+        expires_at = (decode_access_token(token) or {}).get("exp")
+
+        send_lock = asyncio.Lock()
+
+        async def send(message: dict) -> None:
+            async with send_lock:
+                await websocket.send_json(message)
+
+        async def forward_updates() -> None:
+            while True:
+                await send(await subscription.get())
+
+        async def serve_scans() -> None:
+            while True:
+                try:
+                    message = json.loads(await websocket.receive_text())
+                except ValueError:
+                    message = None
+
+                qr_code = message.get("qr_code") if isinstance(message, dict) else None
+                ref = message.get("ref") if isinstance(message, dict) else None
+                if not isinstance(qr_code, str) or not qr_code:
+                    await send({"type": "error", "ref": ref, "message": "qr_code is required"})
+                    continue
+
+                try:
+                    result = await run_in_threadpool(_verify_ticket, db, qr_code, event_id, current_user)
+                except HTTPException as exc:
+                    await send({"type": "error", "ref": ref, "message": str(exc.detail)})
+                    continue
+                await send({"type": "result", "ref": ref, **result.model_dump(mode="json")})
+
+        subscription = checkin_broadcaster.subscribe(event_id)
+        await send({**OccupancyService.station_message(snapshot), "type": "ready"})
+
+        # Whichever ends first ends the station: the client leaving, the
+        # update forwarder failing, or the token running out
+        scans = asyncio.create_task(serve_scans())
+        forwarder = asyncio.create_task(forward_updates())
+        tasks = {scans, forwarder}
+        expiry = None
+        if expires_at is not None:
+            expiry = asyncio.create_task(asyncio.sleep(max(0.0, expires_at - time.time())))
+            tasks.add(expiry)
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if scans in done:
+            scans.result()  # re-raise anything but a disconnect
+        elif expiry in done:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Token expired")
+        else:
+            logger.error("Occupancy forwarder for event %s failed", event_id, exc_info=forwarder.exception())
+            if websocket.client_state == WebSocketState.CONNECTED:
+                await websocket.close(code=status.WS_1011_INTERNAL_ERROR, reason="Occupancy updates unavailable")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if subscription is not None:
+            checkin_broadcaster.unsubscribe(subscription)
+        live_sessions.discard(db)
+        await run_in_threadpool(db.close)
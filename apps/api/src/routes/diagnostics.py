@@ -0,0 +1,127 @@
+"""Memory diagnostics routes (Admin only)"""
+from typing import Dict, List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from ..database import live_sessions
+from ..core.broadcast import checkin_broadcaster, occupancy_broadcaster
+from ..core.deps import require_admin
+from ..core.jwks import jwks_cache
+from ..core.memory import memory_diagnostics, process_memory
+from ..core.principal import Principal, principal_cache
+from ..core.profiler import profile_store
+from ..core.response_cache import event_list_cache
+from ..core.token_cache import token_cache
+from ..schemas.diagnostics import AllocationStat, MemoryStatusResponse, SnapshotSummary
+from .events import approval_rate_limiter
+
+router = APIRouter(prefix="/admin/diagnostics/memory", tags=["Admin"])
+
+
+def _structure_sizes() -> Dict[str, Dict[str, int]]:
+    """Sizes of the in-process caches, limiter tables and open request sessions."""
+    sessions = live_sessions.snapshot()
+    return {
+        "token_cache": token_cache.stats(),
+        "principal_cache": principal_cache.stats(),
+        "event_list_cache": event_list_cache.stats(),
+        "jwks_cache": jwks_cache.stats(),
+        "approval_rate_limiter": approval_rate_limiter.stats(),
+        "checkin_broadcaster": checkin_broadcaster.stats(),
+        "occupancy_broadcaster": occupancy_broadcaster.stats(),
+        "profile_store": profile_store.stats(),
+        "sqlalchemy_sessions": {
+            "live": len(sessions),
+            "identity_map_objects": sum(len(s.identity_map) for s in sessions),
+        },
+    }
+
+
+def _get_snapshot(snapshot_id: int):
+    stored = memory_diagnostics.get(snapshot_id)
+    if stored is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Snapshot {snapshot_id} not found"
+        )
+    return stored
+
+
+@router.get("", response_model=MemoryStatusResponse)
+def get_memory_status(current_user: Principal = Depends(require_admin)):
+    """
+    Get process RSS, tracemalloc state and internal structure sizes
+
+    Admin only.
+    """
+    return {**process_memory(), **memory_diagnostics.status(), "structures": _structure_sizes()}
+
+
+@router.post("/tracing", response_model=MemoryStatusResponse)
+def start_tracing(
+    frames: int = Query(1, ge=1, le=50, description="Traceback depth stored per allocation"),
+    current_user: Principal = Depends(require_admin)
+):
+    """
+    Start tracemalloc (slows allocation while on)
+
+    Admin only.
+    """
+    memory_diagnostics.start(frames)
+    return get_memory_status(current_user)
+
+
+@router.delete("/tracing", response_model=MemoryStatusResponse)
+def stop_tracing(current_user: Principal = Depends(require_admin)):
+    """
+    Stop tracemalloc and discard its snapshots
+
+    Admin only.
+    """
+    memory_diagnostics.stop()
+    return get_memory_status(current_user)
+
+
+@router.post("/snapshots", response_model=SnapshotSummary, status_code=status.HTTP_201_CREATED)
+def take_snapshot(current_user: Principal = Depends(require_admin)):
+    """
+    Snapshot traced allocations
+
+    Admin only. Requires tracing to be started.
+    """
+    try:
+        stored = memory_diagnostics.take_snapshot()
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    # Not the dataclass itself: FastAPI would deep-copy the whole snapshot
+    return SnapshotSummary.model_validate(stored)
+
+
+@router.get("/snapshots/{snapshot_id}", response_model=List[AllocationStat])
+def get_snapshot_top(
+    snapshot_id: int,
+    limit: int = Query(25, ge=1, le=500),
+    current_user: Principal = Depends(require_admin)
+):
+    """
+    Largest allocation sites in a snapshot, by file:line
+
+    Admin only.
+    """
+    return memory_diagnostics.top(_get_snapshot(snapshot_id), limit)
+
+
+@router.get("/snapshots/{snapshot_id}/diff/{base_id}", response_model=List[AllocationStat])
+def diff_snapshots(
+    snapshot_id: int,
+    base_id: int,
+    limit: int = Query(25, ge=1, le=500),
+    current_user: Principal = Depends(require_admin)
+):
+    """
+    Allocation sites that grew or shrank most since ``base_id``, by file:line
+
+    Admin only.
+    """
+    return memory_diagnostics.diff(_get_snapshot(base_id), _get_snapshot(snapshot_id), limit)
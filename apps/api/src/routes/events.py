@@ -1,17 +1,23 @@
 """Event management routes"""
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import func, or_, select
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
-from typing import Optional
+from typing import Optional, Tuple
+import hashlib
 import uuid
 import logging
 from ..database import get_db
-from ..models.user import User, UserRole
+from ..models.user import UserRole
 from ..models.event import Event, EventStatus
 from ..domain.event_approval import EventApprovalService
-from ..schemas.event import EventCreate, EventUpdate, EventResponse, EventListResponse
+from ..domain.list_totals import ListTotals
+from ..schemas.event import EventCreate, EventUpdate, EventResponse, EventListResponse, EventStatsResponse
+from ..core.conditional import not_modified
 from ..core.rate_limit import RateLimiter
+from ..core.response_cache import event_list_cache
+from ..core.pagination import paginate_query, split_page
+from ..core.principal import Principal
 from ..core.deps import (
     get_current_user,
     get_current_user_optional,
@@ -22,52 +28,138 @@ router = APIRouter(prefix="/events", tags=["Events"])
 logger = logging.getLogger(__name__)
 approval_rate_limiter = RateLimiter(max_calls=10, period_seconds=60)
 
+# Listing order for keyset pagination (id breaks ties)
+EVENT_SORT = (Event.start_at, Event.id)
 
-def ensure_admin(current_user: User) -> None:
+LISTING_CACHE_CONTROL = "private, max-age=60"
+
+
+def ensure_admin(current_user: Principal) -> None:
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
 
+def apply_event_visibility(query, current_user: Optional[Principal]):
+    """
+    Restrict an event query (ORM Query or select) to what the caller may list
+
+    - Anonymous users and members see published events
+    - Organizers also see their own pending/rejected events
+    - Admins see everything
+    """
+    if not current_user or current_user.role == UserRole.MEMBER:
+        return query.where(Event.status == EventStatus.PUBLISHED)
+    if current_user.role == UserRole.ORGANIZER:
+        return query.where(
+            or_(Event.status == EventStatus.PUBLISHED, Event.organizer_id == current_user.id)
+        )
+    return query
+
+
+def is_public_listing(current_user: Optional[Principal]) -> bool:
+    """Anonymous callers and members all see the same published-only listing."""
+    return current_user is None or current_user.role == UserRole.MEMBER
+
+
+def cached_listing_response(body: bytes, etag: str) -> Response:
+    """Wrap a cached, already-serialized EventListResponse body."""
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"Cache-Control": LISTING_CACHE_CONTROL, "ETag": etag}
+    )
+
+
+def cacheable_listing(page: EventListResponse) -> Tuple[bytes, str]:
+    """Serialize a public page once, with a strong ETag over its bytes."""
+    body = page.model_dump_json().encode()
+    return body, f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def listing_version_stmt(current_user: Optional[Principal]):
+    """Newest change and row count over everything the caller may list."""
+    return apply_event_visibility(select(func.max(Event.updated_at), func.count(Event.id)), current_user)
+
+
+def listing_etag(current_user: Principal, newest, count: int) -> str:
+    """ETag for a non-public listing; changes whenever any visible event does."""
+    scope = "admin" if current_user.role == UserRole.ADMIN else f"org-{current_user.id}"
+    stamp = newest.isoformat() if newest is not None else "-"
+    digest = hashlib.sha256(f"{scope}|{stamp}|{count}".encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def event_etag(version: int) -> str:
+    """ETag for a single event."""
+    return f'"v{version}"'
+
+
+def _event_page(
+    db: Session,
+    current_user: Optional[Principal],
+    limit: int,
+    offset: int,
+    cursor: Optional[str],
+    include_total: bool
+) -> EventListResponse:
+    query = apply_event_visibility(db.query(Event), current_user)
+    total = ListTotals.visible_events(db, current_user) if include_total else None
+    rows = paginate_query(query, EVENT_SORT, limit, offset, cursor).all()
+    events, next_cursor = split_page(rows, EVENT_SORT, limit)
+
+    return EventListResponse(
+        items=[EventResponse.model_validate(e) for e in events],
+        total=total,
+        limit=limit,
+        offset=offset,
+        next_cursor=next_cursor
+    )
+
+
 @router.get("", response_model=EventListResponse)
 def get_events(
+    request: Request,
     response: Response,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    current_user: Optional[User] = Depends(get_current_user_optional),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    include_total: bool = Query(True, description="Include the total count (served from a maintained counter)"),
+    current_user: Optional[Principal] = Depends(get_current_user_optional),
     db: Session = Depends(get_db)
 ):
     """
     Get list of all events with pagination
 
-    Public endpoint - authentication optional
+    Public endpoint - authentication optional.
+    Pass ``cursor`` (from ``next_cursor``) for keyset pagination.
+    The public (anonymous / member) listing is served from ``event_list_cache``.
+    Responses carry an ETag; a matching ``If-None-Match`` gets a 304.
     """
-    query = db.query(Event)
-
-    if not current_user or current_user.role == UserRole.MEMBER:
-        query = query.filter(Event.status == EventStatus.PUBLISHED)
-    elif current_user.role == UserRole.ORGANIZER:
-        query = query.filter(
-            or_(Event.status == EventStatus.PUBLISHED, Event.organizer_id == current_user.id)
+    if is_public_listing(current_user):
+        body, etag = event_list_cache.get_or_compute(
+            (limit, offset, cursor, include_total),
+            lambda: cacheable_listing(_event_page(db, None, limit, offset, cursor, include_total))
         )
+        return not_modified(request, etag, LISTING_CACHE_CONTROL) or cached_listing_response(body, etag)
 
-    query = query.order_by(Event.start_at.desc())
-    total = query.count()
-    events = query.offset(offset).limit(limit).all()
-    response.headers["Cache-Control"] = "private, max-age=60"
+    # Version first: a write landing mid-request can only make the ETag older
+    etag = listing_etag(current_user, *db.execute(listing_version_stmt(current_user)).one())
+    unchanged = not_modified(request, etag, LISTING_CACHE_CONTROL)
+    if unchanged:
+        return unchanged
 
-    return EventListResponse(
-        items=[EventResponse.model_validate(e) for e in events],
-        total=total,
-        limit=limit,
-        offset=offset
-    )
+    response.headers["Cache-Control"] = LISTING_CACHE_CONTROL
+    response.headers["ETag"] = etag
+    return _event_page(db, current_user, limit, offset, cursor, include_total)
 
 
 @router.get("/managed", response_model=EventListResponse)
 def get_managed_events(
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    current_user: User = Depends(require_organizer_or_admin),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    include_total: bool = Query(True, description="Include the total count (served from a maintained counter)"),
+    current_user: Principal = Depends(require_organizer_or_admin),
     db: Session = Depends(get_db)
 ):
     """
@@ -77,20 +169,22 @@ def get_managed_events(
     - Admins see all events
     """
     if current_user.role == UserRole.ADMIN:
-        query = db.query(Event).order_by(Event.start_at.desc())
+        query = db.query(Event)
     else:
         query = db.query(Event).filter(
             Event.organizer_id == current_user.id
-        ).order_by(Event.start_at.desc())
+        )
 
-    total = query.count()
-    events = query.offset(offset).limit(limit).all()
+    total = ListTotals.managed_events(db, current_user) if include_total else None
+    rows = paginate_query(query, EVENT_SORT, limit, offset, cursor).all()
+    events, next_cursor = split_page(rows, EVENT_SORT, limit)
 
     return EventListResponse(
         items=[EventResponse.model_validate(e) for e in events],
         total=total,
         limit=limit,
-        offset=offset
+        offset=offset,
+        next_cursor=next_cursor
     )
 
 
@@ -98,35 +192,48 @@ def get_managed_events(
 def get_pending_events(
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    include_total: bool = Query(True, description="Include the total count (served from a maintained counter)"),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Get pending events for admin approval
     """
     ensure_admin(current_user)
-    events = EventApprovalService.get_pending_events(db, limit, offset)
-    total = db.query(Event).filter(Event.status == EventStatus.PENDING).count()
+    events, next_cursor = EventApprovalService.get_pending_events(db, limit, offset, cursor)
+    total = ListTotals.pending_events(db) if include_total else None
 
     return EventListResponse(
         items=[EventResponse.model_validate(e) for e in events],
         total=total,
         limit=limit,
-        offset=offset
+        offset=offset,
+        next_cursor=next_cursor
     )
 
 
 @router.get("/{event_id}", response_model=EventResponse)
 def get_event(
     event_id: str,
-    current_user: Optional[User] = Depends(get_current_user_optional),
+    request: Request,
+    response: Response,
+    current_user: Optional[Principal] = Depends(get_current_user_optional),
     db: Session = Depends(get_db)
 ):
     """
     Get event details by ID
 
-    Public endpoint - authentication optional
+    Public endpoint - authentication optional.
+    Responses carry an ETag; a matching ``If-None-Match`` gets a 304
+    after reading only the event's version.
     """
+    if request.headers.get("if-none-match"):
+        version = db.query(Event.version).filter(Event.id == event_id).scalar()
+        unchanged = not_modified(request, event_etag(version)) if version is not None else None
+        if unchanged:
+            return unchanged
+
     event = db.query(Event).filter(Event.id == event_id).first()
 
     if not event:
@@ -135,13 +242,58 @@ def get_event(
             detail="Event not found"
         )
 
+    response.headers["ETag"] = event_etag(event.version)
     return EventResponse.model_validate(event)
 
 
+@router.get("/{event_id}/stats", response_model=EventStatsResponse)
+def get_event_stats(
+    event_id: str,
+    current_user: Principal = Depends(require_organizer_or_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Get attendance counters for an event
+
+    Served from the counters maintained on the event row, so the cost
+    does not grow with the number of registrations.
+
+    Must be event organizer or admin
+    """
+    event = db.query(
+        Event.organizer_id,
+        Event.capacity,
+        Event.registered_count,
+        Event.checked_in_count,
+        Event.cancelled_count,
+    ).filter(Event.id == event_id).first()
+
+    if not event:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found"
+        )
+
+    if current_user.role != UserRole.ADMIN and event.organizer_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to view this event's stats"
+        )
+
+    return EventStatsResponse(
+        event_id=event_id,
+        capacity=event.capacity,
+        registered_count=event.registered_count,
+        checked_in_count=event.checked_in_count,
+        cancelled_count=event.cancelled_count,
+        available_slots=max(0, event.capacity - event.registered_count),
+    )
+
+
 @router.post("", response_model=EventResponse, status_code=status.HTTP_201_CREATED)
 def create_event(
     event_data: EventCreate,
-    current_user: User = Depends(require_organizer_or_admin),
+    current_user: Principal = Depends(require_organizer_or_admin),
     db: Session = Depends(get_db)
 ):
     """
@@ -178,8 +330,10 @@ def create_event(
 
     try:
         db.add(event)
+        ListTotals.apply(db, ListTotals.event_created(event.organizer_id, event.status))
         db.commit()
         db.refresh(event)
+        event_list_cache.invalidate()
         logger.info(f"Event created: {event.id} by user {current_user.id}")
         EventApprovalService.log_event_creation(event, current_user.id)
     except IntegrityError as e:
@@ -203,7 +357,7 @@ def create_event(
 @router.patch("/{event_id}/approve", response_model=EventResponse)
 def approve_event(
     event_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -218,7 +372,7 @@ def approve_event(
 @router.patch("/{event_id}/reject", response_model=EventResponse)
 def reject_event(
     event_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -234,7 +388,7 @@ def reject_event(
 def update_event(
     event_id: str,
     event_updates: EventUpdate,
-    current_user: User = Depends(require_organizer_or_admin),
+    current_user: Principal = Depends(require_organizer_or_admin),
     db: Session = Depends(get_db)
 ):
     """
@@ -276,6 +430,7 @@ def update_event(
     try:
         db.commit()
         db.refresh(event)
+        event_list_cache.invalidate()
         logger.info(f"Event updated: {event.id} by user {current_user.id}")
     except SQLAlchemyError as e:
         db.rollback()
@@ -291,7 +446,7 @@ def update_event(
 @router.delete("/{event_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_event(
     event_id: str,
-    current_user: User = Depends(require_organizer_or_admin),
+    current_user: Principal = Depends(require_organizer_or_admin),
     db: Session = Depends(get_db)
 ):
     """
@@ -315,8 +470,10 @@ def delete_event(
         )
 
     try:
+        ListTotals.event_deleted(db, event)
         db.delete(event)
         db.commit()
+        event_list_cache.invalidate()
         logger.info(f"Event deleted: {event_id} by user {current_user.id}")
     except SQLAlchemyError as e:
         db.rollback()
@@ -0,0 +1,63 @@
+"""On-demand profiling routes (Admin only)"""
+import time
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from ..core.config import settings
+from ..core.deps import require_admin
+from ..core.principal import Principal
+from ..core.profiler import profile_store
+from ..schemas.profile import ProfileSummary
+
+router = APIRouter(prefix="/admin/profiles", tags=["Admin"])
+
+
+@router.post("", response_model=ProfileSummary, status_code=status.HTTP_201_CREATED)
+def profile_window(
+    seconds: float = Query(10, gt=0, le=settings.PROFILER_MAX_WINDOW_SECONDS),
+    current_user: Principal = Depends(require_admin)
+):
+    """
+    Sample every thread for a time window across all traffic
+
+    Admin only. Blocks until the window ends; fetch the stacks with
+    ``GET /admin/profiles/{profile_id}``.
+    """
+    sampler = profile_store.start("window", f"{seconds:g}s window", exclude_current_thread=True)
+    if sampler is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Another profile is already running"
+        )
+
+    try:
+        time.sleep(seconds)
+    finally:
+        profile = profile_store.finish(sampler)
+    return profile
+
+
+@router.get("", response_model=List[ProfileSummary])
+def list_profiles(current_user: Principal = Depends(require_admin)):
+    """
+    List recent profiles, newest first
+
+    Admin only.
+    """
+    return profile_store.list()
+
+
+@router.get("/{profile_id}", response_class=PlainTextResponse)
+def get_profile(profile_id: int, current_user: Principal = Depends(require_admin)):
+    """
+    Get a profile's stacks in collapsed format (flamegraph.pl / speedscope)
+
+    Admin only.
+    """
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return PlainTextResponse(profile.collapsed())
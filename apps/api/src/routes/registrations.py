@@ -1,11 +1,18 @@
 """Registration management routes"""
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
-from typing import List
+from typing import AsyncIterator, Iterator, List, Optional
 from datetime import datetime, timezone
+import asyncio
+import csv
+import enum
+import io
+import json
 import uuid
-from ..database import get_db
+from ..database import SessionLocal, get_db, live_sessions
 from ..models.user import User, UserRole
 from ..models.event import Event, EventStatus
 from ..models.registration import Registration, RegistrationStatus
@@ -15,15 +22,69 @@ from ..schemas.registration import (
     RegistrationListResponse,
     AttendeeListResponse
 )
+from ..core.broadcast import occupancy_broadcaster
 from ..core.deps import get_current_user, require_organizer_or_admin
+from ..core.pagination import paginate_query, split_page
+from ..domain.list_totals import ListTotals
+from ..domain.occupancy import OccupancyService
+from ..domain.registration import SeatReservation
+from ..core.principal import Principal
+from ..core.response_cache import event_list_cache
+from ..core.tickets import issue_ticket_code
 
 router = APIRouter(tags=["Registrations"])
 
+# Listing order for keyset pagination (id breaks ties)
+REGISTRATION_SORT = (Registration.created_at, Registration.id)
+
+# Columns backing AttendeeResponse, labelled to match its fields
+ATTENDEE_COLUMNS = (
+    Registration.id,
+    Registration.event_id,
+    Registration.event_title,
+    Registration.event_start_at,
+    Registration.user_id,
+    Registration.status,
+    Registration.qr_code,
+    Registration.created_at,
+    User.display_name.label("user_display_name"),
+    User.email.label("user_email"),
+)
+
+
+def ensure_can_view_attendees(db: Session, event_id: str, current_user: Principal):
+    """
+    Check the event exists and the caller organizes it (or is admin)
+
+    Returns:
+        The event's organizer and registration counters
+
+    Raises:
+        HTTPException: 404 if the event is missing, 403 if not permitted
+    """
+    # Only the organizer and counter columns are needed
+    event = db.query(
+        Event.organizer_id, Event.registered_count, Event.cancelled_count
+    ).filter(Event.id == event_id).first()
+    if not event:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found"
+        )
+
+    if current_user.role != UserRole.ADMIN and event.organizer_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to view this event's attendees"
+        )
+
+    return event
+
 
 @router.post("/events/{event_id}/registrations", response_model=RegistrationResponse, status_code=status.HTTP_201_CREATED)
 def register_for_event(
     event_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -51,10 +112,25 @@ def register_for_event(
 
     if existing_reg:
         if existing_reg.status == RegistrationStatus.CANCELLED:
-            # Reactivate cancelled registration
-            existing_reg.status = RegistrationStatus.REGISTERED
+            # Reactivate cancelled registration (exactly once, only if a seat is free)
+            if not SeatReservation.transition(
+                db, existing_reg.id, RegistrationStatus.CANCELLED, RegistrationStatus.REGISTERED
+            ):
+                db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Already registered for this event"
+                )
+            if not SeatReservation.reserve(db, event_id):
+                db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Event is at full capacity"
+                )
+            SeatReservation.count_transition(
+                db, event_id, RegistrationStatus.CANCELLED, RegistrationStatus.REGISTERED
+            )
             existing_reg.created_at = datetime.now(timezone.utc)
-            event.registered_count += 1
             try:
                 db.commit()
                 db.refresh(existing_reg)
@@ -64,6 +140,8 @@ def register_for_event(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail="Database error occurred while reactivating registration"
                 )
+            event_list_cache.invalidate()
+            OccupancyService.publish(db, [event_id])
             return RegistrationResponse.model_validate(existing_reg)
         else:
             raise HTTPException(
@@ -71,31 +149,34 @@ def register_for_event(
                 detail="Already registered for this event"
             )
 
-    # Check capacity
-    if event.is_full:
+    # Reserve a seat atomically (one winner per remaining seat)
+    if not SeatReservation.reserve(db, event_id):
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Event is at full capacity"
         )
 
     # Create registration
+    registration_id = str(uuid.uuid4())
     registration = Registration(
-        id=str(uuid.uuid4()),
+        id=registration_id,
         event_id=event_id,
         user_id=current_user.id,
         event_title=event.title,
         event_start_at=event.start_at,
         status=RegistrationStatus.REGISTERED,
-        qr_code=f"QR-{event_id}-{current_user.id}-{uuid.uuid4().hex[:8]}",
+        qr_code=issue_ticket_code(registration_id, event_id),
         created_at=datetime.now(timezone.utc)
     )
 
-    event.registered_count += 1
-
     try:
         db.add(registration)
+        ListTotals.apply(db, ListTotals.registration_added(current_user.id))
         db.commit()
         db.refresh(registration)
+        event_list_cache.invalidate()
+        OccupancyService.publish(db, [event_id])
     except IntegrityError as e:
         db.rollback()
         raise HTTPException(
@@ -116,7 +197,9 @@ def register_for_event(
 def get_my_registrations(
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    include_total: bool = Query(True, description="Include the total count (served from a maintained counter)"),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -130,23 +213,25 @@ def get_my_registrations(
     ).filter(
         Registration.user_id == current_user.id,
         Event.status == EventStatus.PUBLISHED
-    ).order_by(Registration.created_at.desc())
+    )
 
-    total = query.count()
-    registrations = query.offset(offset).limit(limit).all()
+    total = ListTotals.user_registrations(db, current_user.id) if include_total else None
+    rows = paginate_query(query, REGISTRATION_SORT, limit, offset, cursor).all()
+    registrations, next_cursor = split_page(rows, REGISTRATION_SORT, limit)
 
     return RegistrationListResponse(
         items=[RegistrationResponse.model_validate(r) for r in registrations],
         total=total,
         limit=limit,
-        offset=offset
+        offset=offset,
+        next_cursor=next_cursor
     )
 
 
 @router.delete("/registrations/{registration_id}", status_code=status.HTTP_204_NO_CONTENT)
 def cancel_registration(
     registration_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -183,13 +268,23 @@ def cancel_registration(
     if registration.status == RegistrationStatus.CANCELLED:
         return None
 
-    # Cancel registration
-    registration.status = RegistrationStatus.CANCELLED
-
-    # Decrease event count
-    event = db.query(Event).filter(Event.id == registration.event_id).first()
-    if event and event.registered_count > 0:
-        event.registered_count -= 1
+    # Cancel registration; only the request that flips the status releases the seat
+    if SeatReservation.transition(
+        db, registration.id, RegistrationStatus.REGISTERED, RegistrationStatus.CANCELLED
+    ):
+        SeatReservation.release(db, registration.event_id)
+        SeatReservation.count_transition(
+            db, registration.event_id, RegistrationStatus.REGISTERED, RegistrationStatus.CANCELLED
+        )
+    else:
+        db.rollback()
+        db.refresh(registration)
+        if registration.status == RegistrationStatus.CHECKED_IN:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot cancel a ticket that has already been checked in"
+            )
+        return None
 
     try:
         db.commit()
@@ -200,6 +295,8 @@ def cancel_registration(
             detail="Database error occurred while cancelling registration"
         )
 
+    event_list_cache.invalidate()
+    OccupancyService.publish(db, [registration.event_id])
     return None
 
 
@@ -208,7 +305,9 @@ def get_event_attendees(
     event_id: str,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    current_user: User = Depends(require_organizer_or_admin),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    include_total: bool = Query(True, description="Include the total count (served from a maintained counter)"),
+    current_user: Principal = Depends(require_organizer_or_admin),
     db: Session = Depends(get_db)
 ):
     """
@@ -216,39 +315,193 @@ def get_event_attendees(
 
     Must be event organizer or admin
     """
-    # Check if event exists
-    event = db.query(Event).filter(Event.id == event_id).first()
-    if not event:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Event not found"
-        )
-
-    # Check permissions
-    if current_user.role != UserRole.ADMIN and event.organizer_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have permission to view this event's attendees"
-        )
+    event = ensure_can_view_attendees(db, event_id, current_user)
 
-    # Get registrations with user info
-    query = db.query(Registration).filter(
+    # One joined, column-projected query for the page (no per-row user loads)
+    query = db.query(*ATTENDEE_COLUMNS).join(
+        User, Registration.user_id == User.id
+    ).filter(
         Registration.event_id == event_id
-    ).order_by(Registration.created_at.desc())
-
-    total = query.count()
-    registrations = query.offset(offset).limit(limit).all()
+    )
 
-    attendees = []
-    for reg in registrations:
-        attendee_data = RegistrationResponse.model_validate(reg).model_dump()
-        attendee_data["user_display_name"] = reg.user.display_name
-        attendee_data["user_email"] = reg.user.email
-        attendees.append(AttendeeResponse(**attendee_data))
+    total = ListTotals.event_registrations(event) if include_total else None
+    rows = paginate_query(query, REGISTRATION_SORT, limit, offset, cursor).all()
+    page, next_cursor = split_page(rows, REGISTRATION_SORT, limit)
 
     return AttendeeListResponse(
-        items=attendees,
+        items=[AttendeeResponse.model_validate(row) for row in page],
         total=total,
         limit=limit,
-        offset=offset
+        offset=offset,
+        next_cursor=next_cursor
+    )
+
+
+class ExportFormat(str, enum.Enum):
+    """Attendee export formats"""
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+# Columns written by the attendee export, in order
+EXPORT_FIELDS = (
+    "id", "user_display_name", "user_email", "status", "qr_code", "created_at",
+)
+
+# Rows fetched per round-trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+
+def _csv_safe(value: str) -> str:
+    """Neutralise spreadsheet formula injection in exported cells"""
+    if value and value[0] in ("=", "+", "-", "@"):
+        return "'" + value
+    return value
+
+
+def _export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def _stream_attendees(
+    event_id: str,
+    statuses: Optional[List[RegistrationStatus]],
+    export_format: ExportFormat,
+) -> Iterator[str]:
+    """
+    Yield export chunks for an event's attendees
+
+    Uses its own session because the request-scoped one is closed before
+    the response body is streamed. Rows come from a server-side cursor in
+    batches, so memory stays flat regardless of event size.
+    """
+    db = SessionLocal()
+    live_sessions.add(db)
+    try:
+        query = db.query(*ATTENDEE_COLUMNS).join(
+            User, Registration.user_id == User.id
+        ).filter(
+            Registration.event_id == event_id
+        )
+        if statuses:
+            query = query.filter(Registration.status.in_(statuses))
+        query = query.order_by(
+            Registration.created_at, Registration.id
+        ).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if export_format == ExportFormat.CSV:
+            writer.writerow(EXPORT_FIELDS)
+
+        for index, row in enumerate(query, start=1):
+            values = [_export_value(getattr(row, field)) for field in EXPORT_FIELDS]
+            if export_format == ExportFormat.CSV:
+                writer.writerow([_csv_safe(v) if isinstance(v, str) else v for v in values])
+            else:
+                buffer.write(json.dumps(dict(zip(EXPORT_FIELDS, values)), ensure_ascii=False))
+                buffer.write("\n")
+
+            if index % EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+
+        yield buffer.getvalue()
+    finally:
+        live_sessions.discard(db)
+        db.close()
+
+
+@router.get("/events/{event_id}/attendees/export")
+def export_event_attendees(
+    event_id: str,
+    format: ExportFormat = Query(ExportFormat.CSV, description="csv or ndjson"),
+    status_filter: Optional[List[RegistrationStatus]] = Query(
+        None, alias="status", description="Only include these registration statuses"
+    ),
+    current_user: Principal = Depends(require_organizer_or_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream the full attendee list for an event as CSV or NDJSON
+
+    Must be event organizer or admin
+    """
+    ensure_can_view_attendees(db, event_id, current_user)
+
+    if format == ExportFormat.CSV:
+        media_type = "text/csv"
+    else:
+        media_type = "application/x-ndjson"
+
+    return StreamingResponse(
+        _stream_attendees(event_id, status_filter, format),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="attendees-{event_id}.{format.value}"'
+        },
+    )
+
+
+# Comment line sent when idle so proxies keep the stream open
+OCCUPANCY_HEARTBEAT_SECONDS = 15
+
+
+def _occupancy_snapshot(event_id: str) -> Optional[dict]:
+    # Runs after the request's session is closed; see _stream_attendees
+    db = SessionLocal()
+    try:
+        return OccupancyService.snapshot(db, event_id)
+    finally:
+        db.close()
+
+
+async def _stream_occupancy(event_id: str) -> AsyncIterator[str]:
+    """Initial snapshot, then one frame per published update"""
+    # Subscribe before reading the snapshot so no update falls in between
+    subscription = occupancy_broadcaster.subscribe(event_id)
+    try:
+        snapshot = await run_in_threadpool(_occupancy_snapshot, event_id)
+        if snapshot is None:
+            return
+        yield "retry: 5000\n\n" + OccupancyService.sse_frame(snapshot)
+
+        while True:
+            try:
+                yield await asyncio.wait_for(subscription.get(), OCCUPANCY_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+    finally:
+        occupancy_broadcaster.unsubscribe(subscription)
+
+
+@router.get("/events/{event_id}/occupancy/stream")
+def stream_event_occupancy(
+    event_id: str,
+    current_user: Principal = Depends(require_organizer_or_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Live registered / checked-in / remaining counts as server-sent events
+
+    Sends the current counts, then an ``occupancy`` event whenever a
+    registration, cancellation, check-in or walk-in changes them.
+
+    Must be event organizer or admin
+    """
+    ensure_can_view_attendees(db, event_id, current_user)
+
+    return StreamingResponse(
+        _stream_occupancy(event_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Stop nginx-style proxies from buffering the stream
+            "X-Accel-Buffering": "no",
+        },
     )
@@ -2,20 +2,28 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from typing import List
+from typing import List, Optional
 from ..database import get_db
 from ..models.user import User
 from ..schemas.user import UserResponse, UserRoleUpdate, UserListResponse
 from ..core.deps import require_admin
+from ..core.pagination import paginate_query, split_page
+from ..domain.list_totals import ListTotals
+from ..core.principal import Principal, principal_cache
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
+# Listing order for keyset pagination (id breaks ties)
+USER_SORT = (User.email, User.id)
+
 
 @router.get("", response_model=UserListResponse)
 def get_all_users(
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    current_user: User = Depends(require_admin),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    include_total: bool = Query(True, description="Include the total count (served from a maintained counter)"),
+    current_user: Principal = Depends(require_admin),
     db: Session = Depends(get_db)
 ):
     """
@@ -23,15 +31,17 @@ def get_all_users(
 
     Admin only
     """
-    query = db.query(User).order_by(User.email)
-    total = query.count()
-    users = query.offset(offset).limit(limit).all()
+    query = db.query(User)
+    total = ListTotals.users(db) if include_total else None
+    rows = paginate_query(query, USER_SORT, limit, offset, cursor, descending=False).all()
+    users, next_cursor = split_page(rows, USER_SORT, limit)
 
     return UserListResponse(
         items=[UserResponse.model_validate(u) for u in users],
         total=total,
         limit=limit,
-        offset=offset
+        offset=offset,
+        next_cursor=next_cursor
     )
 
 
@@ -39,7 +49,7 @@ def get_all_users(
 def update_user_role(
     user_id: str,
     role_update: UserRoleUpdate,
-    current_user: User = Depends(require_admin),
+    current_user: Principal = Depends(require_admin),
     db: Session = Depends(get_db)
 ):
     """
@@ -67,4 +77,6 @@ def update_user_role(
             detail="Database error occurred while updating user role"
         )
 
+    principal_cache.invalidate(user.id)
+
     return UserResponse.model_validate(user)
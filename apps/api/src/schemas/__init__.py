@@ -1,16 +1,26 @@
 """Pydantic schemas for request/response validation"""
 from .user import UserCreate, UserResponse, UserRole, UserRoleUpdate
 from .auth import LoginRequest, LoginResponse, TokenResponse
-from .event import EventCreate, EventUpdate, EventResponse
+from .event import EventCreate, EventUpdate, EventResponse, EventStatsResponse
 from .approval import ApprovalActionResponse
 from .registration import RegistrationResponse, RegistrationCreate, AttendeeResponse
-from .checkin import CheckInRequest, CheckInResult, WalkInRequest
+from .checkin import (
+    CheckInRequest, CheckInResult, WalkInRequest,
+    BatchScan, BatchCheckInRequest, BatchCheckInItem, BatchCheckInResponse,
+    ManifestEntry, CheckInManifestResponse
+)
+from .profile import ProfileSummary
+from .diagnostics import SnapshotSummary, AllocationStat, MemoryStatusResponse
 
 __all__ = [
     "UserCreate", "UserResponse", "UserRole", "UserRoleUpdate",
     "LoginRequest", "LoginResponse", "TokenResponse",
-    "EventCreate", "EventUpdate", "EventResponse",
+    "EventCreate", "EventUpdate", "EventResponse", "EventStatsResponse",
     "ApprovalActionResponse",
     "RegistrationResponse", "RegistrationCreate", "AttendeeResponse",
-    "CheckInRequest", "CheckInResult", "WalkInRequest"
+    "CheckInRequest", "CheckInResult", "WalkInRequest",
+    "BatchScan", "BatchCheckInRequest", "BatchCheckInItem", "BatchCheckInResponse",
+    "ManifestEntry", "CheckInManifestResponse",
+    "ProfileSummary",
+    "SnapshotSummary", "AllocationStat", "MemoryStatusResponse"
 ]
@@ -1,13 +1,17 @@
 """Check-in Pydantic schemas"""
-from pydantic import BaseModel, EmailStr, field_validator
-from typing import Optional
+from pydantic import BaseModel, EmailStr, Field, field_validator
+from datetime import datetime
+from typing import List, Optional
 from .registration import RegistrationResponse
+from ..models.registration import RegistrationStatus
 from ..core.sanitize import sanitize_string
 
 
 class CheckInRequest(BaseModel):
     """Schema for check-in/verify request"""
     qr_code: str
+    # Event the scanner is checking in for; lets foreign tickets be rejected early
+    event_id: Optional[str] = None
 
 
 class WalkInRequest(BaseModel):
@@ -30,3 +34,41 @@ class CheckInResult(BaseModel):
     success: bool
     message: str
     registration: Optional[RegistrationResponse] = None
+
+
+class BatchScan(BaseModel):
+    """A single queued scan from an offline scanner"""
+    qr_code: str
+    scanned_at: Optional[datetime] = None
+
+
+class BatchCheckInRequest(BaseModel):
+    """Schema for replaying queued scans in one request"""
+    scans: List[BatchScan] = Field(..., min_length=1, max_length=1000)
+    event_id: Optional[str] = None
+
+
+class BatchCheckInItem(CheckInResult):
+    """Per-scan result of a batch check-in"""
+    qr_code: str
+    scanned_at: Optional[datetime] = None
+
+
+class BatchCheckInResponse(BaseModel):
+    """Schema for batch check-in response (results in request order)"""
+    results: List[BatchCheckInItem]
+    checked_in: int
+
+
+class ManifestEntry(BaseModel):
+    """One ticket in a check-in manifest"""
+    ticket_hash: str
+    status: RegistrationStatus
+
+
+class CheckInManifestResponse(BaseModel):
+    """Schema for an event's offline check-in manifest (full or delta)"""
+    event_id: str
+    version: int
+    full: bool
+    entries: List[ManifestEntry]
@@ -0,0 +1,36 @@
+"""Diagnostics-related schemas."""
+from datetime import datetime
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+
+
+class SnapshotSummary(BaseModel):
+    """Schema for a stored tracemalloc snapshot"""
+    id: int
+    taken_at: datetime
+    traced_bytes: int
+
+    class Config:
+        from_attributes = True
+
+
+class AllocationStat(BaseModel):
+    """Schema for one allocation site (file:line), optionally compared to a base snapshot"""
+    location: str
+    size_bytes: int
+    count: int
+    size_diff_bytes: Optional[int] = None
+    count_diff: Optional[int] = None
+
+
+class MemoryStatusResponse(BaseModel):
+    """Schema for process memory, tracing state and internal structure sizes"""
+    rss_bytes: Optional[int]
+    max_rss_bytes: int
+    tracing: bool
+    traceback_frames: int
+    traced_current_bytes: int
+    traced_peak_bytes: int
+    tracemalloc_overhead_bytes: int
+    snapshots: List[SnapshotSummary]
+    structures: Dict[str, Dict[str, int]]
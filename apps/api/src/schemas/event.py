@@ -70,9 +70,20 @@ class EventResponse(EventBase):
         from_attributes = True
 
 
+class EventStatsResponse(BaseModel):
+    """Schema for per-event attendance counters"""
+    event_id: str
+    capacity: int
+    registered_count: int
+    checked_in_count: int
+    cancelled_count: int
+    available_slots: int
+
+
 class EventListResponse(BaseModel):
     """Schema for event list response with pagination"""
     items: list[EventResponse]
-    total: int
+    total: Optional[int] = None
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
@@ -0,0 +1,16 @@
+"""Profiling-related schemas."""
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class ProfileSummary(BaseModel):
+    """Schema for a stored profile (stacks are fetched separately)"""
+    id: int
+    kind: str
+    label: str
+    started_at: datetime
+    duration_ms: float
+    samples: int
+
+    class Config:
+        from_attributes = True
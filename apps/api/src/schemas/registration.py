@@ -1,5 +1,6 @@
 """Registration Pydantic schemas"""
 from pydantic import BaseModel, EmailStr
+from typing import Optional
 from datetime import datetime
 from ..models.registration import RegistrationStatus
 
@@ -40,14 +41,16 @@ class AttendeeResponse(RegistrationResponse):
 class RegistrationListResponse(BaseModel):
     """Schema for registration list response with pagination"""
     items: list[RegistrationResponse]
-    total: int
+    total: Optional[int] = None
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
 
 class AttendeeListResponse(BaseModel):
     """Schema for attendee list response with pagination"""
     items: list[AttendeeResponse]
-    total: int
+    total: Optional[int] = None
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
@@ -1,5 +1,6 @@
 """User Pydantic schemas"""
 from pydantic import BaseModel, EmailStr, Field, field_validator
+from typing import Optional
 from ..models.user import UserRole
 from ..core.sanitize import sanitize_string
 
@@ -39,6 +40,7 @@ class UserRoleUpdate(BaseModel):
 class UserListResponse(BaseModel):
     """Schema for user list response with pagination"""
     items: list[UserResponse]
-    total: int
+    total: Optional[int] = None
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
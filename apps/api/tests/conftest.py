@@ -0,0 +1,80 @@
+"""Shared test fixtures
+
+Settings are read when ``src`` is first imported, so DATABASE_URL is
+pointed at a throwaway SQLite file before the app is imported.
+"""
+import os
+import tempfile
+
+_DB_DIR = tempfile.mkdtemp(prefix="eventmaster-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'app.db')}"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from src.core.security import create_access_token
+from src.models import Event, User, UserRole
+from src.models.event import EventStatus
+
+
+@pytest.fixture(scope="session")
+def client() -> TestClient:
+    """Client for the real app; the lifespan creates the tables."""
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def auth_headers() -> Callable[[str], Dict[str, str]]:
+    """Bearer headers for a user id, without going through bcrypt."""
+    def make(user_id: str) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {create_access_token(data={'sub': user_id})}"}
+    return make
+
+
+def _make_user(db, role: UserRole = UserRole.MEMBER) -> User:
+    user_id = str(uuid.uuid4())
+    user = User(
+        id=user_id,
+        email=f"{user_id}@example.com",
+        hashed_password="not-a-real-hash",
+        display_name=f"User {user_id[:8]}",
+        role=role,
+    )
+    db.add(user)
+    return user
+
+
+def _make_event(db, organizer: User, capacity: int) -> Event:
+    start_at = datetime.now(timezone.utc) + timedelta(days=7)
+    event = Event(
+        id=str(uuid.uuid4()),
+        organizer_id=organizer.id,
+        title="Load test",
+        description="Concurrent registrations",
+        start_at=start_at,
+        end_at=start_at + timedelta(hours=2),
+        location="Main hall",
+        capacity=capacity,
+        status=EventStatus.PUBLISHED,
+    )
+    db.add(event)
+    return event
+
+
+@pytest.fixture
+def make_user() -> Callable[..., User]:
+    """Add a user to a session (the password hash is never checked in tests)."""
+    return _make_user
+
+
+@pytest.fixture
+def make_event() -> Callable[..., Event]:
+    """Add a published event starting next week to a session."""
+    return _make_event
@@ -0,0 +1,82 @@
+"""Attendee pages cost a fixed number of SQL statements
+
+Counts come from the ``Server-Timing`` header written by
+``QueryStatsMiddleware``; strict mode additionally fails the request if
+any statement repeats, so a per-row (N+1) load cannot slip in.
+"""
+import re
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.core.config import settings
+from src.core.tickets import issue_ticket_code
+from src.database import SessionLocal
+from src.models import Registration, RegistrationStatus, UserRole
+
+ATTENDEES = 120
+# Organizer check and the page itself; the principal and total are cached
+STATEMENTS_PER_PAGE = 2
+
+_QUERY_COUNT = re.compile(r'desc="(\d+) queries"')
+
+
+@pytest.fixture
+def strict_queries(monkeypatch):
+    monkeypatch.setattr(settings, "SQL_STRICT_MAX_REPEATS", 1)
+
+
+@pytest.fixture
+def event_with_attendees(make_user, make_event):
+    db = SessionLocal()
+    try:
+        organizer = make_user(db, UserRole.ORGANIZER)
+        event = make_event(db, organizer, capacity=ATTENDEES)
+        for i in range(ATTENDEES):
+            member = make_user(db)
+            registration_id = str(uuid.uuid4())
+            db.add(Registration(
+                id=registration_id,
+                event_id=event.id,
+                user_id=member.id,
+                status=RegistrationStatus.REGISTERED,
+                qr_code=issue_ticket_code(registration_id, event.id),
+                event_title=event.title,
+                event_start_at=event.start_at,
+                created_at=datetime.now(timezone.utc) - timedelta(seconds=i),
+            ))
+        event.registered_count = ATTENDEES
+        db.commit()
+        return event.id, organizer.id
+    finally:
+        db.close()
+
+
+def _query_count(response) -> int:
+    assert response.status_code == 200, response.text
+    return int(_QUERY_COUNT.search(response.headers["server-timing"]).group(1))
+
+
+def test_attendee_page_statement_count_is_independent_of_page_size(
+    client, auth_headers, strict_queries, event_with_attendees
+):
+    event_id, organizer_id = event_with_attendees
+    headers = auth_headers(organizer_id)
+    url = f"/events/{event_id}/attendees"
+    # Warm the principal and total caches so every page below is measured alike
+    client.get(url, params={"limit": 1}, headers=headers)
+
+    counts = {}
+    for limit in (1, 20, 100):
+        response = client.get(url, params={"limit": limit}, headers=headers)
+        assert len(response.json()["items"]) == limit
+        counts[limit] = _query_count(response)
+
+    next_cursor = client.get(url, params={"limit": 100}, headers=headers).json()["next_cursor"]
+    response = client.get(url, params={"limit": 100, "cursor": next_cursor}, headers=headers)
+    assert len(response.json()["items"]) == ATTENDEES - 100
+    counts["cursor"] = _query_count(response)
+
+    assert counts == {1: STATEMENTS_PER_PAGE, 20: STATEMENTS_PER_PAGE, 100: STATEMENTS_PER_PAGE,
+                      "cursor": STATEMENTS_PER_PAGE}
@@ -0,0 +1,74 @@
+"""Scanner sockets authenticate in-band and close on their own
+
+The token arrives in the first message, never the URL. A station that
+never sends a scan must still be closed at the token's ``exp``, and a
+failing occupancy forwarder must end the socket instead of leaving it
+open without updates.
+"""
+from datetime import timedelta
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from src.core.broadcast import checkin_broadcaster
+from src.core.security import create_access_token
+from src.database import SessionLocal
+from src.models import UserRole
+
+
+@pytest.fixture
+def station(make_user, make_event):
+    db = SessionLocal()
+    try:
+        organizer = make_user(db, UserRole.ORGANIZER)
+        event = make_event(db, organizer, capacity=5)
+        db.commit()
+        return organizer.id, event.id
+    finally:
+        db.close()
+
+
+def test_idle_station_closed_at_token_expiry(client, station):
+    organizer_id, event_id = station
+    token = create_access_token(data={"sub": organizer_id}, expires_delta=timedelta(seconds=2))
+    with client.websocket_connect(f"/ws/events/{event_id}/checkin") as ws:
+        ws.send_json({"type": "auth", "token": token})
+        assert ws.receive_json()["type"] == "ready"
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+    assert closed.value.code == 1008
+    assert closed.value.reason == "Token expired"
+
+
+def test_station_closed_when_forwarder_fails(client, station, monkeypatch):
+    organizer_id, event_id = station
+    subscribe = checkin_broadcaster.subscribe
+
+    def failing_subscribe(topic):
+        subscription = subscribe(topic)
+
+        async def get():
+            raise RuntimeError("broadcast backend gone")
+
+        subscription.get = get
+        return subscription
+
+    monkeypatch.setattr(checkin_broadcaster, "subscribe", failing_subscribe)
+    token = create_access_token(data={"sub": organizer_id})
+    with client.websocket_connect(f"/ws/events/{event_id}/checkin") as ws:
+        ws.send_json({"type": "auth", "token": token})
+        assert ws.receive_json()["type"] == "ready"
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+    assert closed.value.code == 1011
+
+
+def test_station_requires_auth_message(client, station):
+    organizer_id, event_id = station
+    token = create_access_token(data={"sub": organizer_id})
+    with client.websocket_connect(f"/ws/events/{event_id}/checkin?token={token}") as ws:
+        ws.send_json({"qr_code": "anything"})
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+    assert closed.value.code == 1008
+    assert closed.value.reason == "Authentication required"
@@ -0,0 +1,82 @@
+"""List totals stay equal to COUNT(*) across the writes that maintain them
+
+Each write path updates ``list_counters`` in its own transaction; after a
+mix of them, reconciliation must find nothing to fix and the totals the
+list endpoints report must match their rows.
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.database import SessionLocal
+from src.domain.list_totals import ListTotals
+from src.models import Event, Registration, User, UserRole
+
+
+@pytest.fixture
+def people(make_user):
+    db = SessionLocal()
+    try:
+        admin = make_user(db, UserRole.ADMIN)
+        organizer = make_user(db, UserRole.ORGANIZER)
+        member = make_user(db)
+        db.commit()
+        # Fixture rows bypass the counters; start from a consistent state
+        ListTotals.reconcile(db)
+        return admin.id, organizer.id, member.id
+    finally:
+        db.close()
+
+
+def _event_body():
+    start_at = datetime.now(timezone.utc) + timedelta(days=3)
+    return {
+        "title": "Counted",
+        "description": "List totals",
+        "start_at": start_at.isoformat(),
+        "end_at": (start_at + timedelta(hours=1)).isoformat(),
+        "location": "Room 1",
+        "capacity": 10,
+    }
+
+
+def _total(client, path, headers):
+    response = client.get(path, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["total"]
+
+
+def test_writes_keep_list_totals_exact(client, auth_headers, people):
+    admin_id, organizer_id, member_id = people
+    admin, organizer, member = (auth_headers(i) for i in people)
+
+    kept = client.post("/events", json=_event_body(), headers=organizer).json()["id"]
+    rejected = client.post("/events", json=_event_body(), headers=organizer).json()["id"]
+    deleted = client.post("/events", json=_event_body(), headers=admin).json()["id"]
+    assert client.patch(f"/events/{kept}/approve", headers=admin).status_code == 200
+    assert client.patch(f"/events/{rejected}/reject", headers=admin).status_code == 200
+
+    registration = client.post(f"/events/{kept}/registrations", headers=member).json()["id"]
+    assert client.delete(f"/registrations/{registration}", headers=member).status_code == 204
+    assert client.post(f"/events/{kept}/registrations", headers=member).status_code == 201
+    assert client.post(f"/events/{deleted}/registrations", headers=member).status_code == 201
+    walk_in = {"event_id": kept, "email": f"{uuid.uuid4()}@example.com"}
+    assert client.post("/walk-in", json=walk_in, headers=organizer).json()["success"]
+    assert client.delete(f"/events/{deleted}", headers=admin).status_code == 204
+
+    db = SessionLocal()
+    try:
+        assert ListTotals.reconcile(db, dry_run=True) == []
+        users = db.query(User).count()
+        events = db.query(Event).count()
+        own_events = db.query(Event).filter(Event.organizer_id == organizer_id).count()
+        attendees = db.query(Registration).filter(Registration.event_id == kept).count()
+    finally:
+        db.close()
+
+    assert _total(client, "/users", admin) == users
+    assert _total(client, "/events/managed", admin) == events
+    assert _total(client, "/events/managed", organizer) == own_events
+    assert _total(client, "/me/registrations", member) == 1
+    assert _total(client, f"/events/{kept}/attendees", organizer) == attendees == 2
@@ -0,0 +1,42 @@
+"""Memory diagnostics report what is actually in effect
+
+Restarting tracing at another depth must take effect, and the session
+count comes from the sessions the app itself has open.
+"""
+import tracemalloc
+
+import pytest
+
+from src.database import SessionLocal
+from src.models import UserRole
+
+
+@pytest.fixture
+def admin(make_user, auth_headers):
+    db = SessionLocal()
+    try:
+        user = make_user(db, UserRole.ADMIN)
+        db.commit()
+        return auth_headers(user.id)
+    finally:
+        db.close()
+
+
+def test_tracing_restarts_at_new_depth(client, admin):
+    try:
+        first = client.post("/admin/diagnostics/memory/tracing?frames=1", headers=admin)
+        assert first.json()["traceback_frames"] == 1
+
+        second = client.post("/admin/diagnostics/memory/tracing?frames=5", headers=admin)
+        assert second.status_code == 200
+        assert second.json()["traceback_frames"] == 5
+        assert tracemalloc.get_traceback_limit() == 5
+    finally:
+        client.delete("/admin/diagnostics/memory/tracing", headers=admin)
+
+
+def test_session_count_includes_the_request_session(client, admin):
+    response = client.get("/admin/diagnostics/memory", headers=admin)
+    assert response.status_code == 200
+    # The status request's own session is open while it is served
+    assert response.json()["structures"]["sqlalchemy_sessions"]["live"] >= 1
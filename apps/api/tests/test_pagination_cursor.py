@@ -0,0 +1,32 @@
+"""Cursors are checked against their sort columns' types
+
+A cursor whose values do not match the ordering (a number where the id
+goes, a non-timestamp where the date goes) is a client error, not a
+comparison sent to the database.
+"""
+import pytest
+
+from src.core.pagination import decode_cursor, encode_cursor
+from src.models import Event
+from src.routes.events import EVENT_SORT
+
+
+@pytest.mark.parametrize("values", [
+    ["2020-01-01", 5],
+    [5, "some-id"],
+    ["not a date", "some-id"],
+    [None, "some-id"],
+    ["2020-01-01T00:00:00"],
+])
+def test_tampered_cursor_rejected(client, values):
+    response = client.get("/events", params={"cursor": encode_cursor(values)})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid pagination cursor"
+
+
+def test_valid_cursor_round_trips():
+    cursor = encode_cursor(["2020-01-01T10:00:00+00:00", "event-id"])
+    start_at, event_id = decode_cursor(cursor, EVENT_SORT)
+    assert start_at.isoformat() == "2020-01-01T10:00:00+00:00"
+    assert event_id == "event-id"
+    assert EVENT_SORT[0] is Event.start_at
@@ -0,0 +1,16 @@
+"""A failed statement does not leave its start time on the pooled connection"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from src.database import engine
+
+
+def test_failed_statement_start_is_discarded():
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM no_such_table"))
+        assert conn.info.get("query_start") == []
+
+        conn.execute(text("SELECT 1"))
+        assert conn.info["query_start"] == []
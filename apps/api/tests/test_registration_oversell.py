@@ -0,0 +1,103 @@
+"""Concurrent registrations never oversell an event
+
+Hundreds of members register for the same small event at once through
+the real route and threadpool. Exactly ``capacity`` of them may win,
+and the stored counter must agree with the rows written.
+
+The PostgreSQL variant runs only when TEST_POSTGRES_URL points at a
+scratch database (its tables are created and dropped by the test).
+"""
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+import main
+from src.database import Base, get_db
+from src.models import Event, Registration, RegistrationStatus, UserRole
+
+CAPACITY = 50
+ATTEMPTS = 300
+CLIENT_THREADS = 64
+
+
+# Enough connections for every threadpool worker
+POOL = {"pool_size": 40, "max_overflow": 10}
+
+
+def _create_engine(backend: str, tmp_path):
+    if backend == "sqlite":
+        # Writers wait for the database lock instead of failing with "database is locked"
+        return create_engine(
+            f"sqlite:///{tmp_path / 'oversell.db'}",
+            connect_args={"check_same_thread": False, "timeout": 30},
+            **POOL,
+        )
+
+    url = os.environ.get("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    return create_engine(url, **POOL)
+
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+def session_factory(request, tmp_path):
+    """Serve the app's sessions from a fresh database on the given backend."""
+    engine = _create_engine(request.param, tmp_path)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def get_test_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    main.app.dependency_overrides[get_db] = get_test_db
+    try:
+        yield factory
+    finally:
+        main.app.dependency_overrides.pop(get_db, None)
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+def test_parallel_registrations_never_exceed_capacity(client, session_factory, auth_headers, make_user, make_event):
+    db = session_factory()
+    organizer = make_user(db, UserRole.ORGANIZER)
+    event = make_event(db, organizer, capacity=CAPACITY)
+    members = [make_user(db) for _ in range(ATTEMPTS)]
+    db.commit()
+    event_id = event.id
+    headers = [auth_headers(member.id) for member in members]
+    db.close()
+
+    def register(member_headers):
+        return client.post(f"/events/{event_id}/registrations", headers=member_headers)
+
+    with ThreadPoolExecutor(max_workers=CLIENT_THREADS) as pool:
+        responses = list(pool.map(register, headers))
+
+    statuses = Counter(response.status_code for response in responses)
+    assert statuses == {201: CAPACITY, 400: ATTEMPTS - CAPACITY}
+    assert all(
+        response.json()["detail"] == "Event is at full capacity"
+        for response in responses if response.status_code == 400
+    )
+
+    db = session_factory()
+    try:
+        registered_count = db.query(Event.registered_count).filter(Event.id == event_id).scalar()
+        rows = db.query(func.count(Registration.id)).filter(
+            Registration.event_id == event_id,
+            Registration.status == RegistrationStatus.REGISTERED,
+        ).scalar()
+    finally:
+        db.close()
+
+    assert registered_count == CAPACITY
+    assert rows == CAPACITY
@@ -0,0 +1,68 @@
+"""Request profiles only hold the profiled request's own threads
+
+A busy thread running next to the profiled request must not show up in its
+stacks, while the sync handler (run on an anyio worker) must.
+"""
+import threading
+import time
+
+import anyio.to_thread
+import pytest
+
+import main
+from src.database import SessionLocal
+from src.models import UserRole
+
+
+def _slow_profiled_handler():
+    time.sleep(0.2)
+    return {"ok": True}
+
+
+def _busy_neighbour(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.fixture
+def slow_route():
+    main.app.add_api_route("/_test/slow", _slow_profiled_handler, methods=["GET"])
+    yield "/_test/slow"
+    main.app.router.routes.pop()
+
+
+@pytest.fixture
+def admin_id(make_user):
+    db = SessionLocal()
+    try:
+        admin = make_user(db, UserRole.ADMIN)
+        db.commit()
+        return admin.id
+    finally:
+        db.close()
+
+
+def test_request_profile_excludes_other_threads(client, auth_headers, admin_id, slow_route):
+    run_sync = anyio.to_thread.run_sync
+    stop = threading.Event()
+    neighbour = threading.Thread(target=_busy_neighbour, args=(stop,))
+    neighbour.start()
+    try:
+        response = client.get(slow_route, headers={**auth_headers(admin_id), "X-Profile": "1"})
+    finally:
+        stop.set()
+        neighbour.join()
+    assert response.status_code == 200
+    # The threadpool is only tracked while the profile runs
+    assert anyio.to_thread.run_sync is run_sync
+
+    profile = client.get(f"/admin/profiles/{response.headers['x-profile-id']}", headers=auth_headers(admin_id))
+    assert profile.status_code == 200
+    assert "_slow_profiled_handler" in profile.text
+    assert "_busy_neighbour" not in profile.text
+
+
+def test_profile_header_ignored_without_admin_token(client, slow_route):
+    response = client.get(slow_route, headers={"X-Profile": "1"})
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers